@@ -0,0 +1,66 @@
+"""Times CooldownMapping.update_rate_limit as the number of cached buckets grows.
+
+Run with ``python benchmarks/cooldowns.py`` from the repository root.
+"""
+
+import time
+from types import SimpleNamespace
+
+from discord.ext.commands import BucketType, Cooldown, CooldownMapping
+
+NOW = 1_600_000_000.0
+OPS = 20000
+
+
+class LegacyCooldownMapping(CooldownMapping):
+    # how CooldownMapping swept stale buckets before the expiry order
+    def _verify_cache_integrity(self, current=None):
+        current = current or time.time()
+        dead_keys = [k for k, v in self._cache.items() if current > v._last + v.per]
+        for k in dead_keys:
+            del self._cache[k]
+
+    def get_bucket(self, message, current=None):
+        self._verify_cache_integrity(current)
+        key = self._bucket_key(message)
+        if key not in self._cache:
+            bucket = self.create_bucket(message)
+            self._cache[key] = bucket
+        else:
+            bucket = self._cache[key]
+        return bucket
+
+    def update_rate_limit(self, message, current=None):
+        bucket = self.get_bucket(message, current)
+        return bucket.update_rate_limit(current)
+
+
+def run(cls, keys):
+    # one use per hour, so every bucket stays cached for the whole run
+    mapping = cls(Cooldown(1, 3600), BucketType.user)
+    messages = [SimpleNamespace(author=SimpleNamespace(id=i)) for i in range(keys)]
+    for i, message in enumerate(messages):
+        mapping.update_rate_limit(message, NOW + i * 1e-6)
+
+    # new users keep arriving while the old buckets are still cooling down
+    ops = min(OPS, keys)
+    current = NOW + keys * 1e-6
+    start = time.perf_counter()
+    for i in range(ops):
+        mapping.update_rate_limit(messages[i], current + i * 1e-6)
+    return (time.perf_counter() - start) / ops
+
+
+def main():
+    for keys in (1000, 10000, 100000, 1000000):
+        new = run(CooldownMapping, keys)
+        if keys <= 10000:
+            legacy = f'{run(LegacyCooldownMapping, keys) * 1e6:8.1f}us'
+        else:
+            # a full scan per call, this would take minutes
+            legacy = '       --'
+        print(f'{keys:>8} keys: scan {legacy}   expiry order {new * 1e6:5.1f}us per update')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Times event dispatch through the dispatch table and the listener modes.
+
+Run with ``python benchmarks/dispatch.py`` from the repository root.
+"""
+
+import asyncio
+import time
+import timeit
+
+import discord
+from discord.ext import commands
+
+EVENTS = 20000
+
+
+def legacy_lookup(client, event):
+    # how Client.dispatch found the handler before the dispatch table
+    method = 'on_' + event
+    try:
+        return method, getattr(client, method)
+    except AttributeError:
+        return method, None
+
+
+def table_lookup(client, event):
+    # how Client.dispatch finds the handler now
+    try:
+        method, coro = client._dispatch_table[event]
+    except KeyError:
+        method, coro = client._get_event_handler(event)
+    return method, client.__dict__.get(method, coro)
+
+
+def bench_lookup(bot):
+    number = 200000
+    for label, event in (('handler lookup', 'message'), ('missing handler lookup', 'typing')):
+        legacy = min(timeit.repeat(lambda: legacy_lookup(bot, event), number=number, repeat=5))
+        table = min(timeit.repeat(lambda: table_lookup(bot, event), number=number, repeat=5))
+        print(f'{label:>22}: getattr {legacy / number * 1e9:5.0f}ns   table {table / number * 1e9:5.0f}ns')
+
+
+def bench_dispatch(bot):
+    # a full dispatch of an event nothing listens to, the common case
+    number = 100000
+    elapsed = min(timeit.repeat(lambda: bot.dispatch('typing', None), number=number, repeat=5))
+    print(f'unhandled Bot.dispatch: {elapsed / number * 1e9:.0f}ns')
+
+
+async def bench_mode(mode):
+    bot = commands.Bot(command_prefix='!', intents=discord.Intents.none())
+    done = asyncio.Event()
+    count = 0
+
+    if mode == 'inline':
+        def listener(value):
+            nonlocal count
+            count += 1
+            if count == EVENTS:
+                done.set()
+    else:
+        async def listener(value):
+            nonlocal count
+            count += 1
+            if count == EVENTS:
+                done.set()
+
+    bot.add_listener(listener, 'on_benchmark', mode=mode)
+    start = time.perf_counter()
+    for i in range(EVENTS):
+        bot.dispatch('benchmark', i)
+    await done.wait()
+    elapsed = time.perf_counter() - start
+    await bot.close()
+    print(f'{mode:>6} listener: {elapsed / EVENTS * 1e6:6.2f}us per event')
+
+
+def main():
+    bot = commands.Bot(command_prefix='!', intents=discord.Intents.none())
+    bench_lookup(bot)
+    bench_dispatch(bot)
+    for mode in ('task', 'worker', 'inline'):
+        asyncio.run(bench_mode(mode))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Times the gateway reaction event path on a cached message.
+
+Run with ``python benchmarks/reaction_events.py`` from the repository root.
+"""
+
+import timeit
+
+import discord
+from discord.guild import Guild
+from discord.message import Message
+
+EMOJIS = 40
+
+
+def make_state():
+    client = discord.Client(intents=discord.Intents.all())
+    state = client._connection
+    state.dispatch = lambda *args: None
+    guild = Guild(data={
+        'id': 1,
+        'name': 'guild',
+        'roles': [{'id': 1, 'name': '@everyone', 'permissions': '0', 'color': 0}],
+        'channels': [{'id': 2, 'type': 0, 'name': 'polls', 'position': 0, 'permission_overwrites': []}],
+    }, state=state)
+    state._add_guild(guild)
+    message = Message(state=state, channel=guild.get_channel(2), data={
+        'id': 3,
+        'channel_id': 2,
+        'type': 0,
+        'content': 'poll',
+        'attachments': [],
+        'embeds': [],
+        'mentions': [],
+        'mention_roles': [],
+        'pinned': False,
+        'mention_everyone': False,
+        'tts': False,
+        'author': {'id': 4, 'username': 'author', 'discriminator': '0001', 'avatar': None},
+        'timestamp': '2021-01-01T00:00:00+00:00',
+        'edited_timestamp': None,
+        'reactions': [
+            {'emoji': {'id': str(100 + i), 'name': f'e{i}'}, 'count': 1, 'me': False}
+            for i in range(EMOJIS)
+        ],
+    })
+    state._messages.append(message)
+    return state
+
+
+def main():
+    state = make_state()
+    # the last emoji of the message, the worst case for a linear search
+    emoji = {'id': str(100 + EMOJIS - 1), 'name': f'e{EMOJIS - 1}'}
+    add = {'user_id': '5', 'channel_id': '2', 'message_id': '3', 'guild_id': '1', 'emoji': emoji}
+    remove = dict(add)
+
+    def cycle():
+        state.parse_message_reaction_add(add)
+        state.parse_message_reaction_remove(remove)
+
+    number = 20000
+    best = min(timeit.repeat(cycle, number=number, repeat=5))
+    print(f'{EMOJIS} emoji message: {best / number * 1e6 / 2:.2f}us per reaction event')
+
+
+if __name__ == '__main__':
+    main()
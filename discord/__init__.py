@@ -56,6 +56,11 @@ from .raw_models import *
 from .team import *
 from .sticker import *
 from .interactions import *
+from .dispatch import *
+from .tracing import *
+from .metrics import *
+from .cache import *
+from .bulk import *
 
 VersionInfo = namedtuple('VersionInfo', 'major minor micro releaselevel serial')
 
@@ -178,6 +178,98 @@ class _Overwrites:
         return self.type == 1
 
 
+class _PermissionResolver:
+    # Resolves permissions for many members and channels at once.
+    # The role masks are gathered once per guild and the overwrites once
+    # per channel. Members with the same set of roles share the same result
+    # in a channel unless they have a member overwrite, so that part is
+    # memoised per channel on the role set.
+    __slots__ = ('owner_id', 'default', 'roles')
+
+    ALL = Permissions.all().value
+    ADMINISTRATOR = Permissions.administrator.flag
+    SEND_MESSAGES = Permissions.send_messages.flag
+    READ_MESSAGES = Permissions.read_messages.flag
+    SEND_DENIED = Permissions(send_tts_messages=True, mention_everyone=True, embed_links=True, attach_files=True).value
+    READ_DENIED = Permissions.all_channel().value
+
+    def __init__(self, guild):
+        self.owner_id = guild.owner_id
+        self.default = guild.default_role._permissions
+        self.roles = {role.id: role._permissions for role in guild._roles.values()}
+
+    def base(self, member):
+        value = self.default
+        roles = self.roles
+        for role_id in member._roles:
+            value |= roles.get(role_id, 0)
+        return value
+
+    def channel(self, channel):
+        everyone = None
+        role_overwrites = {}
+        member_overwrites = {}
+        guild_id = channel.guild.id
+        for index, overwrite in enumerate(channel._overwrites):
+            if index == 0 and overwrite.id == guild_id:
+                everyone = (overwrite.allow, overwrite.deny)
+            elif overwrite.is_role():
+                role_overwrites[overwrite.id] = (overwrite.allow, overwrite.deny)
+            elif overwrite.is_member():
+                member_overwrites.setdefault(overwrite.id, (overwrite.allow, overwrite.deny))
+
+        return everyone, role_overwrites, member_overwrites
+
+    def resolve(self, channel, table, member, base, memo):
+        restrict = channel._restrict_permissions
+        if member.id == self.owner_id:
+            return restrict(self.ALL)
+
+        roles = member._roles
+        key = roles.tobytes()
+        try:
+            value = memo[key]
+        except KeyError:
+            value = memo[key] = self._resolve_roles(table, roles, base)
+
+        if value is None:
+            return restrict(self.ALL)
+
+        try:
+            allow, deny = table[2][member.id]
+        except KeyError:
+            pass
+        else:
+            value = (value & ~deny) | allow
+
+        if not value & self.SEND_MESSAGES:
+            value &= ~self.SEND_DENIED
+        if not value & self.READ_MESSAGES:
+            value &= ~self.READ_DENIED
+        return restrict(value)
+
+    def _resolve_roles(self, table, roles, base):
+        if base & self.ADMINISTRATOR:
+            return None
+
+        everyone, role_overwrites, _ = table
+        if everyone is not None:
+            base = (base & ~everyone[1]) | everyone[0]
+
+        allows = 0
+        denies = 0
+        if role_overwrites:
+            for role_id in roles:
+                try:
+                    allow, deny = role_overwrites[role_id]
+                except KeyError:
+                    continue
+                allows |= allow
+                denies |= deny
+
+        return (base & ~denies) | allows
+
+
 class GuildChannel(Protocol):
     """An ABC that details the common operations on a Discord guild channel.
 
@@ -214,6 +306,10 @@ class GuildChannel(Protocol):
     def _sorting_bucket(self):
         raise NotImplementedError
 
+    def _restrict_permissions(self, value):
+        # channel types with extra rules on top of the overwrites override this
+        return value
+
     async def _move(self, position, parent_id=None, lock_permissions=False, *, reason):
         if position < 0:
             raise InvalidArgument('Channel position cannot be less than 0.')
@@ -495,6 +591,20 @@ class GuildChannel(Protocol):
             The resolved permissions for the member or role.
         """
 
+        cache = self.guild._permission_cache
+        if cache is None:
+            return self._resolve_permissions(obj)
+
+        roles = None if isinstance(obj, Role) else obj._roles
+        value = cache.get(self, obj.id, roles)
+        if value is not None:
+            return Permissions(value)
+
+        base = self._resolve_permissions(obj)
+        cache.put(self, obj.id, roles, base.value)
+        return base
+
+    def _resolve_permissions(self, obj):
         # The current cases can be explained as:
         # Guild owner get all permissions -- no questions asked. Otherwise...
         # The @everyone role gets the first application.
@@ -594,6 +704,40 @@ class GuildChannel(Protocol):
 
         return base
 
+    def permissions_for_members(self, members=None):
+        """Handles permission resolution for many :class:`~discord.Member`
+        objects at once.
+
+        This gives the same results as calling :meth:`permissions_for`
+        for every member, but the role permissions and the channel's overwrites
+        are only processed once and members with the same roles share the work.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        ----------
+        members: Optional[Iterable[:class:`~discord.Member`]]
+            The members to resolve permissions for. Defaults to every
+            member in :attr:`Guild.members`.
+
+        Returns
+        -------
+        Dict[:class:`int`, :class:`~discord.Permissions`]
+            A mapping of member ID to the resolved permissions for that member.
+        """
+
+        guild = self.guild
+        if members is None:
+            members = guild._members.values()
+
+        resolver = _PermissionResolver(guild)
+        table = resolver.channel(self)
+        memo = {}
+        return {
+            member.id: Permissions(resolver.resolve(self, table, member, resolver.base(member), memo))
+            for member in members
+        }
+
     async def delete(self, *, reason=None):
         """|coro|
 
@@ -26,7 +26,7 @@ from __future__ import annotations
 
 import io
 import os
-from typing import Any, Literal, Optional, TYPE_CHECKING, Tuple, Union
+from typing import Any, AsyncIterator, Literal, Optional, TYPE_CHECKING, Tuple, Union
 from .errors import DiscordException
 from .errors import InvalidArgument
 from . import utils
@@ -73,11 +73,56 @@ class AssetMixin:
 
         return await self._state.http.get_from_cdn(self.url)
 
+    def stream(self, *, chunk_size: int = 65536) -> AsyncIterator[bytes]:
+        """Returns an :term:`asynchronous iterator` over the content of this asset.
+
+        Unlike :meth:`read`, the content is not loaded into memory all at once
+        but downloaded in chunks as it's iterated over. The iterator can be
+        passed to :class:`File` to upload the asset as it is downloaded.
+
+        .. versionadded:: 2.0
+
+        Examples
+        ---------
+
+        Usage ::
+
+            async for chunk in member.avatar.stream():
+                hasher.update(chunk)
+
+        Parameters
+        -----------
+        chunk_size: :class:`int`
+            The maximum number of bytes in each chunk.
+
+        Raises
+        ------
+        DiscordException
+            There was no internal connection state.
+        HTTPException
+            Downloading the asset failed.
+        NotFound
+            The asset was deleted.
+
+        Yields
+        -------
+        :class:`bytes`
+            A chunk of the content of the asset.
+        """
+        if self._state is None:
+            raise DiscordException('Invalid state (no ConnectionState provided)')
+
+        return self._state.http.stream_from_cdn(self.url, chunk_size)
+
     async def save(self, fp: Union[str, bytes, os.PathLike, io.BufferedIOBase], *, seek_begin: bool = True) -> int:
         """|coro|
 
         Saves this asset into a file-like object.
 
+        .. versionchanged:: 2.0
+            The asset is written as it's downloaded rather than loaded into memory first.
+            A file given by name is only replaced once the download is complete.
+
         Parameters
         ----------
         fp: Union[:class:`io.BufferedIOBase`, :class:`os.PathLike`]
@@ -103,15 +148,7 @@ class AssetMixin:
             The number of bytes written.
         """
 
-        data = await self.read()
-        if isinstance(fp, io.BufferedIOBase):
-            written = fp.write(data)
-            if seek_begin:
-                fp.seek(0)
-            return written
-        else:
-            with open(fp, 'wb') as f:
-                return f.write(data)
+        return await utils._save_stream(self.stream(), fp, seek_begin)
 
 
 class Asset(AssetMixin):
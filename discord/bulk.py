@@ -0,0 +1,579 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+import logging
+from collections import deque
+
+from . import utils, abc
+from .abc import _Overwrites, _undefined
+from .enums import RequestPriority
+from .errors import InvalidArgument
+from .http import Route
+from .permissions import PermissionOverwrite
+from .role import Role
+
+__all__ = (
+    'BulkExecutor',
+    'BulkOperation',
+)
+
+log = logging.getLogger(__name__)
+
+
+class BulkOperation:
+    """Represents an operation queued on a :class:`BulkExecutor`.
+
+    These are not meant to be created manually, they are returned by the
+    methods of :class:`BulkExecutor`. Calls that are combined into a single
+    request return the same operation.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    -----------
+    action: :class:`str`
+        The kind of operation. One of ``'edit_roles'``, ``'kick'``, ``'ban'``,
+        ``'unban'``, ``'edit_permissions'`` or ``'move_channels'``.
+    target: Union[:class:`abc.Snowflake`, :class:`Guild`]
+        The member, user or channel the operation applies to. This is the
+        guild for ``'move_channels'``.
+    done: :class:`bool`
+        Whether the operation has finished, successfully or not.
+    error: Optional[:class:`Exception`]
+        The exception that made the operation fail, if any.
+    """
+
+    __slots__ = ('action', 'target', 'done', 'error', '_data')
+
+    def __init__(self, action, target, data):
+        self.action = action
+        self.target = target
+        self.done = False
+        self.error = None
+        self._data = data
+
+    def __repr__(self):
+        return f'<BulkOperation action={self.action!r} target={self.target!r} done={self.done} error={self.error!r}>'
+
+    @property
+    def failed(self):
+        """:class:`bool`: Whether the operation has finished with an error."""
+        return self.error is not None
+
+
+class BulkExecutor:
+    """Runs many moderation operations on a guild as fast as the rate limits allow.
+
+    Operations are queued through the methods of this class and sent when
+    :meth:`execute` is awaited. Where possible they are combined into fewer
+    requests: every role change of a member becomes a single member edit,
+    every permission change of a channel becomes a single channel edit and
+    every channel move becomes a single bulk position update.
+
+    The requests are then grouped by the rate limit bucket they fall into,
+    each group sends as many requests at once as its bucket allows and the
+    groups run in parallel. A failed operation is recorded and does not stop
+    the others.
+
+    Example: ::
+
+        bulk = discord.BulkExecutor(guild, reason='Role sync')
+        for member in guild.members:
+            if member.bot:
+                bulk.add_roles(member, bot_role)
+                bulk.remove_roles(member, verified_role)
+
+        operations = await bulk.execute()
+        failed = [op for op in operations if op.failed]
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    guild: :class:`Guild`
+        The guild to run the operations on.
+    reason: Optional[:class:`str`]
+        The reason shown in the audit log for every operation.
+    priority: :class:`RequestPriority`
+        The priority of the requests. Defaults to :attr:`RequestPriority.background`
+        so that they do not hold back the rest of the bot.
+    max_concurrency: Optional[:class:`int`]
+        The most requests sent at once per rate limit bucket. By default this
+        is the limit of the bucket, or 5 for routes whose responses don't
+        include one.
+
+    Attributes
+    -----------
+    guild: :class:`Guild`
+        The guild the operations run on.
+    reason: Optional[:class:`str`]
+        The reason shown in the audit log for every operation.
+    priority: :class:`RequestPriority`
+        The priority of the requests.
+    max_concurrency: Optional[:class:`int`]
+        The most requests sent at once per rate limit bucket.
+    """
+
+    # the requests sent at once for a route whose limit is unknown
+    DEFAULT_CONCURRENCY = 5
+
+    def __init__(self, guild, *, reason=None, priority=RequestPriority.background, max_concurrency=None):
+        if not isinstance(priority, RequestPriority):
+            raise TypeError(f'priority must be RequestPriority not {priority.__class__!r}')
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError('max_concurrency must be at least 1')
+
+        self.guild = guild
+        self.reason = reason
+        self.priority = priority
+        self.max_concurrency = max_concurrency
+        self._state = guild._state
+        self._operations = []
+        # operations that later calls are merged into
+        self._roles = {}
+        self._permissions = {}
+        self._moves = None
+
+    def __repr__(self):
+        return f'<BulkExecutor guild={self.guild!r} operations={len(self._operations)}>'
+
+    def __len__(self):
+        return len(self._operations)
+
+    def _add(self, action, target, data):
+        operation = BulkOperation(action, target, data)
+        self._operations.append(operation)
+        return operation
+
+    def _get_roles(self, member):
+        try:
+            return self._roles[member.id]
+        except KeyError:
+            # role id -> whether it is added, or None for the full role list
+            data = {'changes': {}, 'roles': None}
+            operation = self._roles[member.id] = self._add('edit_roles', member, data)
+            return operation
+
+    def add_roles(self, member, *roles):
+        r"""Queues giving roles to a member.
+
+        Parameters
+        -----------
+        member: :class:`abc.Snowflake`
+            The member to give the roles to.
+        \*roles: :class:`abc.Snowflake`
+            The roles to give.
+
+        Returns
+        --------
+        :class:`BulkOperation`
+            The operation editing the member's roles.
+        """
+        operation = self._get_roles(member)
+        changes = operation._data['changes']
+        for role in roles:
+            changes[role.id] = True
+        return operation
+
+    def remove_roles(self, member, *roles):
+        r"""Queues removing roles from a member.
+
+        Parameters
+        -----------
+        member: :class:`abc.Snowflake`
+            The member to remove the roles from.
+        \*roles: :class:`abc.Snowflake`
+            The roles to remove.
+
+        Returns
+        --------
+        :class:`BulkOperation`
+            The operation editing the member's roles.
+        """
+        operation = self._get_roles(member)
+        changes = operation._data['changes']
+        for role in roles:
+            changes[role.id] = False
+        return operation
+
+    def edit_roles(self, member, roles):
+        """Queues replacing the roles of a member.
+
+        Parameters
+        -----------
+        member: :class:`abc.Snowflake`
+            The member to edit the roles of.
+        roles: List[:class:`abc.Snowflake`]
+            The member's new roles.
+
+        Returns
+        --------
+        :class:`BulkOperation`
+            The operation editing the member's roles.
+        """
+        operation = self._get_roles(member)
+        operation._data['changes'].clear()
+        operation._data['roles'] = [role.id for role in roles]
+        return operation
+
+    def kick(self, user):
+        """Queues kicking a user from the guild.
+
+        Parameters
+        -----------
+        user: :class:`abc.Snowflake`
+            The user to kick.
+
+        Returns
+        --------
+        :class:`BulkOperation`
+            The kick operation.
+        """
+        return self._add('kick', user, None)
+
+    def ban(self, user, *, delete_message_days=1):
+        """Queues banning a user from the guild.
+
+        Parameters
+        -----------
+        user: :class:`abc.Snowflake`
+            The user to ban.
+        delete_message_days: :class:`int`
+            The number of days worth of messages to delete from the user
+            in the guild. The minimum is 0 and the maximum is 7.
+
+        Returns
+        --------
+        :class:`BulkOperation`
+            The ban operation.
+        """
+        return self._add('ban', user, delete_message_days)
+
+    def unban(self, user):
+        """Queues unbanning a user from the guild.
+
+        Parameters
+        -----------
+        user: :class:`abc.Snowflake`
+            The user to unban.
+
+        Returns
+        --------
+        :class:`BulkOperation`
+            The unban operation.
+        """
+        return self._add('unban', user, None)
+
+    def set_permissions(self, channel, target, *, overwrite=_undefined, **permissions):
+        r"""Queues setting the permission overwrites for a target in a channel.
+
+        This takes the same arguments as :meth:`abc.GuildChannel.set_permissions`.
+
+        Parameters
+        -----------
+        channel: :class:`abc.GuildChannel`
+            The channel to set the overwrites in.
+        target: Union[:class:`~discord.Member`, :class:`~discord.Role`]
+            The member or role to overwrite permissions for.
+        overwrite: Optional[:class:`~discord.PermissionOverwrite`]
+            The permissions to allow and deny to the target, or ``None`` to
+            delete the overwrite.
+        \*\*permissions
+            A keyword argument list of permissions to set for ease of use.
+            Cannot be mixed with ``overwrite``.
+
+        Raises
+        -------
+        InvalidArgument
+            The overwrite parameter invalid or the target type was not
+            :class:`~discord.Role` or :class:`~discord.Member`.
+
+        Returns
+        --------
+        :class:`BulkOperation`
+            The operation editing the channel's overwrites.
+        """
+        if isinstance(target, Role):
+            perm_type = _Overwrites.ROLE
+        elif isinstance(target, abc.User):
+            perm_type = _Overwrites.MEMBER
+        else:
+            raise InvalidArgument('target parameter must be either Member or Role')
+
+        if overwrite is _undefined:
+            if len(permissions) == 0:
+                raise InvalidArgument('No overwrite provided.')
+            try:
+                overwrite = PermissionOverwrite(**permissions)
+            except (ValueError, TypeError):
+                raise InvalidArgument('Invalid permissions given to keyword arguments.')
+        elif len(permissions) > 0:
+            raise InvalidArgument('Cannot mix overwrite and keyword arguments.')
+
+        if overwrite is not None and not isinstance(overwrite, PermissionOverwrite):
+            raise InvalidArgument('Invalid overwrite type provided.')
+
+        try:
+            operation = self._permissions[channel.id]
+        except KeyError:
+            operation = self._permissions[channel.id] = self._add('edit_permissions', channel, {})
+
+        operation._data[target.id] = (overwrite, perm_type)
+        return operation
+
+    def move_channel(self, channel, position, *, category=_undefined, sync_permissions=False):
+        """Queues moving a channel to a new position.
+
+        All the moves are sent in a single request.
+
+        Parameters
+        -----------
+        channel: :class:`abc.GuildChannel`
+            The channel to move.
+        position: :class:`int`
+            The channel's new position.
+        category: Optional[:class:`abc.Snowflake`]
+            The category to move the channel to, or ``None`` to remove it
+            from its category.
+        sync_permissions: :class:`bool`
+            Whether to sync the channel's permissions with its new category.
+
+        Returns
+        --------
+        :class:`BulkOperation`
+            The operation moving the guild's channels.
+        """
+        if self._moves is None:
+            self._moves = self._add('move_channels', self.guild, {})
+
+        payload = {'id': channel.id, 'position': position}
+        if category is not _undefined:
+            payload['parent_id'] = category and category.id
+        if sync_permissions:
+            payload['lock_permissions'] = True
+
+        self._moves._data[channel.id] = payload
+        return self._moves
+
+    def _plan_roles(self, operation):
+        http = self._state.http
+        guild_id = self.guild.id
+        user_id = operation.target.id
+        changes = operation._data['changes']
+        roles = operation._data['roles']
+
+        if roles is None:
+            member = self.guild.get_member(user_id)
+            if member is not None:
+                # leave out the changes the member already has
+                current = set(member._roles)
+                changes = {role_id: added for role_id, added in changes.items() if (role_id in current) != added}
+                if not changes:
+                    return []
+            if member is None or len(changes) == 1:
+                # the role endpoints don't need the member's current roles
+                requests = []
+                for role_id, added in changes.items():
+                    if added:
+                        route = Route('PUT', '/guilds/{guild_id}/members/{user_id}/roles/{role_id}',
+                                      guild_id=guild_id, user_id=user_id, role_id=role_id)
+                        requests.append((route, http.add_role, (guild_id, user_id, role_id)))
+                    else:
+                        route = Route('DELETE', '/guilds/{guild_id}/members/{user_id}/roles/{role_id}',
+                                      guild_id=guild_id, user_id=user_id, role_id=role_id)
+                        requests.append((route, http.remove_role, (guild_id, user_id, role_id)))
+                return requests
+            current = set(member._roles)
+            roles = set(current)
+        else:
+            current = None
+            roles = set(roles)
+            roles.discard(guild_id)
+
+        for role_id, added in changes.items():
+            if added:
+                roles.add(role_id)
+            else:
+                roles.discard(role_id)
+
+        if roles == current:
+            return []
+
+        route = Route('PATCH', '/guilds/{guild_id}/members/{user_id}', guild_id=guild_id, user_id=user_id)
+        return [(route, http.edit_member, (guild_id, user_id), {'roles': list(roles)})]
+
+    def _plan_permissions(self, operation):
+        http = self._state.http
+        channel = operation.target
+        changes = operation._data
+
+        if len(changes) == 1:
+            ((target_id, (overwrite, perm_type)),) = changes.items()
+            if overwrite is None:
+                route = Route('DELETE', '/channels/{channel_id}/permissions/{target}', channel_id=channel.id, target=target_id)
+                return [(route, http.delete_channel_permissions, (channel.id, target_id))]
+            route = Route('PUT', '/channels/{channel_id}/permissions/{target}', channel_id=channel.id, target=target_id)
+            allow, deny = overwrite.pair()
+            return [(route, http.edit_channel_permissions, (channel.id, target_id, allow.value, deny.value, perm_type))]
+
+        # the whole list of overwrites is replaced in one channel edit
+        overwrites = [o._asdict() for o in channel._overwrites if o.id not in changes]
+        for target_id, (overwrite, perm_type) in changes.items():
+            if overwrite is not None:
+                allow, deny = overwrite.pair()
+                overwrites.append({'id': target_id, 'allow': allow.value, 'deny': deny.value, 'type': perm_type})
+
+        route = Route('PATCH', '/channels/{channel_id}', channel_id=channel.id)
+        return [(route, http.edit_channel, (channel.id,), {'permission_overwrites': overwrites})]
+
+    def _plan(self, operation):
+        # returns the (route, method, args[, kwargs]) requests making up the operation
+        http = self._state.http
+        guild_id = self.guild.id
+        action = operation.action
+
+        if action == 'edit_roles':
+            return self._plan_roles(operation)
+        if action == 'edit_permissions':
+            return self._plan_permissions(operation)
+        if action == 'move_channels':
+            route = Route('PATCH', '/guilds/{guild_id}/channels', guild_id=guild_id)
+            return [(route, http.bulk_channel_update, (guild_id, list(operation._data.values())))]
+
+        user_id = operation.target.id
+        if action == 'kick':
+            route = Route('DELETE', '/guilds/{guild_id}/members/{user_id}', guild_id=guild_id, user_id=user_id)
+            return [(route, http.kick, (user_id, guild_id))]
+        if action == 'ban':
+            route = Route('PUT', '/guilds/{guild_id}/bans/{user_id}', guild_id=guild_id, user_id=user_id)
+            return [(route, http.ban, (user_id, guild_id, operation._data))]
+
+        route = Route('DELETE', '/guilds/{guild_id}/bans/{user_id}', guild_id=guild_id, user_id=user_id)
+        return [(route, http.unban, (user_id, guild_id))]
+
+    async def _run(self, operation, requests, finished):
+        try:
+            for request in requests:
+                route, method, args, *kwargs = request
+                kwargs = kwargs[0] if kwargs else {}
+                await method(*args, reason=self.reason, **kwargs)
+        except Exception as exc:
+            log.debug('Bulk operation %r failed.', operation, exc_info=exc)
+            operation.error = exc
+
+        operation.done = True
+        await finished(operation)
+
+    async def _run_group(self, route, queue, finished):
+        ratelimiter = self._state.http._ratelimiter
+        max_concurrency = self.max_concurrency
+        workers = set()
+        probed = warned = False
+        try:
+            while queue or workers:
+                # a single request goes first to learn the bucket's limit,
+                # after that as many as the bucket allows are kept in flight
+                size = ratelimiter.limit(route)
+                if size is None:
+                    # no limit came back, so don't send the rest one by one
+                    size = self.DEFAULT_CONCURRENCY if probed else 1
+                    if probed and not warned:
+                        log.warning('The rate limit of %s %s is unknown, sending up to %d of its requests at once.',
+                                    route.method, route.path, size)
+                        warned = True
+                if max_concurrency is not None:
+                    size = min(size, max_concurrency)
+
+                while queue and len(workers) < size:
+                    workers.add(asyncio.ensure_future(self._run(*queue.popleft(), finished)))
+                _, workers = await asyncio.wait(workers, return_when=asyncio.FIRST_COMPLETED)
+                probed = True
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+    async def execute(self, *, progress=None):
+        """|coro|
+
+        Runs all the queued operations.
+
+        Failed operations do not raise, their exception is stored in
+        :attr:`BulkOperation.error` instead. Once this returns the queue is
+        empty and the executor can be reused.
+
+        Parameters
+        -----------
+        progress: Optional[Callable[[:class:`BulkOperation`, :class:`int`, :class:`int`], Any]]
+            A function or coroutine called after every operation finishes,
+            with the operation, how many operations have finished and the
+            total number of operations.
+
+        Returns
+        --------
+        List[:class:`BulkOperation`]
+            The operations that were run, in the order they were queued.
+        """
+        operations = self._operations
+        self._operations = []
+        self._roles = {}
+        self._permissions = {}
+        self._moves = None
+
+        # kept per call so that concurrent calls don't mix up their progress
+        completed = 0
+        total = len(operations)
+
+        async def finished(operation):
+            nonlocal completed
+            completed += 1
+            if progress is not None:
+                try:
+                    await utils.maybe_coroutine(progress, operation, completed, total)
+                except Exception:
+                    log.exception('Bulk progress callback %r failed for %r.', progress, operation)
+
+        ratelimiter = self._state.http._ratelimiter
+        groups = {}
+        skipped = []
+        for operation in operations:
+            requests = self._plan(operation)
+            if not requests:
+                skipped.append(operation)
+                continue
+            route = requests[0][0]
+            key = ratelimiter.get_key(route)
+            try:
+                groups[key][1].append((operation, requests))
+            except KeyError:
+                groups[key] = (route, deque([(operation, requests)]))
+
+        # nothing to send for these, e.g. the member already has the roles
+        for operation in skipped:
+            await self._run(operation, (), finished)
+
+        with utils.request_priority(self.priority):
+            await asyncio.gather(*(self._run_group(route, queue, finished) for route, queue in groups.values()))
+
+        return operations
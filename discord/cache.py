@@ -0,0 +1,528 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import copy
+import hashlib
+import os
+import time
+from collections import OrderedDict
+
+from .http import Route
+
+__all__ = (
+    'ResponseCache',
+    'AssetCache',
+)
+
+# the GET routes that are cached unless configured otherwise
+_DEFAULT_PATHS = (
+    '/users/{user_id}',
+    '/oauth2/applications/@me',
+    '/guilds/{guild_id}',
+    '/guilds/{guild_id}/channels',
+    '/guilds/{guild_id}/members/{member_id}',
+    '/guilds/{guild_id}/roles',
+    '/guilds/{guild_id}/emojis',
+    '/guilds/{guild_id}/emojis/{emoji_id}',
+    '/guilds/{guild_id}/bans/{user_id}',
+    '/channels/{channel_id}',
+    '/channels/{channel_id}/pins',
+    '/channels/{channel_id}/messages/{message_id}',
+)
+
+class ResponseCache:
+    """A size bounded cache of the responses to REST requests such as
+    :meth:`Client.fetch_user` or :meth:`Guild.fetch_member`.
+
+    Pass an instance to :class:`Client` through the ``response_cache`` option
+    to enable it. Responses are kept for a time to live that can be set per
+    route and the least recently used ones are evicted once the cache is full.
+
+    Cached responses are invalidated by the gateway events that change them,
+    for example a member update invalidates the fetched member and a role
+    update invalidates the guild's roles. Responses that no event changes,
+    such as :meth:`Client.application_info`, only expire.
+
+    The routes cached by default are: ::
+
+        /users/{user_id}
+        /oauth2/applications/@me
+        /guilds/{guild_id}
+        /guilds/{guild_id}/channels
+        /guilds/{guild_id}/members/{member_id}
+        /guilds/{guild_id}/roles
+        /guilds/{guild_id}/emojis
+        /guilds/{guild_id}/emojis/{emoji_id}
+        /guilds/{guild_id}/bans/{user_id}
+        /channels/{channel_id}
+        /channels/{channel_id}/pins
+        /channels/{channel_id}/messages/{message_id}
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    ttl: :class:`float`
+        The number of seconds the responses to the default routes are kept for.
+        Defaults to 60 seconds.
+    max_size: :class:`int`
+        The maximum number of responses to keep. Defaults to 1000.
+    ttls: Optional[Dict[:class:`str`, Optional[:class:`float`]]]
+        The time to live of specific routes, keyed by the route's path as listed
+        above. Routes not cached by default can be added and a value of ``None``
+        stops a route from being cached.
+
+    Attributes
+    -----------
+    hits: :class:`int`
+        How many requests were answered from the cache.
+    misses: :class:`int`
+        How many requests to cached routes had to be sent.
+    """
+
+    __slots__ = ('ttl', 'max_size', 'hits', 'misses', '_ttls', '_cache', '_fetching', '_stale', '_clock')
+
+    def __init__(self, *, ttl=60.0, max_size=1000, ttls=None):
+        if max_size <= 0:
+            raise ValueError('max_size must be greater than 0')
+
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._ttls = dict.fromkeys(_DEFAULT_PATHS, ttl)
+        if ttls:
+            self._ttls.update(ttls)
+
+        # url -> (expires, data) in least recently used order
+        self._cache = OrderedDict()
+        # urls being fetched and how many times
+        self._fetching = {}
+        # urls invalidated while being fetched, their responses might be out of date
+        self._stale = set()
+        self._clock = time.monotonic
+
+    def __repr__(self):
+        return f'<ResponseCache size={len(self._cache)} hits={self.hits} misses={self.misses}>'
+
+    def __len__(self):
+        return len(self._cache)
+
+    def _get_ttl(self, path):
+        return self._ttls.get(path)
+
+    def _get(self, url):
+        # raises KeyError if the response isn't cached
+        try:
+            expires, data = self._cache[url]
+        except KeyError:
+            self.misses += 1
+            raise
+
+        if expires <= self._clock():
+            del self._cache[url]
+            self.misses += 1
+            raise KeyError(url)
+
+        self._cache.move_to_end(url)
+        self.hits += 1
+        # the caller is free to modify what it gets
+        return copy.deepcopy(data)
+
+    def _begin(self, url):
+        self._fetching[url] = self._fetching.get(url, 0) + 1
+
+    def _end(self, url):
+        # returns whether the response fetched is out of date
+        stale = url in self._stale
+        count = self._fetching[url] - 1
+        if count:
+            self._fetching[url] = count
+        else:
+            del self._fetching[url]
+            self._stale.discard(url)
+        return stale
+
+    def _finish(self, url, ttl, data):
+        if self._end(url):
+            return
+
+        cache = self._cache
+        cache[url] = (self._clock() + ttl, copy.deepcopy(data))
+        cache.move_to_end(url)
+        while len(cache) > self.max_size:
+            cache.popitem(last=False)
+
+    def _invalidate_url(self, url):
+        self._cache.pop(url, None)
+        if url in self._fetching:
+            self._stale.add(url)
+
+    def _invalidate(self, path, **parameters):
+        self._invalidate_url(Route('GET', path, **parameters).url)
+
+    def _invalidate_prefix(self, path, **parameters):
+        # a resource and everything under it, e.g. a deleted channel and its messages
+        url = Route('GET', path, **parameters).url
+        prefix = url + '/'
+        for key in [key for key in self._cache if key == url or key.startswith(prefix)]:
+            del self._cache[key]
+        for key in self._fetching:
+            if key == url or key.startswith(prefix):
+                self._stale.add(key)
+
+    def invalidate(self, path, **parameters):
+        r"""Removes a response from the cache.
+
+        Responses are invalidated by gateway events, this is only needed for
+        changes the library doesn't receive an event for.
+
+        Parameters
+        -----------
+        path: :class:`str`
+            The path of the route, e.g. ``'/users/{user_id}'``.
+        \*\*parameters
+            The parameters of the route, e.g. ``user_id=80088516616269824``.
+        """
+        self._invalidate(path, **parameters)
+
+    def clear(self):
+        """Removes every response from the cache."""
+        self._cache.clear()
+        self._stale.update(self._fetching)
+
+    def _wrap_parsers(self, parsers):
+        # invalidate before the event is parsed so that the handlers
+        # fetching the changed resource don't get the old one
+        for event, invalidate in _INVALIDATORS.items():
+            try:
+                parser = parsers[event]
+            except KeyError:
+                continue
+            parsers[event] = self._wrap_parser(parser, invalidate)
+
+    def _wrap_parser(self, parser, invalidate):
+        def wrapped(data):
+            invalidate(self, data)
+            parser(data)
+
+        return wrapped
+
+# the routes changed by each gateway event
+
+def _user_update(cache, data):
+    cache._invalidate('/users/@me')
+    cache._invalidate('/users/{user_id}', user_id=data['id'])
+
+def _guild_update(cache, data):
+    cache._invalidate('/guilds/{guild_id}', guild_id=data['id'])
+
+def _guild_delete(cache, data):
+    cache._invalidate_prefix('/guilds/{guild_id}', guild_id=data['id'])
+
+def _guild_emojis_update(cache, data):
+    guild_id = data['guild_id']
+    cache._invalidate('/guilds/{guild_id}', guild_id=guild_id)
+    cache._invalidate_prefix('/guilds/{guild_id}/emojis', guild_id=guild_id)
+
+def _guild_role_update(cache, data):
+    guild_id = data['guild_id']
+    # the guild payload includes its roles
+    cache._invalidate('/guilds/{guild_id}', guild_id=guild_id)
+    cache._invalidate('/guilds/{guild_id}/roles', guild_id=guild_id)
+
+def _guild_member_update(cache, data):
+    user_id = data['user']['id']
+    cache._invalidate('/guilds/{guild_id}/members/{member_id}', guild_id=data['guild_id'], member_id=user_id)
+    cache._invalidate('/users/{user_id}', user_id=user_id)
+
+def _presence_update(cache, data):
+    user = data['user']
+    # the user is only partial unless its name, discriminator or avatar changed
+    if len(user) > 1:
+        user_id = user['id']
+        cache._invalidate('/users/{user_id}', user_id=user_id)
+        guild_id = data.get('guild_id')
+        if guild_id is not None:
+            cache._invalidate('/guilds/{guild_id}/members/{member_id}', guild_id=guild_id, member_id=user_id)
+
+def _guild_ban_update(cache, data):
+    guild_id = data['guild_id']
+    user_id = data['user']['id']
+    cache._invalidate('/guilds/{guild_id}/bans/{user_id}', guild_id=guild_id, user_id=user_id)
+    cache._invalidate('/guilds/{guild_id}/members/{member_id}', guild_id=guild_id, member_id=user_id)
+
+def _channel_update(cache, data):
+    cache._invalidate('/channels/{channel_id}', channel_id=data['id'])
+    guild_id = data.get('guild_id')
+    if guild_id is not None:
+        cache._invalidate('/guilds/{guild_id}/channels', guild_id=guild_id)
+
+def _channel_delete(cache, data):
+    cache._invalidate_prefix('/channels/{channel_id}', channel_id=data['id'])
+    guild_id = data.get('guild_id')
+    if guild_id is not None:
+        cache._invalidate('/guilds/{guild_id}/channels', guild_id=guild_id)
+
+def _channel_pins_update(cache, data):
+    cache._invalidate('/channels/{channel_id}/pins', channel_id=data['channel_id'])
+
+def _message_update(cache, data):
+    cache._invalidate('/channels/{channel_id}/messages/{message_id}', channel_id=data['channel_id'], message_id=data['id'])
+
+def _message_delete_bulk(cache, data):
+    channel_id = data['channel_id']
+    for message_id in data['ids']:
+        cache._invalidate('/channels/{channel_id}/messages/{message_id}', channel_id=channel_id, message_id=message_id)
+
+def _message_reaction_update(cache, data):
+    # the message payload includes its reactions
+    cache._invalidate(
+        '/channels/{channel_id}/messages/{message_id}', channel_id=data['channel_id'], message_id=data['message_id']
+    )
+
+_INVALIDATORS = {
+    'USER_UPDATE': _user_update,
+    'GUILD_UPDATE': _guild_update,
+    'GUILD_DELETE': _guild_delete,
+    'GUILD_EMOJIS_UPDATE': _guild_emojis_update,
+    'GUILD_ROLE_CREATE': _guild_role_update,
+    'GUILD_ROLE_UPDATE': _guild_role_update,
+    'GUILD_ROLE_DELETE': _guild_role_update,
+    'GUILD_MEMBER_ADD': _guild_member_update,
+    'GUILD_MEMBER_UPDATE': _guild_member_update,
+    'GUILD_MEMBER_REMOVE': _guild_member_update,
+    'PRESENCE_UPDATE': _presence_update,
+    'GUILD_BAN_ADD': _guild_ban_update,
+    'GUILD_BAN_REMOVE': _guild_ban_update,
+    'CHANNEL_CREATE': _channel_update,
+    'CHANNEL_UPDATE': _channel_update,
+    'CHANNEL_DELETE': _channel_delete,
+    'CHANNEL_PINS_UPDATE': _channel_pins_update,
+    'MESSAGE_UPDATE': _message_update,
+    'MESSAGE_DELETE': _message_update,
+    'MESSAGE_DELETE_BULK': _message_delete_bulk,
+    'MESSAGE_REACTION_ADD': _message_reaction_update,
+    'MESSAGE_REACTION_REMOVE': _message_reaction_update,
+    'MESSAGE_REACTION_REMOVE_ALL': _message_reaction_update,
+    'MESSAGE_REACTION_REMOVE_EMOJI': _message_reaction_update,
+}
+
+class _AssetWriter:
+    # a download being written to a temporary file of the asset cache
+    #
+    # The file operations are blocking and meant to be run in an executor,
+    # the cache's index is only updated from the event loop in AssetCache._add.
+
+    __slots__ = ('name', 'path', 'temp', 'max_size', 'file', 'size', 'failed')
+
+    def __init__(self, cache, name):
+        self.name = name
+        self.path = os.path.join(cache.path, name)
+        self.temp = f'{self.path}.{os.urandom(4).hex()}.tmp'
+        self.max_size = cache.max_size
+        self.file = None
+        self.size = 0
+        self.failed = False
+
+    def write(self, data):
+        if self.failed:
+            return
+
+        self.size += len(data)
+        try:
+            if self.size > self.max_size:
+                # too big to ever be kept
+                raise OSError(f'{self.name} is larger than the cache')
+            if self.file is None:
+                self.file = open(self.temp, 'wb')
+            self.file.write(data)
+        except OSError:
+            # the download goes on without being cached
+            self.failed = True
+            self.abort()
+
+    def finish(self):
+        # returns whether the file made it into the cache
+        if self.failed:
+            return False
+
+        try:
+            if self.file is None:
+                self.file = open(self.temp, 'wb')
+            self.file.close()
+            os.replace(self.temp, self.path)
+        except OSError:
+            self.abort()
+            return False
+        return True
+
+    def abort(self):
+        if self.file is not None:
+            self.file.close()
+        try:
+            os.remove(self.temp)
+        except OSError:
+            pass
+
+class AssetCache:
+    """An on-disk cache of the assets downloaded from Discord's CDN, such as
+    avatars, icons and attachments.
+
+    Pass an instance to :class:`Client` through the ``asset_cache`` option to
+    enable it. It is used by :meth:`Asset.read`, :meth:`Asset.save`,
+    :meth:`Asset.stream` and their :class:`Attachment` counterparts.
+
+    The files are content addressed: they are named after the hash of the
+    asset's URL, which for Discord's CDN includes the hash of the asset itself
+    so a changed avatar is a different URL. The least recently used files are
+    deleted once the cache is larger than its maximum size. The files already
+    in the directory are picked up so the cache survives restarts, but it
+    should not be shared with other processes.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    path: Union[:class:`str`, :class:`os.PathLike`]
+        The directory to keep the files in. It is created if it doesn't exist.
+    max_size: :class:`int`
+        The maximum number of bytes the files may take up. Defaults to 256 MiB.
+
+    Attributes
+    -----------
+    path: :class:`str`
+        The directory the files are kept in.
+    max_size: :class:`int`
+        The maximum number of bytes the files may take up.
+    size: :class:`int`
+        The number of bytes the files currently take up.
+    hits: :class:`int`
+        How many downloads were served from the cache.
+    misses: :class:`int`
+        How many downloads went to the CDN.
+    """
+
+    __slots__ = ('path', 'max_size', 'size', 'hits', 'misses', '_files')
+
+    def __init__(self, path, *, max_size=256 * 1024 * 1024):
+        if max_size <= 0:
+            raise ValueError('max_size must be greater than 0')
+
+        self.path = path = os.fspath(path)
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        # file name -> size in least recently used order
+        self._files = OrderedDict()
+
+        os.makedirs(path, exist_ok=True)
+        entries = []
+        for entry in os.scandir(path):
+            if not entry.is_file():
+                continue
+            if entry.name.endswith('.tmp'):
+                # left over from a download that never finished
+                os.remove(entry.path)
+                continue
+            stat = entry.stat()
+            entries.append((stat.st_mtime, entry.name, stat.st_size))
+
+        for _, name, size in sorted(entries):
+            self._files[name] = size
+            self.size += size
+        self._evict()
+
+    def __repr__(self):
+        return f'<AssetCache path={self.path!r} size={self.size} files={len(self._files)}>'
+
+    def __len__(self):
+        return len(self._files)
+
+    @staticmethod
+    def _get_name(url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _lookup(self, url):
+        # returns the path of the cached asset, or None
+        name = self._get_name(url)
+        if name not in self._files:
+            self.misses += 1
+            return None
+
+        self._files.move_to_end(name)
+        self.hits += 1
+        return os.path.join(self.path, name)
+
+    def _read(self, path):
+        # also keeps the order of use across restarts
+        os.utime(path)
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def _open(self, path):
+        os.utime(path)
+        return open(path, 'rb')
+
+    def _missing(self, path):
+        # the file was removed from under us
+        self._discard(os.path.basename(path))
+        self.hits -= 1
+        self.misses += 1
+
+    def _discard(self, name):
+        size = self._files.pop(name, None)
+        if size is not None:
+            self.size -= size
+
+    def _begin(self, url):
+        return _AssetWriter(self, self._get_name(url))
+
+    def _add(self, writer):
+        name = writer.name
+        self._discard(name)
+        self._files[name] = writer.size
+        self.size += writer.size
+        self._evict()
+
+    def _evict(self):
+        files = self._files
+        while self.size > self.max_size and files:
+            name, size = files.popitem(last=False)
+            self.size -= size
+            try:
+                os.remove(os.path.join(self.path, name))
+            except OSError:
+                pass
+
+    def clear(self):
+        """Deletes every file in the cache."""
+        for name in self._files:
+            try:
+                os.remove(os.path.join(self.path, name))
+            except OSError:
+                pass
+        self._files.clear()
+        self.size = 0
@@ -150,11 +150,13 @@ class TextChannel(discord.abc.Messageable, discord.abc.GuildChannel, Hashable):
     @utils.copy_doc(discord.abc.GuildChannel.permissions_for)
     def permissions_for(self, member):
         base = super().permissions_for(member)
+        base.value = self._restrict_permissions(base.value)
+        return base
 
+    def _restrict_permissions(self, value):
         # text channels do not have voice related permissions
         denied = Permissions.voice()
-        base.value &= ~denied.value
-        return base
+        return value & ~denied.value
 
     @property
     def members(self):
@@ -603,14 +605,17 @@ class VocalGuildChannel(discord.abc.Connectable, discord.abc.GuildChannel, Hasha
     @utils.copy_doc(discord.abc.GuildChannel.permissions_for)
     def permissions_for(self, member):
         base = super().permissions_for(member)
+        base.value = self._restrict_permissions(base.value)
+        return base
 
+    def _restrict_permissions(self, value):
         # voice channels cannot be edited by people who can't connect to them
         # It also implicitly denies all other voice perms
-        if not base.connect:
+        if not value & Permissions.connect.flag:
             denied = Permissions.voice()
             denied.update(manage_channels=True, manage_roles=True)
-            base.value &= ~denied.value
-        return base
+            value &= ~denied.value
+        return value
 
 class VoiceChannel(VocalGuildChannel):
     """Represents a Discord guild voice channel.
@@ -1151,11 +1156,13 @@ class StoreChannel(discord.abc.GuildChannel, Hashable):
     @utils.copy_doc(discord.abc.GuildChannel.permissions_for)
     def permissions_for(self, member):
         base = super().permissions_for(member)
+        base.value = self._restrict_permissions(base.value)
+        return base
 
+    def _restrict_permissions(self, value):
         # store channels do not have voice related permissions
         denied = Permissions.voice()
-        base.value &= ~denied.value
-        return base
+        return value & ~denied.value
 
     def is_nsfw(self):
         """:class:`bool`: Checks if the channel is NSFW."""
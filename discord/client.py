@@ -23,7 +23,9 @@ DEALINGS IN THE SOFTWARE.
 """
 
 import asyncio
+import inspect
 import logging
+from operator import attrgetter
 import signal
 import sys
 import traceback
@@ -50,6 +52,10 @@ from .state import ConnectionState
 from . import utils
 from .object import Object
 from .backoff import ExponentialBackoff
+from .dispatch import EventLimit
+from .tracing import _get_tracer
+from .cache import ResponseCache, AssetCache
+from .metrics import HTTPMetrics
 from .webhook import Webhook
 from .iterators import GuildIterator
 from .appinfo import AppInfo
@@ -140,6 +146,32 @@ class Client:
         is ``True``.
 
         .. versionadded:: 1.5
+    member_name_index: :class:`bool`
+        Whether to maintain a per-guild index of the cached members' names, nicknames
+        and name#discriminator combinations. This speeds up :meth:`Guild.get_member_named`
+        and :meth:`Guild.search_members` in large guilds at the cost of some memory.
+        Defaults to ``False``.
+
+        .. versionadded:: 2.0
+    permission_cache: :class:`bool`
+        Whether to cache the results of :meth:`abc.GuildChannel.permissions_for`.
+        The cache is invalidated by the relevant role, channel, member and guild
+        updates received from the gateway. See :meth:`Guild.permission_cache_info`
+        for its statistics. Defaults to ``False``.
+
+        .. versionadded:: 2.0
+    event_limits: Dict[:class:`str`, :class:`EventLimit`]
+        A mapping of event name, without the ``on_`` prefix, to the limits on how
+        many of its handlers can run concurrently and how many can be queued.
+        Events without an entry are not limited.
+
+        .. versionadded:: 2.0
+    span_exporter: Optional[:class:`SpanExporter`]
+        Enables tracing of gateway events, their handlers and the HTTP requests
+        made inside them. The recorded spans are passed to this exporter.
+        Defaults to ``None``, which disables tracing.
+
+        .. versionadded:: 2.0
     status: Optional[:class:`.Status`]
         A status to start your presence with upon logging on to Discord.
     activity: Optional[:class:`.BaseActivity`]
@@ -166,6 +198,46 @@ class Client:
         sync your system clock to Google's NTP server.
 
         .. versionadded:: 1.3
+    global_rate_limit: Optional[:class:`int`]
+        The number of requests per second that the client paces itself to so that
+        it stays within Discord's global rate limit instead of reacting to it.
+        Defaults to ``50``. If this is ``None`` then requests are not paced.
+
+        .. versionadded:: 2.0
+    global_rate_limit_file: Optional[:class:`str`]
+        The path of a file used to share the ``global_rate_limit`` between processes
+        on the same host that use the same bot token, such as clusters of shards.
+        Every process should be given the same path and the same ``global_rate_limit``.
+        Defaults to ``None``, where each process has a budget of its own.
+
+        .. versionadded:: 2.0
+    coalesce_requests: :class:`bool`
+        Whether identical fetches of a message, member, user or channel made while
+        one of them is still in flight share that request's response instead of being
+        sent again. This happens when many event handlers fetch the same message or
+        member at once. A fetch is not shared with a request of lower priority, or with
+        one sent before a request that changed the same channel or guild finished.
+        Defaults to ``True``.
+
+        .. versionadded:: 2.0
+    response_cache: Optional[:class:`ResponseCache`]
+        A cache for the responses to REST requests such as :meth:`fetch_user`,
+        invalidated by the gateway events that change them.
+        Defaults to ``None``, which disables caching.
+
+        .. versionadded:: 2.0
+    http_metrics: Optional[:class:`HTTPMetrics`]
+        Collects the latency, status codes, retries and rate limit waits of the
+        REST requests per route and rate limit bucket.
+        Defaults to ``None``, which disables collecting them.
+
+        .. versionadded:: 2.0
+    asset_cache: Optional[:class:`AssetCache`]
+        An on-disk cache of the assets downloaded from the CDN, such as avatars
+        and attachments, so that they are not downloaded again.
+        Defaults to ``None``, which disables caching.
+
+        .. versionadded:: 2.0
 
     Attributes
     -----------
@@ -178,6 +250,14 @@ class Client:
         self.ws = None
         self.loop = asyncio.get_event_loop() if loop is None else loop
         self._listeners = {}
+        self._keyed_listeners = {}
+        self._dispatch_table = {}
+        self._event_limits = {}
+        for event, limit in options.pop('event_limits', {}).items():
+            if not isinstance(limit, EventLimit):
+                raise TypeError(f'event_limits values must be EventLimit not {limit.__class__!r}')
+            self._event_limits['on_' + event] = limit
+
         self.shard_id = options.get('shard_id')
         self.shard_count = options.get('shard_count')
 
@@ -185,7 +265,33 @@ class Client:
         proxy = options.pop('proxy', None)
         proxy_auth = options.pop('proxy_auth', None)
         unsync_clock = options.pop('assume_unsync_clock', True)
-        self.http = HTTPClient(connector, proxy=proxy, proxy_auth=proxy_auth, unsync_clock=unsync_clock, loop=self.loop)
+        global_rate_limit = options.pop('global_rate_limit', 50)
+        global_rate_limit_file = options.pop('global_rate_limit_file', None)
+        coalesce_requests = options.pop('coalesce_requests', True)
+        response_cache = options.pop('response_cache', None)
+        http_metrics = options.pop('http_metrics', None)
+        asset_cache = options.pop('asset_cache', None)
+        if asset_cache is not None and not isinstance(asset_cache, AssetCache):
+            raise TypeError(f'asset_cache must be AssetCache not {asset_cache.__class__!r}')
+        if http_metrics is not None and not isinstance(http_metrics, HTTPMetrics):
+            raise TypeError(f'http_metrics must be HTTPMetrics not {http_metrics.__class__!r}')
+        if response_cache is not None and not isinstance(response_cache, ResponseCache):
+            raise TypeError(f'response_cache must be ResponseCache not {response_cache.__class__!r}')
+        self._tracer = _get_tracer(options.get('span_exporter'))
+        self.http = HTTPClient(
+            connector,
+            proxy=proxy,
+            proxy_auth=proxy_auth,
+            unsync_clock=unsync_clock,
+            loop=self.loop,
+            global_rate_limit=global_rate_limit,
+            global_rate_limit_file=global_rate_limit_file,
+            coalesce_requests=coalesce_requests,
+            response_cache=response_cache,
+            metrics=http_metrics,
+            asset_cache=asset_cache,
+        )
+        self.http._tracer = self._tracer
 
         self._handlers = {
             'ready': self._handle_ready
@@ -239,6 +345,29 @@ class Client:
             return self.ws.is_ratelimited()
         return False
 
+    @property
+    def request_wait_stats(self):
+        """Dict[:class:`RequestPriority`, :class:`RequestWaitStats`]: How long the HTTP
+        requests of each priority waited on rate limits before being sent.
+
+        This can be used to confirm that :attr:`RequestPriority.interactive` requests
+        are not held back by background work. See :func:`utils.request_priority`.
+
+        .. versionadded:: 2.0
+        """
+        return dict(self.http.wait_stats)
+
+    @property
+    def coalesced_requests(self):
+        """:class:`int`: The number of ``GET`` requests that were not sent because an
+        identical request was already in flight.
+
+        See the ``coalesce_requests`` option.
+
+        .. versionadded:: 2.0
+        """
+        return self.http.coalesced_requests
+
     @property
     def user(self):
         """Optional[:class:`.ClientUser`]: Represents the connected client. ``None`` if not logged in."""
@@ -305,7 +434,8 @@ class Client:
 
     async def _run_event(self, coro, event_name, *args, **kwargs):
         try:
-            await coro(*args, **kwargs)
+            with self._tracer.span('client.handler', event=event_name, handler=getattr(coro, '__qualname__', None)):
+                await coro(*args, **kwargs)
         except asyncio.CancelledError:
             pass
         except Exception:
@@ -315,13 +445,96 @@ class Client:
                 pass
 
     def _schedule_event(self, coro, event_name, *args, **kwargs):
+        limit = self._event_limits.get(event_name)
+        if limit is not None:
+            return limit._submit(self, coro, event_name, args, kwargs)
+
         wrapped = self._run_event(coro, event_name, *args, **kwargs)
         # Schedules the task
         return asyncio.create_task(wrapped, name=f'discord.py: {event_name}')
 
+    @staticmethod
+    def _resolve_listener(future, args):
+        if len(args) == 0:
+            future.set_result(None)
+        elif len(args) == 1:
+            future.set_result(args[0])
+        else:
+            future.set_result(args)
+
+    def _dispatch_keyed(self, keyed, args):
+        first = args[0]
+        for getter, buckets in list(keyed.values()):
+            try:
+                bucket = buckets[getter(first)]
+            except (AttributeError, KeyError, TypeError):
+                continue
+
+            # Finished futures are removed by their done callback, which
+            # also takes care of the ones that timed out.
+            for future, condition in list(bucket.items()):
+                if future.done():
+                    continue
+
+                try:
+                    result = condition(*args)
+                except Exception as exc:
+                    future.set_exception(exc)
+                else:
+                    if result:
+                        self._resolve_listener(future, args)
+
+    def _add_keyed_listener(self, event, attr, value, future, check):
+        try:
+            keyed = self._keyed_listeners[event]
+        except KeyError:
+            keyed = self._keyed_listeners[event] = {}
+
+        try:
+            getter, buckets = keyed[attr]
+        except KeyError:
+            getter, buckets = keyed[attr] = (attrgetter(attr.replace('__', '.')), {})
+
+        try:
+            buckets[value][future] = check
+        except KeyError:
+            buckets[value] = {future: check}
+
+        def remove(future):
+            try:
+                bucket = buckets[value]
+                del bucket[future]
+            except KeyError:
+                return
+
+            if not bucket:
+                del buckets[value]
+                if not buckets and keyed.get(attr, (None, None))[1] is buckets:
+                    del keyed[attr]
+                    if not keyed and self._keyed_listeners.get(event) is keyed:
+                        del self._keyed_listeners[event]
+
+        future.add_done_callback(remove)
+
+    def _get_event_handler(self, event):
+        # only the handlers defined on the class are cached, see dispatch
+        method = 'on_' + event
+        handler = inspect.getattr_static(type(self), method, None)
+        if handler is not None and hasattr(handler, '__get__'):
+            handler = handler.__get__(self, type(self))
+        entry = self._dispatch_table[event] = (method, handler)
+        return entry
+
     def dispatch(self, event, *args, **kwargs):
         log.debug('Dispatching event %s', event)
-        method = 'on_' + event
+        try:
+            method, coro = self._dispatch_table[event]
+        except KeyError:
+            method, coro = self._get_event_handler(event)
+
+        # handlers set on the client itself, e.g. through Client.event, can
+        # be replaced or deleted at any time so they aren't cached
+        coro = self.__dict__.get(method, coro)
 
         listeners = self._listeners.get(event)
         if listeners:
@@ -338,12 +551,7 @@ class Client:
                     removed.append(i)
                 else:
                     if result:
-                        if len(args) == 0:
-                            future.set_result(None)
-                        elif len(args) == 1:
-                            future.set_result(args[0])
-                        else:
-                            future.set_result(args)
+                        self._resolve_listener(future, args)
                         removed.append(i)
 
             if len(removed) == len(listeners):
@@ -352,11 +560,11 @@ class Client:
                 for idx in reversed(removed):
                     del listeners[idx]
 
-        try:
-            coro = getattr(self, method)
-        except AttributeError:
-            pass
-        else:
+        keyed = self._keyed_listeners.get(event)
+        if keyed and args:
+            self._dispatch_keyed(keyed, args)
+
+        if coro is not None:
             self._schedule_event(coro, method, *args, **kwargs)
 
     async def on_error(self, event_method, *args, **kwargs):
@@ -782,7 +990,7 @@ class Client:
         """
         await self._ready.wait()
 
-    def wait_for(self, event, *, check=None, timeout=None):
+    def wait_for(self, event, *, check=None, timeout=None, key=None):
         """|coro|
 
         Waits for a WebSocket event to be dispatched.
@@ -838,6 +1046,10 @@ class Client:
                     else:
                         await channel.send('\N{THUMBS UP SIGN}')
 
+        Waiting for a reply in the same channel with a keyed lookup: ::
+
+            msg = await client.wait_for('message', key=('channel__id', channel.id),
+                                        check=lambda m: m.author == author)
 
         Parameters
         ------------
@@ -850,6 +1062,15 @@ class Client:
         timeout: Optional[:class:`float`]
             The number of seconds to wait before timing out and raising
             :exc:`asyncio.TimeoutError`.
+        key: Optional[Tuple[:class:`str`, Any]]
+            An ``(attribute, value)`` pair that the first argument of the event
+            must match before ``check`` is even called. Nested attributes are
+            accessed with ``x__y`` like in :func:`utils.get`. Listeners waiting with
+            a key are grouped by it, so each event only runs the checks of the
+            listeners that share its value. This is much cheaper when a lot of
+            listeners are waiting on the same event. The value must be hashable.
+
+            .. versionadded:: 2.0
 
         Raises
         -------
@@ -871,6 +1092,11 @@ class Client:
             check = _check
 
         ev = event.lower()
+        if key is not None:
+            attr, value = key
+            self._add_keyed_listener(ev, attr, value, future, check)
+            return asyncio.wait_for(future, timeout)
+
         try:
             listeners = self._listeners[ev]
         except KeyError:
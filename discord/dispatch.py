@@ -0,0 +1,159 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+import itertools
+import logging
+from collections import OrderedDict
+
+__all__ = (
+    'EventLimit',
+)
+
+log = logging.getLogger(__name__)
+
+class EventLimit:
+    """Bounds how many handlers of an event may run at the same time.
+
+    Passed to :class:`Client` through the ``event_limits`` option. Every call
+    of an event handler or task-based listener counts as one unit of work.
+    Once ``concurrency`` of them are running, further calls wait in a queue
+    of at most ``max_pending`` entries and are started as running ones finish.
+
+    Calls that do not fit in the queue are dropped according to ``overflow``.
+    Low value events such as :func:`on_typing` or :func:`on_member_update` (which
+    is what a presence update is dispatched as) can also be coalesced, in which
+    case a queued call is replaced by a newer one with the same key instead of
+    taking up another slot.
+
+    The same instance can be shared by multiple events in which case they
+    share the limits.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    concurrency: :class:`int`
+        The maximum number of handlers running at the same time.
+    max_pending: :class:`int`
+        The maximum number of handler calls waiting to be run.
+    overflow: :class:`str`
+        What to do when the queue is full. ``'drop'`` discards the incoming
+        call and ``'drop_oldest'`` discards the call that has been waiting
+        the longest. Defaults to ``'drop'``.
+    coalesce: Optional[Callable[..., Hashable]]
+        A function that receives the event's arguments and returns a key.
+        A queued call with the same key and handler is replaced by the new one.
+        For example, ``lambda channel, user, when: (channel.id, user.id)`` for
+        :func:`on_typing`.
+
+    Attributes
+    -----------
+    running: :class:`int`
+        The number of handlers currently running.
+    dropped: :class:`int`
+        The number of handler calls that were dropped so far.
+    coalesced: :class:`int`
+        The number of queued handler calls that were replaced by a newer one.
+    peak_pending: :class:`int`
+        The largest number of calls that were queued at the same time.
+    """
+
+    __slots__ = ('concurrency', 'max_pending', 'overflow', 'coalesce', 'running',
+                 'dropped', 'coalesced', 'peak_pending', '_pending', '_counter')
+
+    def __init__(self, concurrency, *, max_pending=1000, overflow='drop', coalesce=None):
+        if concurrency < 1:
+            raise ValueError('concurrency must be at least 1')
+        if max_pending < 0:
+            raise ValueError('max_pending cannot be negative')
+        if overflow not in ('drop', 'drop_oldest'):
+            raise ValueError(f'Unknown overflow policy {overflow!r}')
+
+        self.concurrency = concurrency
+        self.max_pending = max_pending
+        self.overflow = overflow
+        self.coalesce = coalesce
+        self.running = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.peak_pending = 0
+        self._pending = OrderedDict()
+        self._counter = itertools.count()
+
+    def __repr__(self):
+        return f'<EventLimit concurrency={self.concurrency} running={self.running} pending={self.pending} dropped={self.dropped}>'
+
+    @property
+    def pending(self):
+        """:class:`int`: The number of handler calls waiting to be run."""
+        return len(self._pending)
+
+    def _submit(self, client, coro, event_name, args, kwargs):
+        if self.running < self.concurrency:
+            return self._start(client, coro, event_name, args, kwargs)
+
+        pending = self._pending
+        key = None
+        if self.coalesce is not None:
+            try:
+                key = (coro, self.coalesce(*args))
+                coalesced = key in pending
+            except Exception:
+                # a broken coalesce function must not break event dispatch
+                log.exception('Coalescing the %s handler call failed, queueing it on its own.', event_name)
+                key = None
+            else:
+                if coalesced:
+                    # keep the place in the queue but run with the newest data
+                    pending[key] = (client, coro, event_name, args, kwargs)
+                    self.coalesced += 1
+                    return None
+
+        if key is None:
+            key = next(self._counter)
+
+        if len(pending) >= self.max_pending:
+            self.dropped += 1
+            if self.overflow == 'drop' or not pending:
+                log.debug('Dropping %s handler call, %d are pending.', event_name, len(pending))
+                return None
+            pending.popitem(last=False)
+
+        pending[key] = (client, coro, event_name, args, kwargs)
+        if len(pending) > self.peak_pending:
+            self.peak_pending = len(pending)
+        return None
+
+    def _start(self, client, coro, event_name, args, kwargs):
+        self.running += 1
+        task = asyncio.create_task(client._run_event(coro, event_name, *args, **kwargs), name=f'discord.py: {event_name}')
+        task.add_done_callback(self._done)
+        return task
+
+    def _done(self, task):
+        self.running -= 1
+        if self._pending and self.running < self.concurrency:
+            _, entry = self._pending.popitem(last=False)
+            self._start(*entry)
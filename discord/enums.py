@@ -48,6 +48,7 @@ __all__ = (
     'StickerType',
     'InviteTarget',
     'VideoQualityMode',
+    'RequestPriority',
 )
 
 def _create_value_cls(name):
@@ -443,6 +444,14 @@ class VideoQualityMode(Enum):
     def __int__(self):
         return self.value
 
+class RequestPriority(Enum):
+    interactive = 0
+    default = 1
+    background = 2
+
+    def __int__(self):
+        return self.value
+
 T = TypeVar('T')
 
 def create_unknown_value(cls: Type[T], val: Any) -> T:
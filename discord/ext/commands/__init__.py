@@ -15,5 +15,6 @@ from .errors import *
 from .help import *
 from .converter import *
 from .cooldowns import *
+from .stores import *
 from .cog import *
 from .flags import *
@@ -24,9 +24,11 @@ DEALINGS IN THE SOFTWARE.
 
 import asyncio
 import collections
+import functools
 import inspect
 import importlib.util
 import sys
+import time
 import traceback
 import types
 
@@ -42,6 +44,7 @@ from .cog import Cog
 __all__ = (
     'when_mentioned',
     'when_mentioned_or',
+    'PrefixCache',
     'Bot',
     'AutoShardedBot',
 )
@@ -87,8 +90,158 @@ def when_mentioned_or(*prefixes):
         r = when_mentioned(bot, msg) + r
         return r
 
+    # lets the bot match these prefixes without calling the function
+    inner._extra_prefixes = prefixes
     return inner
 
+class PrefixCache:
+    """Caches the result of a prefix callable per guild.
+
+    This is meant to be passed into the :attr:`.Bot.command_prefix` attribute
+    when the prefixes are looked up somewhere expensive, such as a database.
+    The wrapped callable is only called when a guild has no cached prefixes
+    or they have expired. Concurrent lookups for the same guild share a
+    single call.
+
+    Messages outside of a guild share a single entry.
+
+    Cached prefixes are also matched by the bot without awaiting anything,
+    so messages that are not commands in a guild with cached prefixes are
+    discarded as cheaply as with a plain prefix.
+
+    Example
+    --------
+
+    .. code-block:: python3
+
+        async def get_prefix(bot, message):
+            return await database.fetch_prefixes(message.guild.id)
+
+        bot = commands.Bot(command_prefix=commands.PrefixCache(get_prefix, ttl=600))
+
+        # after changing the prefixes of a guild
+        bot.command_prefix.invalidate(ctx.guild)
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    prefix: Callable[[:class:`.Bot`, :class:`discord.Message`], Union[:class:`str`, List[:class:`str`]]]
+        The callable to cache. This can be either a regular function or a coroutine.
+    ttl: Optional[:class:`float`]
+        How many seconds the prefixes are cached for. ``None`` caches them until
+        they are invalidated. Defaults to 300 seconds.
+    max_size: Optional[:class:`int`]
+        The maximum number of guilds to cache the prefixes of. The least recently
+        used entry is discarded first. ``None`` means no limit, which is the default.
+
+    Attributes
+    -----------
+    hits: :class:`int`
+        The number of lookups that were answered from the cache.
+    misses: :class:`int`
+        The number of lookups that called the wrapped callable.
+    coalesced: :class:`int`
+        The number of lookups that waited on a call started by another lookup.
+    """
+
+    def __init__(self, prefix, *, ttl=300.0, max_size=None):
+        if not callable(prefix):
+            raise TypeError(f'prefix must be callable not {prefix.__class__!r}')
+        if max_size is not None and max_size < 1:
+            raise ValueError('max_size must be at least 1')
+
+        self.prefix = prefix
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._cache = collections.OrderedDict()
+        self._pending = {}
+
+    def __repr__(self):
+        return f'<PrefixCache prefix={self.prefix!r} size={len(self._cache)} hits={self.hits} misses={self.misses}>'
+
+    def __len__(self):
+        return len(self._cache)
+
+    @staticmethod
+    def _get_key(message):
+        guild = message.guild
+        return guild.id if guild is not None else None
+
+    def _get(self, message, count=True):
+        key = self._get_key(message)
+        try:
+            expires, value = self._cache[key]
+        except KeyError:
+            return None
+
+        if expires is not None and expires <= time.monotonic():
+            del self._cache[key]
+            return None
+
+        self._cache.move_to_end(key)
+        if count:
+            self.hits += 1
+        return value
+
+    def _store(self, key, task):
+        if self._pending.get(key) is not task:
+            # invalidated while the call was running
+            return
+
+        del self._pending[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        cache = self._cache
+        cache[key] = (expires, task.result())
+        cache.move_to_end(key)
+        if self.max_size is not None and len(cache) > self.max_size:
+            cache.popitem(last=False)
+
+    async def __call__(self, bot, message):
+        value = self._get(message)
+        if value is not None:
+            return value
+
+        key = self._get_key(message)
+        try:
+            task = self._pending[key]
+        except KeyError:
+            self.misses += 1
+            task = asyncio.ensure_future(discord.utils.maybe_coroutine(self.prefix, bot, message))
+            self._pending[key] = task
+            task.add_done_callback(functools.partial(self._store, key))
+        else:
+            self.coalesced += 1
+
+        # a cancelled lookup should not cancel the ones waiting on the same call
+        return await asyncio.shield(task)
+
+    def invalidate(self, guild):
+        """Discards the cached prefixes of a guild.
+
+        The next message from the guild calls the wrapped callable again.
+
+        Parameters
+        -----------
+        guild: Optional[:class:`~discord.abc.Snowflake`]
+            The guild to discard the prefixes of. ``None`` discards the
+            entry used for messages outside of a guild.
+        """
+        key = guild.id if guild is not None else None
+        self._cache.pop(key, None)
+        self._pending.pop(key, None)
+
+    def clear(self):
+        """Discards every cached prefix."""
+        self._cache.clear()
+        self._pending.clear()
+
 def _is_submodule(parent, child):
     return parent == child or child.startswith(parent + ".")
 
@@ -98,11 +251,46 @@ class _DefaultRepr:
 
 _default = _DefaultRepr()
 
+class _PrefixMatcher:
+    # The prefixes are bucketed by their first character in their original
+    # order so most messages are rejected with a single dict lookup.
+    __slots__ = ('prefixes', '_buckets', '_empty')
+
+    def __init__(self, prefixes):
+        self.prefixes = prefixes
+        self._buckets = buckets = {}
+        self._empty = False
+        for prefix in prefixes:
+            if not isinstance(prefix, str):
+                raise TypeError("Iterable command_prefix or list returned from get_prefix must "
+                                f"contain only strings, not {prefix.__class__.__name__}")
+            if not prefix:
+                # an empty prefix matches everything so nothing after it can match
+                self._empty = True
+                break
+            try:
+                buckets[prefix[0]].append(prefix)
+            except KeyError:
+                buckets[prefix[0]] = [prefix]
+
+    def match(self, content):
+        bucket = self._buckets.get(content[:1])
+        if bucket is not None:
+            for prefix in bucket:
+                if content.startswith(prefix):
+                    return prefix
+        return '' if self._empty else None
+
 class BotBase(GroupMixin):
     def __init__(self, command_prefix, help_command=_default, description=None, **options):
         super().__init__(**options)
         self.command_prefix = command_prefix
         self.extra_events = {}
+        self._listener_modes = {}
+        self._extra_dispatch = {}
+        self._dispatch_queue = None
+        self._dispatch_worker = None
+        self._prefix_matchers = {}
         self.__cogs = {}
         self.__extensions = {}
         self._checks = []
@@ -114,6 +302,7 @@ class BotBase(GroupMixin):
         self.owner_id = options.get('owner_id')
         self.owner_ids = options.get('owner_ids', set())
         self.strip_after_prefix = options.get('strip_after_prefix', False)
+        self.cooldown_store = options.get('cooldown_store')
 
         if self.owner_id and self.owner_ids:
             raise TypeError('Both owner_id and owner_ids are set.')
@@ -133,11 +322,55 @@ class BotBase(GroupMixin):
 
     # internal helpers
 
+    def _get_extra_listeners(self, event_name):
+        # The listeners are compiled into a tuple per event on first dispatch
+        # and this is thrown away whenever a listener is added or removed.
+        try:
+            return self._extra_dispatch[event_name]
+        except KeyError:
+            ev = 'on_' + event_name
+            modes = self._listener_modes
+            listeners = tuple((func, modes.get((ev, func), 'task')) for func in self.extra_events.get(ev, []))
+            entry = self._extra_dispatch[event_name] = (ev, listeners)
+            return entry
+
+    def _run_inline_event(self, func, event_name, *args, **kwargs):
+        try:
+            func(*args, **kwargs)
+        except Exception as exc:
+            error = exc
+
+            # a task is only needed to go through on_error
+            async def reraise(*args, **kwargs):
+                raise error
+
+            self._schedule_event(reraise, event_name, *args, **kwargs)
+
+    def _queue_event(self, func, event_name, *args, **kwargs):
+        if self._dispatch_queue is None:
+            self._dispatch_queue = asyncio.Queue()
+
+        if self._dispatch_worker is None or self._dispatch_worker.done():
+            self._dispatch_worker = asyncio.create_task(self._run_dispatch_worker(), name='discord.py: dispatch worker')
+
+        self._dispatch_queue.put_nowait((func, event_name, args, kwargs))
+
+    async def _run_dispatch_worker(self):
+        queue = self._dispatch_queue
+        while not self.is_closed():
+            func, event_name, args, kwargs = await queue.get()
+            await self._run_event(func, event_name, *args, **kwargs)
+
     def dispatch(self, event_name, *args, **kwargs):
         super().dispatch(event_name, *args, **kwargs)
-        ev = 'on_' + event_name
-        for event in self.extra_events.get(ev, []):
-            self._schedule_event(event, ev, *args, **kwargs)
+        ev, listeners = self._get_extra_listeners(event_name)
+        for func, mode in listeners:
+            if mode == 'task':
+                self._schedule_event(func, ev, *args, **kwargs)
+            elif mode == 'inline':
+                self._run_inline_event(func, ev, *args, **kwargs)
+            else:
+                self._queue_event(func, ev, *args, **kwargs)
 
     async def close(self):
         for extension in tuple(self.__extensions):
@@ -154,6 +387,13 @@ class BotBase(GroupMixin):
 
         await super().close()
 
+        if self._dispatch_worker is not None:
+            self._dispatch_worker.cancel()
+            self._dispatch_worker = None
+
+        if self.cooldown_store is not None:
+            await self.cooldown_store.close()
+
     async def on_command_error(self, context, exception):
         """|coro|
 
@@ -399,15 +639,37 @@ class BotBase(GroupMixin):
 
     # listener registration
 
-    def add_listener(self, func, name=None):
+    def add_listener(self, func, name=None, *, mode='task'):
         """The non decorator alternative to :meth:`.listen`.
 
+        .. versionchanged:: 2.0
+            Added the ``mode`` parameter.
+
         Parameters
         -----------
         func: :ref:`coroutine <coroutine>`
-            The function to call.
+            The function to call. This must be a regular function
+            instead if ``mode`` is ``'inline'``.
         name: Optional[:class:`str`]
             The name of the event to listen for. Defaults to ``func.__name__``.
+        mode: :class:`str`
+            How the listener is run when the event is dispatched.
+
+            - ``'task'``: The default. A new :class:`asyncio.Task` is created for every call.
+            - ``'inline'``: The listener is a regular function that is called
+              synchronously while the event is being dispatched. It must not block.
+            - ``'worker'``: The listener is awaited on a single worker task shared
+              with every other ``'worker'`` listener, one call after the other.
+
+            The latter two avoid creating a task for every event which is
+            worthwhile for cheap listeners of very frequent events.
+
+        Raises
+        -------
+        TypeError
+            The function does not match the requested mode.
+        ValueError
+            An unknown mode was passed.
 
         Example
         --------
@@ -423,7 +685,13 @@ class BotBase(GroupMixin):
         """
         name = func.__name__ if name is None else name
 
-        if not asyncio.iscoroutinefunction(func):
+        if mode not in ('task', 'inline', 'worker'):
+            raise ValueError(f'Unknown listener mode {mode!r}')
+
+        if mode == 'inline':
+            if asyncio.iscoroutinefunction(func):
+                raise TypeError('Inline listeners must not be coroutines')
+        elif not asyncio.iscoroutinefunction(func):
             raise TypeError('Listeners must be coroutines')
 
         if name in self.extra_events:
@@ -431,6 +699,10 @@ class BotBase(GroupMixin):
         else:
             self.extra_events[name] = [func]
 
+        if mode != 'task':
+            self._listener_modes[(name, func)] = mode
+        self._extra_dispatch.clear()
+
     def remove_listener(self, func, name=None):
         """Removes a listener from the pool of listeners.
 
@@ -450,13 +722,22 @@ class BotBase(GroupMixin):
                 self.extra_events[name].remove(func)
             except ValueError:
                 pass
+            else:
+                if func not in self.extra_events[name]:
+                    self._listener_modes.pop((name, func), None)
+                self._extra_dispatch.clear()
 
-    def listen(self, name=None):
+    def listen(self, name=None, *, mode='task'):
         """A decorator that registers another function as an external
         event listener. Basically this allows you to listen to multiple
         events from different places e.g. such as :func:`.on_ready`
 
-        The functions being listened to must be a :ref:`coroutine <coroutine>`.
+        The functions being listened to must be a :ref:`coroutine <coroutine>`,
+        unless ``mode`` is ``'inline'``. See :meth:`.add_listener` for the
+        meaning of ``mode``.
+
+        .. versionchanged:: 2.0
+            Added the ``mode`` parameter.
 
         Example
         --------
@@ -479,10 +760,12 @@ class BotBase(GroupMixin):
         -------
         TypeError
             The function being listened to is not a coroutine.
+        ValueError
+            An unknown mode was passed.
         """
 
         def decorator(func):
-            self.add_listener(func, name)
+            self.add_listener(func, name, mode=mode)
             return func
 
         return decorator
@@ -835,6 +1118,57 @@ class BotBase(GroupMixin):
 
     # command processing
 
+    def _get_prefix_matcher(self, prefix):
+        if isinstance(prefix, str):
+            key = (prefix,)
+        else:
+            try:
+                key = tuple(prefix)
+            except TypeError:
+                raise TypeError("get_prefix must return either a string or a list of string, "
+                                f"not {prefix.__class__.__name__}") from None
+
+        matchers = self._prefix_matchers
+        try:
+            return matchers[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # unhashable values, this raises the proper error
+            return _PrefixMatcher(key)
+
+        matcher = _PrefixMatcher(key)
+        if len(matchers) >= 256:
+            # callables usually return one of a few lists, drop the oldest
+            del matchers[next(iter(matchers))]
+        matchers[key] = matcher
+        return matcher
+
+    def _get_static_prefix_matcher(self, message, count=True):
+        # Returns the matcher if the prefixes can be known without calling
+        # user code, i.e. a plain prefix or the when_mentioned helpers.
+        if self.get_prefix.__func__ is not BotBase.get_prefix:
+            return None
+
+        prefix = self.command_prefix
+        if callable(prefix):
+            if isinstance(prefix, PrefixCache):
+                prefix = prefix._get(message, count)
+                if prefix is None:
+                    return None
+            elif prefix is when_mentioned:
+                prefix = when_mentioned(self, message)
+            else:
+                extra = getattr(prefix, '_extra_prefixes', None)
+                if extra is None:
+                    return None
+                prefix = when_mentioned(self, message) + list(extra)
+
+        matcher = self._get_prefix_matcher(prefix)
+        if not matcher.prefixes:
+            raise ValueError("Iterable command_prefix must contain at least one prefix")
+        return matcher
+
     async def get_prefix(self, message):
         """|coro|
 
@@ -909,34 +1243,17 @@ class BotBase(GroupMixin):
         if self._skip_check(message.author.id, self.user.id):
             return ctx
 
-        prefix = await self.get_prefix(message)
-        invoked_prefix = prefix
+        matcher = self._get_static_prefix_matcher(message)
+        if matcher is None:
+            matcher = self._get_prefix_matcher(await self.get_prefix(message))
 
-        if isinstance(prefix, str):
-            if not view.skip_string(prefix):
-                return ctx
-        else:
-            try:
-                # if the context class' __init__ consumes something from the view this
-                # will be wrong.  That seems unreasonable though.
-                if message.content.startswith(tuple(prefix)):
-                    invoked_prefix = discord.utils.find(view.skip_string, prefix)
-                else:
-                    return ctx
-
-            except TypeError:
-                if not isinstance(prefix, list):
-                    raise TypeError("get_prefix must return either a string or a list of string, "
-                                    f"not {prefix.__class__.__name__}")
-
-                # It's possible a bad command_prefix got us here.
-                for value in prefix:
-                    if not isinstance(value, str):
-                        raise TypeError("Iterable command_prefix or list returned from get_prefix must "
-                                        f"contain only strings, not {value.__class__.__name__}")
+        # if the context class' __init__ consumes something from the view this
+        # will be wrong.  That seems unreasonable though.
+        invoked_prefix = matcher.match(message.content)
+        if invoked_prefix is None:
+            return ctx
 
-                # Getting here shouldn't happen
-                raise
+        view.skip_string(invoked_prefix)
 
         if self.strip_after_prefix:
             view.skip_ws()
@@ -998,6 +1315,15 @@ class BotBase(GroupMixin):
         if message.author.bot:
             return
 
+        if self.get_context.__func__ is BotBase.get_context:
+            # reject messages that cannot be commands without creating a context
+            matcher = self._get_static_prefix_matcher(message, count=False)
+            if matcher is not None and matcher.match(message.content) is None:
+                if isinstance(self.command_prefix, PrefixCache):
+                    # get_context counts the hit for messages that get past this
+                    self.command_prefix.hits += 1
+                return
+
         ctx = await self.get_context(message)
         await self.invoke(ctx)
 
@@ -1045,6 +1371,12 @@ class Bot(BotBase, discord.Client):
             matches messages starting with ``!?``. This is especially important
             when passing an empty string, it should always be last as no prefix
             after it will be matched.
+
+        Plain prefixes, the prefixes of :func:`.when_mentioned` and
+        :func:`.when_mentioned_or` and prefixes cached by :class:`.PrefixCache` are matched without calling :meth:`.get_prefix`,
+        which lets :meth:`.process_commands` discard messages that are not commands
+        before creating a :class:`.Context`. Prefer these over an equivalent custom
+        callable.
     case_insensitive: :class:`bool`
         Whether the commands should be case insensitive. Defaults to ``False``. This
         attribute does not carry over to groups. You must set it to every group if
@@ -1077,6 +1409,17 @@ class Bot(BotBase, discord.Client):
         the ``command_prefix`` is set to ``!``. Defaults to ``False``.
 
         .. versionadded:: 1.7
+    cooldown_store: Optional[:class:`.CooldownStore`]
+        Where the cooldowns and :func:`.max_concurrency` limits of every command
+        are kept. Defaults to ``None``, in which case each command keeps its own
+        in memory. Use a :class:`.SocketCooldownStore` to share them between
+        processes.
+
+        With a store, :meth:`.Command.is_on_cooldown` and
+        :meth:`.Command.get_cooldown_retry_after` reflect the state this process
+        last saw and :func:`.max_concurrency` with ``wait=True`` polls the store.
+
+        .. versionadded:: 2.0
     """
     pass
 
@@ -122,7 +122,7 @@ class CogMeta(type):
                     if elem.startswith(('cog_', 'bot_')):
                         raise TypeError(no_bot_cog.format(base, elem))
                     commands[elem] = value
-                elif inspect.iscoroutinefunction(value):
+                elif inspect.isfunction(value):
                     try:
                         getattr(value, '__cog_listener__')
                     except AttributeError:
@@ -254,34 +254,48 @@ class Cog(metaclass=CogMeta):
         return getattr(method.__func__, '__cog_special_method__', method)
 
     @classmethod
-    def listener(cls, name=None):
+    def listener(cls, name=None, *, mode='task'):
         """A decorator that marks a function as a listener.
 
         This is the cog equivalent of :meth:`.Bot.listen`.
 
+        .. versionchanged:: 2.0
+            Added the ``mode`` parameter.
+
         Parameters
         ------------
         name: :class:`str`
             The name of the event being listened to. If not provided, it
             defaults to the function's name.
+        mode: :class:`str`
+            How the listener is run, see :meth:`.Bot.add_listener`.
 
         Raises
         --------
         TypeError
             The function is not a coroutine function or a string was not passed as
             the name.
+        ValueError
+            An unknown mode was passed.
         """
 
         if name is not None and not isinstance(name, str):
             raise TypeError(f'Cog.listener expected str but received {name.__class__.__name__!r} instead.')
 
+        if mode not in ('task', 'inline', 'worker'):
+            raise ValueError(f'Unknown listener mode {mode!r}')
+
         def decorator(func):
             actual = func
             if isinstance(actual, staticmethod):
                 actual = actual.__func__
-            if not inspect.iscoroutinefunction(actual):
+            if mode == 'inline':
+                if inspect.iscoroutinefunction(actual):
+                    raise TypeError('Inline listener function must not be a coroutine function.')
+            elif not inspect.iscoroutinefunction(actual):
                 raise TypeError('Listener function must be a coroutine function.')
             actual.__cog_listener__ = True
+            actual.__cog_listener_mode__ = mode
             to_assign = name or actual.__name__
             try:
                 actual.__cog_listener_names__.append(to_assign)
@@ -422,7 +436,8 @@ class Cog(metaclass=CogMeta):
         # already, thus this should never raise.
         # Outside of, memory errors and the like...
         for name, method_name in self.__cog_listeners__:
-            bot.add_listener(getattr(self, method_name), name)
+            listener = getattr(self, method_name)
+            bot.add_listener(listener, name, mode=getattr(listener, '__cog_listener_mode__', 'task'))
 
         return self
 
@@ -434,8 +449,8 @@ class Cog(metaclass=CogMeta):
                 if command.parent is None:
                     bot.remove_command(command.name)
 
-            for _, method_name in self.__cog_listeners__:
-                bot.remove_listener(getattr(self, method_name))
+            for name, method_name in self.__cog_listeners__:
+                bot.remove_listener(getattr(self, method_name), name)
 
             if cls.bot_check is not Cog.bot_check:
                 bot.remove_check(self.bot_check)
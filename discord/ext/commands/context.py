@@ -100,6 +100,9 @@ class Context(discord.abc.Messageable):
         self.subcommand_passed = attrs.pop('subcommand_passed', None)
         self.command_failed = attrs.pop('command_failed', False)
         self.current_parameter = attrs.pop('current_parameter', None)
+        self._check_cache = None
+        # the shared max_concurrency slots held by the commands being invoked
+        self._concurrency_leases = {}
         self._state = self.message._state
 
     async def invoke(self, command, /, *args, **kwargs):
@@ -25,7 +25,9 @@ DEALINGS IN THE SOFTWARE.
 from __future__ import annotations
 
 import re
+import asyncio
 import inspect
+import weakref
 from typing import (
     Any,
     Dict,
@@ -162,6 +164,116 @@ class ObjectConverter(IDConverter[discord.Object]):
         return discord.Object(id=result)
 
 
+class _MemberResolver:
+    # Resolves members that are not cached for a ConnectionState. Lookups by ID
+    # made within a short window are sent as one query_members request per guild
+    # and concurrent lookups of the same member or name share one request.
+    __slots__ = ('delay', '_batches', '_inflight', '_tasks')
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self._batches = {}
+        self._inflight = {}
+        # the event loop only keeps weak references to tasks
+        self._tasks = set()
+
+    async def _share(self, key, factory):
+        try:
+            future = self._inflight[key]
+        except KeyError:
+            future = self._inflight[key] = asyncio.ensure_future(factory())
+
+            def done(future):
+                self._inflight.pop(key, None)
+                # every converter waiting for it might have been cancelled
+                if not future.cancelled():
+                    future.exception()
+
+            future.add_done_callback(done)
+        return await asyncio.shield(future)
+
+    def query_named(self, guild, query, cache):
+        return self._share((guild.id, query), lambda: guild.query_members(query, limit=100, cache=cache))
+
+    def fetch(self, guild, user_id, cache):
+        async def fetch():
+            try:
+                member = await guild.fetch_member(user_id)
+            except discord.HTTPException:
+                return None
+
+            if cache:
+                guild._add_member(member)
+            return member
+
+        return self._share((guild.id, user_id), fetch)
+
+    def query_id(self, guild, user_id, cache):
+        key = (guild.id, user_id)
+        try:
+            future = self._inflight[key]
+        except KeyError:
+            pass
+        else:
+            return asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        future = self._inflight[key] = loop.create_future()
+
+        batch_key = (guild.id, cache)
+        try:
+            batch = self._batches[batch_key]
+        except KeyError:
+            batch = self._batches[batch_key] = {}
+            loop.call_later(self.delay, self._flush, guild, batch_key, batch)
+
+        batch[user_id] = future
+        if len(batch) >= 100:
+            # the most user IDs a single request can have
+            self._flush(guild, batch_key, batch)
+        return asyncio.shield(future)
+
+    def _flush(self, guild, batch_key, batch):
+        if self._batches.get(batch_key) is not batch:
+            # already flushed because it was full
+            return
+
+        del self._batches[batch_key]
+        task = asyncio.ensure_future(self._query(guild, batch_key[1], batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _query(self, guild, cache, batch):
+        try:
+            members = await guild.query_members(limit=len(batch), user_ids=list(batch), cache=cache)
+        except Exception as exc:
+            for user_id, future in batch.items():
+                self._inflight.pop((guild.id, user_id), None)
+                if not future.done():
+                    future.set_exception(exc)
+                    # the converters waiting for it get it through a shield
+                    # so it's not logged if they were all cancelled
+                    future.exception()
+            return
+
+        found = {member.id: member for member in members}
+        for user_id, future in batch.items():
+            self._inflight.pop((guild.id, user_id), None)
+            if not future.done():
+                future.set_result(found.get(user_id))
+
+
+_member_resolvers = weakref.WeakKeyDictionary()
+
+
+def _get_member_resolver(state):
+    try:
+        return _member_resolvers[state]
+    except KeyError:
+        resolver = _member_resolvers[state] = _MemberResolver()
+        return resolver
+
+
 class MemberConverter(IDConverter[discord.Member]):
     """Converts to a :class:`~discord.Member`.
 
@@ -182,38 +294,34 @@ class MemberConverter(IDConverter[discord.Member]):
     .. versionchanged:: 1.5.1
         This converter now lazily fetches members from the gateway and HTTP APIs,
         optionally caching the result if :attr:`.MemberCacheFlags.joined` is enabled.
+
+    .. versionchanged:: 2.0
+        Concurrent lookups of the same member are sent as one request and lookups
+        by ID made shortly after each other are sent as one gateway request.
     """
 
     async def query_member_named(self, guild, argument):
         cache = guild._state.member_cache_flags.joined
+        resolver = _get_member_resolver(guild._state)
         if len(argument) > 5 and argument[-5] == '#':
             username, _, discriminator = argument.rpartition('#')
-            members = await guild.query_members(username, limit=100, cache=cache)
+            members = await resolver.query_named(guild, username, cache)
             return discord.utils.get(members, name=username, discriminator=discriminator)
         else:
-            members = await guild.query_members(argument, limit=100, cache=cache)
+            members = await resolver.query_named(guild, argument, cache)
             return discord.utils.find(lambda m: m.name == argument or m.nick == argument, members)
 
     async def query_member_by_id(self, bot, guild, user_id):
         ws = bot._get_websocket(shard_id=guild.shard_id)
         cache = guild._state.member_cache_flags.joined
+        resolver = _get_member_resolver(guild._state)
         if ws.is_ratelimited():
             # If we're being rate limited on the WS, then fall back to using the HTTP API
             # So we don't have to wait ~60 seconds for the query to finish
-            try:
-                member = await guild.fetch_member(user_id)
-            except discord.HTTPException:
-                return None
-
-            if cache:
-                guild._add_member(member)
-            return member
+            return await resolver.fetch(guild, user_id, cache)
 
         # If we're not being rate limited then we can use the websocket to actually query
-        members = await guild.query_members(limit=1, user_ids=[user_id], cache=cache)
-        if not members:
-            return None
-        return members[0]
+        return await resolver.query_id(guild, user_id, cache)
 
     async def convert(self, ctx: Context, argument: str) -> discord.Member:
         bot = ctx.bot
@@ -925,81 +1033,80 @@ CONVERTER_MAPPING: Dict[Type[Any], Any] = {
 }
 
 
-async def _actual_conversion(ctx: Context, converter, argument: str, param: inspect.Parameter):
-    if converter is bool:
-        return _convert_to_bool(argument)
+# The kinds of plain conversions a _ConversionPlan can perform
+_CONVERT_BOOL = 0
+_CONVERT_CLASS_METHOD = 1
+_CONVERT_CLASS = 2
+_CONVERT_INSTANCE = 3
+_CONVERT_CALLABLE = 4
 
-    try:
-        module = converter.__module__
-    except AttributeError:
-        pass
-    else:
-        if module is not None and (module.startswith('discord.') and not module.endswith('converter')):
-            converter = CONVERTER_MAPPING.get(converter, converter)
 
-    try:
-        if inspect.isclass(converter) and issubclass(converter, Converter):
-            if inspect.ismethod(converter.convert):
-                return await converter.convert(ctx, argument)
+class _ConversionPlan:
+    # A single converter with every decision that only depends on the
+    # converter itself already made.
+    __slots__ = ('converter', 'kind', 'name')
+
+    def __init__(self, converter):
+        if converter is bool:
+            kind = _CONVERT_BOOL
+        else:
+            try:
+                module = converter.__module__
+            except AttributeError:
+                pass
             else:
-                return await converter().convert(ctx, argument)
-        elif isinstance(converter, Converter):
-            return await converter.convert(ctx, argument)
-    except CommandError:
-        raise
-    except Exception as exc:
-        raise ConversionError(converter, exc) from exc
+                if module is not None and (module.startswith('discord.') and not module.endswith('converter')):
+                    converter = CONVERTER_MAPPING.get(converter, converter)
 
-    try:
-        return converter(argument)
-    except CommandError:
-        raise
-    except Exception as exc:
+            if inspect.isclass(converter) and issubclass(converter, Converter):
+                kind = _CONVERT_CLASS_METHOD if inspect.ismethod(converter.convert) else _CONVERT_CLASS
+            elif isinstance(converter, Converter):
+                kind = _CONVERT_INSTANCE
+            else:
+                kind = _CONVERT_CALLABLE
+
+        self.converter = converter
+        self.kind = kind
         try:
-            name = converter.__name__
+            self.name = converter.__name__
         except AttributeError:
-            name = converter.__class__.__name__
+            self.name = converter.__class__.__name__
 
-        raise BadArgument(f'Converting to "{name}" failed for parameter "{param.name}".') from exc
+    async def convert(self, ctx: Context, argument: str, param: inspect.Parameter):
+        kind = self.kind
+        converter = self.converter
+        if kind is _CONVERT_BOOL:
+            return _convert_to_bool(argument)
 
+        if kind is not _CONVERT_CALLABLE:
+            try:
+                if kind is _CONVERT_CLASS:
+                    return await converter().convert(ctx, argument)
+                return await converter.convert(ctx, argument)
+            except CommandError:
+                raise
+            except Exception as exc:
+                raise ConversionError(converter, exc) from exc
 
-async def run_converters(ctx: Context, converter, argument: str, param: inspect.Parameter):
-    """|coro|
+        try:
+            return converter(argument)
+        except CommandError:
+            raise
+        except Exception as exc:
+            raise BadArgument(f'Converting to "{self.name}" failed for parameter "{param.name}".') from exc
 
-    Runs converters for a given converter, argument, and parameter.
 
-    This function does the same work that the library does under the hood.
+class _UnionPlan:
+    __slots__ = ('args', 'plans')
 
-    .. versionadded:: 2.0
+    def __init__(self, converter):
+        self.args = converter.__args__
+        self.plans = [_get_conversion_plan(conv) for conv in self.args]
 
-    Parameters
-    ------------
-    ctx: :class:`Context`
-        The invocation context to run the converters under.
-    converter: Any
-        The converter to run, this corresponds to the annotation in the function.
-    argument: :class:`str`
-        The argument to convert to.
-    param: :class:`inspect.Parameter`
-        The parameter being converted. This is mainly for error reporting.
-
-    Raises
-    -------
-    CommandError
-        The converter failed to convert.
-
-    Returns
-    --------
-    Any
-        The resulting conversion.
-    """
-    origin = getattr(converter, '__origin__', None)
-
-    if origin is Union:
+    async def convert(self, ctx: Context, argument: str, param: inspect.Parameter):
         errors = []
         _NoneType = type(None)
-        union_args = converter.__args__
-        for conv in union_args:
+        for conv, plan in zip(self.args, self.plans):
             # if we got to this part in the code, then the previous conversions have failed
             # so we should just undo the view, return the default, and allow parsing to continue
             # with the other parameters
@@ -1008,26 +1115,35 @@ async def run_converters(ctx: Context, converter, argument: str, param: inspect.
                 return None if param.default is param.empty else param.default
 
             try:
-                value = await run_converters(ctx, conv, argument, param)
+                return await plan.convert(ctx, argument, param)
             except CommandError as exc:
                 errors.append(exc)
-            else:
-                return value
 
         # if we're here, then we failed all the converters
-        raise BadUnionArgument(param, union_args, errors)
+        raise BadUnionArgument(param, self.args, errors)
+
+
+class _LiteralPlan:
+    __slots__ = ('args', 'plans')
 
-    if origin is Literal:
+    def __init__(self, converter):
+        self.args = converter.__args__
+        self.plans = {}
+        for literal in self.args:
+            literal_type = type(literal)
+            if literal_type not in self.plans:
+                self.plans[literal_type] = _ConversionPlan(literal_type)
+
+    async def convert(self, ctx: Context, argument: str, param: inspect.Parameter):
         errors = []
         conversions = {}
-        literal_args = converter.__args__
-        for literal in literal_args:
+        for literal in self.args:
             literal_type = type(literal)
             try:
                 value = conversions[literal_type]
             except KeyError:
                 try:
-                    value = await _actual_conversion(ctx, literal_type, argument, param)
+                    value = await self.plans[literal_type].convert(ctx, argument, param)
                 except CommandError as exc:
                     errors.append(exc)
                     conversions[literal_type] = object()
@@ -1039,6 +1155,68 @@ async def run_converters(ctx: Context, converter, argument: str, param: inspect.
                 return value
 
         # if we're here, then we failed to match all the literals
-        raise BadLiteralArgument(param, literal_args, errors)
+        raise BadLiteralArgument(param, self.args, errors)
+
+
+# id(converter) -> (converter, plan)
+# This is keyed by identity since typing considers Union[int, str] and
+# Union[str, int] to be equal while the conversion order differs.
+_conversion_plans: Dict[int, Tuple[Any, Any]] = {}
 
-    return await _actual_conversion(ctx, converter, argument, param)
+
+def _get_conversion_plan(converter):
+    key = id(converter)
+    try:
+        cached, plan = _conversion_plans[key]
+    except KeyError:
+        pass
+    else:
+        if cached is converter:
+            return plan
+
+    origin = getattr(converter, '__origin__', None)
+    if origin is Union:
+        plan = _UnionPlan(converter)
+    elif origin is Literal:
+        plan = _LiteralPlan(converter)
+    else:
+        plan = _ConversionPlan(converter)
+
+    if len(_conversion_plans) >= 1024:
+        # converters created on the fly can otherwise grow this forever
+        del _conversion_plans[next(iter(_conversion_plans))]
+    _conversion_plans[key] = (converter, plan)
+    return plan
+
+
+async def run_converters(ctx: Context, converter, argument: str, param: inspect.Parameter):
+    """|coro|
+
+    Runs converters for a given converter, argument, and parameter.
+
+    This function does the same work that the library does under the hood.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    ------------
+    ctx: :class:`Context`
+        The invocation context to run the converters under.
+    converter: Any
+        The converter to run, this corresponds to the annotation in the function.
+    argument: :class:`str`
+        The argument to convert to.
+    param: :class:`inspect.Parameter`
+        The parameter being converted. This is mainly for error reporting.
+
+    Raises
+    -------
+    CommandError
+        The converter failed to convert.
+
+    Returns
+    --------
+    Any
+        The resulting conversion.
+    """
+    return await _get_conversion_plan(converter).convert(ctx, argument, param)
@@ -25,7 +25,7 @@ DEALINGS IN THE SOFTWARE.
 from discord.enums import Enum
 import time
 import asyncio
-from collections import deque
+from collections import deque, OrderedDict
 
 from ...abc import PrivateChannel
 from .errors import MaxConcurrencyReached
@@ -131,18 +131,30 @@ class Cooldown:
         return f'<Cooldown rate: {self.rate} per: {self.per} window: {self._window} tokens: {self._tokens}>'
 
 class CooldownMapping:
-    def __init__(self, original, type):
+    def __init__(self, original, type, *, max_size=None):
         if not callable(type):
             raise TypeError('Cooldown type must be a BucketType or callable')
+        if max_size is not None and max_size < 1:
+            raise ValueError('max_size must be at least 1')
 
         self._cache = {}
+        # The keys in order of last use, grouped by the cooldown's period.
+        # Within a group the front is always the first one to expire so stale
+        # keys are found without scanning the whole cache. Anything changing
+        # a bucket's _last has to call _touch to keep this true.
+        self._expiry = {}
         self._cooldown = original
         self._type = type
+        self.max_size = max_size
+
+    def _copy_cache(self, other):
+        other._cache = self._cache.copy()
+        other._expiry = {per: keys.copy() for per, keys in self._expiry.items()}
+        return other
 
     def copy(self):
-        ret = CooldownMapping(self._cooldown, self._type)
-        ret._cache = self._cache.copy()
-        return ret
+        ret = CooldownMapping(self._cooldown, self._type, max_size=self.max_size)
+        return self._copy_cache(ret)
 
     @property
     def valid(self):
@@ -160,9 +172,45 @@ class CooldownMapping:
         # in a cooldown window. e.g. if we have a  command that has a
         # cooldown of 60s and it has not been used in 60s then that key should be deleted
         current = current or time.time()
-        dead_keys = [k for k, v in self._cache.items() if current > v._last + v.per]
-        for k in dead_keys:
-            del self._cache[k]
+        cache = self._cache
+        empty = None
+        for per, keys in self._expiry.items():
+            while keys:
+                key = next(iter(keys))
+                bucket = cache[key]
+                if current <= bucket._last + bucket.per:
+                    break
+                del keys[key]
+                del cache[key]
+            else:
+                empty = per
+
+        if empty is not None:
+            # periods of dynamic cooldowns can come and go
+            del self._expiry[empty]
+
+    def _evict(self):
+        # drop the key closest to expiring, only the front of each group
+        # has to be looked at for that
+        cache = self._cache
+        oldest = None
+        for keys in self._expiry.values():
+            if keys:
+                key = next(iter(keys))
+                bucket = cache[key]
+                if oldest is None or bucket._last + bucket.per < oldest[0]:
+                    oldest = (bucket._last + bucket.per, keys, key)
+
+        _, keys, key = oldest
+        del keys[key]
+        del cache[key]
+
+    def _touch(self, key, bucket):
+        # moves the key to where its new _last puts it, buckets that were
+        # never used or were reset expire first
+        keys = self._expiry.get(bucket.per)
+        if keys is not None and key in keys:
+            keys.move_to_end(key, last=bool(bucket._last))
 
     def create_bucket(self, message):
         return self._cooldown.copy()
@@ -171,31 +219,55 @@ class CooldownMapping:
         if self._type is BucketType.default:
             return self._cooldown
 
+        current = current or time.time()
         self._verify_cache_integrity(current)
         key = self._bucket_key(message)
-        if key not in self._cache:
-            bucket = self.create_bucket(message)
-            if bucket is not None:
-                self._cache[key] = bucket
+        cache = self._cache
+        try:
+            bucket = cache[key]
+        except KeyError:
+            bucket = None
         else:
-            bucket = self._cache[key]
+            if current > bucket._last + bucket.per:
+                # stale but not swept yet, same as if it had been
+                self._expiry[bucket.per].pop(key, None)
+                del cache[key]
+                bucket = None
+
+        if bucket is None:
+            bucket = self.create_bucket(message)
+            if bucket is None:
+                return None
+            cache[key] = bucket
+            if self.max_size is not None and len(cache) > self.max_size:
+                # the new key is not in the expiry order yet so it cannot be picked
+                self._evict()
+
+            try:
+                keys = self._expiry[bucket.per]
+            except KeyError:
+                keys = self._expiry[bucket.per] = OrderedDict()
+
+            keys[key] = None
+            self._touch(key, bucket)
 
         return bucket
 
     def update_rate_limit(self, message, current=None):
         bucket = self.get_bucket(message, current)
-        return bucket.update_rate_limit(current)
+        retry_after = bucket.update_rate_limit(current)
+        self._touch(self._bucket_key(message), bucket)
+        return retry_after
 
 class DynamicCooldownMapping(CooldownMapping):
 
-    def __init__(self, factory, type):
-        super().__init__(None, type)
+    def __init__(self, factory, type, *, max_size=None):
+        super().__init__(None, type, max_size=max_size)
         self._factory = factory
 
     def copy(self):
-        ret = DynamicCooldownMapping(self._factory, self._type)
-        ret._cache = self._cache.copy()
-        return ret
+        ret = DynamicCooldownMapping(self._factory, self._type, max_size=self.max_size)
+        return self._copy_cache(ret)
 
     @property
     def valid(self):
@@ -36,6 +36,7 @@ import asyncio
 import functools
 import inspect
 import datetime
+import logging
 import types
 import sys
 
@@ -43,9 +44,10 @@ import discord
 
 from .errors import *
 from .cooldowns import Cooldown, BucketType, CooldownMapping, MaxConcurrency, DynamicCooldownMapping
-from .converter import run_converters, get_converter, Greedy
+from .converter import get_converter, Greedy, _get_conversion_plan
 from ._types import _BaseCommand
 from .cog import Cog
+from .stores import _ConcurrencyLease
 
 __all__ = (
     'Command',
@@ -74,6 +76,16 @@ __all__ = (
     'bot_has_guild_permissions'
 )
 
+log = logging.getLogger(__name__)
+
+# the background calls to a cooldown store, kept so they aren't garbage collected
+_store_tasks = set()
+
+def _store_task_done(task):
+    _store_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        log.error('Resetting a shared cooldown failed.', exc_info=task.exception())
+
 PY_310 = sys.version_info >= (3, 10)
 
 def flatten_literal_params(parameters: Iterable[Any]) -> Tuple[Any, ...]:
@@ -218,13 +230,59 @@ def hooked_wrapped_callback(command, ctx, coro):
             raise CommandInvokeError(exc) from exc
         finally:
             if command._max_concurrency is not None:
-                await command._max_concurrency.release(ctx)
+                await command._release_concurrency(ctx)
 
             await command.call_after_hooks(ctx)
         return ret
     return wrapped
 
 
+class _ParameterPlan:
+    # Everything Command.transform needs to know about a parameter that
+    # does not depend on the invocation, computed once per signature.
+    __slots__ = ('param', 'converter', 'conversion', 'greedy', 'required', 'optional', 'flag_default')
+
+    def __init__(self, command, param):
+        self.param = param
+        self.required = param.default is param.empty
+        self.optional = command._is_typing_optional(param.annotation)
+
+        converter = get_converter(param)
+        self.greedy = isinstance(converter, Greedy)
+        if self.greedy:
+            converter = converter.converter
+
+        self.converter = converter
+        self.conversion = _get_conversion_plan(converter)
+        self.flag_default = hasattr(converter, '__commands_is_flag__') and converter._can_be_constructible()
+
+class _CheckCache:
+    # Shares the results of checks between the commands checked under the same
+    # context. The built-in checks only depend on the context so they are always
+    # shared, other checks only if ``shared`` is set since they could depend
+    # on ctx.command.
+    __slots__ = ('results', 'shared')
+
+    def __init__(self, shared):
+        self.results = {}
+        self.shared = shared
+
+    async def run(self, key, func, ctx):
+        if key is None:
+            return await discord.utils.maybe_coroutine(func, ctx)
+
+        try:
+            future = self.results[key]
+        except KeyError:
+            future = self.results[key] = asyncio.ensure_future(discord.utils.maybe_coroutine(func, ctx))
+        return await asyncio.shield(future)
+
+    def get_key(self, predicate):
+        try:
+            return predicate.__commands_check_key__
+        except AttributeError:
+            return predicate if self.shared else None
+
 class _CaseInsensitiveDict(dict):
     def __contains__(self, k):
         return super().__contains__(k.casefold())
@@ -416,7 +474,8 @@ class Command(_BaseCommand):
     def callback(self, function):
         self._callback = function
         self.module = function.__module__
-        self.params = get_signature_parameters(function)
+        self.params = params = get_signature_parameters(function)
+        self._parameter_plans = (params, {name: _ParameterPlan(self, param) for name, param in params.items()})
 
     def add_check(self, func):
         """Adds a check to the command.
@@ -538,33 +597,52 @@ class Command(_BaseCommand):
         finally:
             ctx.bot.dispatch('command_error', ctx, error)
 
+    def _get_parameter_plan(self, param):
+        # The plans are rebuilt whenever the callback or params are replaced.
+        cached = self._parameter_plans
+        params = self.params
+        if cached[0] is not params:
+            cached = self._parameter_plans = (params, {})
+
+        plans = cached[1]
+        try:
+            plan = plans[param.name]
+        except KeyError:
+            pass
+        else:
+            if plan.param is param:
+                return plan
+
+        plan = _ParameterPlan(self, param)
+        if params.get(param.name) is param:
+            plans[param.name] = plan
+        return plan
+
     async def transform(self, ctx, param):
-        required = param.default is param.empty
-        converter = get_converter(param)
+        plan = self._get_parameter_plan(param)
+        converter = plan.converter
         consume_rest_is_special = param.kind == param.KEYWORD_ONLY and not self.rest_is_raw
         view = ctx.view
         view.skip_ws()
 
         # The greedy converter is simple -- it keeps going until it fails in which case,
         # it undos the view ready for the next parameter to use instead
-        if isinstance(converter, Greedy):
+        if plan.greedy:
             if param.kind in (param.POSITIONAL_OR_KEYWORD, param.POSITIONAL_ONLY):
-                return await self._transform_greedy_pos(ctx, param, required, converter.converter)
+                return await self._transform_greedy_pos(ctx, param, plan.required, plan.conversion)
             elif param.kind == param.VAR_POSITIONAL:
-                return await self._transform_greedy_var_pos(ctx, param, converter.converter)
-            else:
-                # if we're here, then it's a KEYWORD_ONLY param type
-                # since this is mostly useless, we'll helpfully transform Greedy[X]
-                # into just X and do the parsing that way.
-                converter = converter.converter
+                return await self._transform_greedy_var_pos(ctx, param, plan.conversion)
+            # if we're here, then it's a KEYWORD_ONLY param type
+            # since this is mostly useless, we'll helpfully transform Greedy[X]
+            # into just X and do the parsing that way.
 
         if view.eof:
             if param.kind == param.VAR_POSITIONAL:
                 raise RuntimeError() # break the loop
-            if required:
-                if self._is_typing_optional(param.annotation):
+            if plan.required:
+                if plan.optional:
                     return None
-                if hasattr(converter, '__commands_is_flag__') and converter._can_be_constructible():
+                if plan.flag_default:
                     return await converter._construct_default(ctx)
                 raise MissingRequiredArgument(param)
             return param.default
@@ -576,9 +654,9 @@ class Command(_BaseCommand):
             argument = view.get_quoted_word()
         view.previous = previous
 
-        return await run_converters(ctx, converter, argument, param)
+        return await plan.conversion.convert(ctx, argument, param)
 
-    async def _transform_greedy_pos(self, ctx, param, required, converter):
+    async def _transform_greedy_pos(self, ctx, param, required, conversion):
         view = ctx.view
         result = []
         while not view.eof:
@@ -588,7 +666,7 @@ class Command(_BaseCommand):
             view.skip_ws()
             try:
                 argument = view.get_quoted_word()
-                value = await run_converters(ctx, converter, argument, param)
+                value = await conversion.convert(ctx, argument, param)
             except (CommandError, ArgumentParsingError):
                 view.index = previous
                 break
@@ -599,12 +677,12 @@ class Command(_BaseCommand):
             return param.default
         return result
 
-    async def _transform_greedy_var_pos(self, ctx, param, converter):
+    async def _transform_greedy_var_pos(self, ctx, param, conversion):
         view = ctx.view
         previous = view.index
         try:
             argument = view.get_quoted_word()
-            value = await run_converters(ctx, converter, argument, param)
+            value = await conversion.convert(ctx, argument, param)
         except (CommandError, ArgumentParsingError):
             view.index = previous
             raise RuntimeError() from None # break loop
@@ -728,9 +806,8 @@ class Command(_BaseCommand):
             elif param.kind == param.KEYWORD_ONLY:
                 # kwarg only param denotes "consume rest" semantics
                 if self.rest_is_raw:
-                    converter = get_converter(param)
                     argument = view.read_rest()
-                    kwargs[name] = await run_converters(ctx, converter, argument, param)
+                    kwargs[name] = await self._get_parameter_plan(param).conversion.convert(ctx, argument, param)
                 else:
                     kwargs[name] = await self.transform(ctx, param)
                 break
@@ -791,16 +868,75 @@ class Command(_BaseCommand):
         if hook is not None:
             await hook(ctx)
 
-    def _prepare_cooldowns(self, ctx):
+    def _get_store_key(self, kind, key):
+        return f'{kind}:{self.qualified_name}:{key!r}'
+
+    async def _prepare_cooldowns(self, ctx):
         if self._buckets.valid:
             dt = ctx.message.edited_at or ctx.message.created_at
             current = dt.replace(tzinfo=datetime.timezone.utc).timestamp()
             bucket = self._buckets.get_bucket(ctx.message, current)
             if bucket is not None:
-                retry_after = bucket.update_rate_limit(current)
+                bucket_key = self._buckets._bucket_key(ctx.message)
+                store = getattr(ctx.bot, 'cooldown_store', None)
+                if store is None:
+                    retry_after = bucket.update_rate_limit(current)
+                else:
+                    key = self._get_store_key('cooldown', bucket_key)
+                    try:
+                        state = await store.update_rate_limit(key, bucket.rate, bucket.per, current)
+                    except Exception as exc:
+                        raise CooldownStoreError(exc) from exc
+                    # mirror the shared state so the synchronous cooldown methods see it
+                    bucket._tokens = state.tokens
+                    bucket._window = state.window
+                    bucket._last = current
+                    retry_after = state.retry_after
+
+                self._buckets._touch(bucket_key, bucket)
+
                 if retry_after:
                     raise CommandOnCooldown(bucket, retry_after)
 
+    async def _acquire_concurrency(self, ctx):
+        store = getattr(ctx.bot, 'cooldown_store', None)
+        if store is None:
+            await self._max_concurrency.acquire(ctx)
+            return
+
+        # a shared counter cannot wake up waiters in other processes so poll it instead
+        concurrency = self._max_concurrency
+        key = self._get_store_key('concurrency', concurrency.get_key(ctx))
+        delay = 0.1
+        while True:
+            try:
+                token = await store.acquire(key, concurrency.number, store.concurrency_lease)
+            except Exception as exc:
+                raise CooldownStoreError(exc) from exc
+            if token is not None:
+                break
+            if not concurrency.wait:
+                raise MaxConcurrencyReached(concurrency.number, concurrency.per)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 1.0)
+
+        ctx._concurrency_leases[self] = _ConcurrencyLease(store, key, token)
+
+    async def _release_concurrency(self, ctx):
+        store = getattr(ctx.bot, 'cooldown_store', None)
+        if store is None:
+            await self._max_concurrency.release(ctx)
+        else:
+            lease = ctx._concurrency_leases.pop(self, None)
+            if lease is None:
+                return
+            try:
+                await lease.release()
+            except Exception:
+                # this must not replace the command's result or error, the
+                # slot is given back by the store once its lease runs out
+                log.warning('Releasing the concurrency slot %s failed.', lease.key, exc_info=True)
+
     async def prepare(self, ctx):
         ctx.command = self
 
@@ -808,20 +944,20 @@ class Command(_BaseCommand):
             raise CheckFailure(f'The check functions for command {self.qualified_name} failed.')
 
         if self._max_concurrency is not None:
-            await self._max_concurrency.acquire(ctx)
+            await self._acquire_concurrency(ctx)
 
         try:
             if self.cooldown_after_parsing:
                 await self._parse_arguments(ctx)
-                self._prepare_cooldowns(ctx)
+                await self._prepare_cooldowns(ctx)
             else:
-                self._prepare_cooldowns(ctx)
+                await self._prepare_cooldowns(ctx)
                 await self._parse_arguments(ctx)
 
             await self.call_before_hooks(ctx)
         except:
             if self._max_concurrency is not None:
-                await self._max_concurrency.release(ctx)
+                await self._release_concurrency(ctx)
             raise
 
     def is_on_cooldown(self, ctx):
@@ -848,14 +984,36 @@ class Command(_BaseCommand):
     def reset_cooldown(self, ctx):
         """Resets the cooldown on this command.
 
+        .. versionchanged:: 2.0
+            Returns the task resetting the bucket of the bot's ``cooldown_store``.
+
         Parameters
         -----------
         ctx: :class:`.Context`
             The invocation context to reset the cooldown under.
+
+        Returns
+        --------
+        Optional[:class:`asyncio.Task`]
+            The task resetting the bucket in the bot's ``cooldown_store``. It
+            can be awaited to wait for the reset and its errors are logged.
+            ``None`` if the bot has no store.
         """
         if self._buckets.valid:
             bucket = self._buckets.get_bucket(ctx.message)
             bucket.reset()
+            bucket_key = self._buckets._bucket_key(ctx.message)
+            self._buckets._touch(bucket_key, bucket)
+
+            store = getattr(ctx.bot, 'cooldown_store', None)
+            if store is not None:
+                key = self._get_store_key('cooldown', bucket_key)
+                task = ctx.bot.loop.create_task(store.reset(key))
+                _store_tasks.add(task)
+                task.add_done_callback(_store_task_done)
+                return task
+
+        return None
 
     def get_cooldown_retry_after(self, ctx):
         """Retrieves the amount of seconds before this command can be tried again.
@@ -1103,6 +1261,13 @@ class Command(_BaseCommand):
         original = ctx.command
         ctx.command = self
 
+        cache = getattr(ctx, '_check_cache', None)
+        if cache is not None:
+            try:
+                return await self._can_run_cached(ctx, cache)
+            finally:
+                ctx.command = original
+
         try:
             if not await ctx.bot.can_run(ctx):
                 raise CheckFailure(f'The global check functions for command {self.qualified_name} failed.')
@@ -1124,6 +1289,23 @@ class Command(_BaseCommand):
         finally:
             ctx.command = original
 
+    async def _can_run_cached(self, ctx, cache):
+        shared = cache.shared
+        if not await cache.run('global' if shared else None, ctx.bot.can_run, ctx):
+            raise CheckFailure(f'The global check functions for command {self.qualified_name} failed.')
+
+        cog = self.cog
+        if cog is not None:
+            local_check = Cog._get_overridden_method(cog.cog_check)
+            if local_check is not None:
+                if not await cache.run(('cog_check', cog) if shared else None, local_check, ctx):
+                    return False
+
+        for predicate in self.checks:
+            if not await cache.run(cache.get_key(predicate), predicate, ctx):
+                return False
+        return True
+
 class GroupMixin:
     """A mixin that implements common functionality for classes that behave
     similar to :class:`.Group` and are allowed to register commands.
@@ -1682,6 +1864,7 @@ def has_role(item):
             raise MissingRole(item)
         return True
 
+    predicate.__commands_check_key__ = ('has_role', item)
     return check(predicate)
 
 def has_any_role(*items):
@@ -1724,6 +1907,7 @@ def has_any_role(*items):
             return True
         raise MissingAnyRole(items)
 
+    predicate.__commands_check_key__ = ('has_any_role', items)
     return check(predicate)
 
 def bot_has_role(item):
@@ -1753,6 +1937,7 @@ def bot_has_role(item):
         if role is None:
             raise BotMissingRole(item)
         return True
+    predicate.__commands_check_key__ = ('bot_has_role', item)
     return check(predicate)
 
 def bot_has_any_role(*items):
@@ -1778,6 +1963,7 @@ def bot_has_any_role(*items):
         if any(getter(id=item) is not None if isinstance(item, int) else getter(name=item) is not None for item in items):
             return True
         raise BotMissingAnyRole(items)
+    predicate.__commands_check_key__ = ('bot_has_any_role', items)
     return check(predicate)
 
 def has_permissions(**perms):
@@ -1825,6 +2011,7 @@ def has_permissions(**perms):
 
         raise MissingPermissions(missing)
 
+    predicate.__commands_check_key__ = ('has_permissions', frozenset(perms.items()))
     return check(predicate)
 
 def bot_has_permissions(**perms):
@@ -1851,6 +2038,7 @@ def bot_has_permissions(**perms):
 
         raise BotMissingPermissions(missing)
 
+    predicate.__commands_check_key__ = ('bot_has_permissions', frozenset(perms.items()))
     return check(predicate)
 
 def has_guild_permissions(**perms):
@@ -1879,6 +2067,7 @@ def has_guild_permissions(**perms):
 
         raise MissingPermissions(missing)
 
+    predicate.__commands_check_key__ = ('has_guild_permissions', frozenset(perms.items()))
     return check(predicate)
 
 def bot_has_guild_permissions(**perms):
@@ -1904,6 +2093,7 @@ def bot_has_guild_permissions(**perms):
 
         raise BotMissingPermissions(missing)
 
+    predicate.__commands_check_key__ = ('bot_has_guild_permissions', frozenset(perms.items()))
     return check(predicate)
 
 def dm_only():
@@ -1922,6 +2112,7 @@ def dm_only():
             raise PrivateMessageOnly()
         return True
 
+    predicate.__commands_check_key__ = ('dm_only',)
     return check(predicate)
 
 def guild_only():
@@ -1938,6 +2129,7 @@ def guild_only():
             raise NoPrivateMessage()
         return True
 
+    predicate.__commands_check_key__ = ('guild_only',)
     return check(predicate)
 
 def is_owner():
@@ -1955,6 +2147,7 @@ def is_owner():
             raise NotOwner('You do not own this bot.')
         return True
 
+    predicate.__commands_check_key__ = ('is_owner',)
     return check(predicate)
 
 def is_nsfw():
@@ -1973,9 +2166,10 @@ def is_nsfw():
         if ctx.guild is None or (isinstance(ch, discord.TextChannel) and ch.is_nsfw()):
             return True
         raise NSFWChannelRequired(ch)
+    pred.__commands_check_key__ = ('is_nsfw',)
     return check(pred)
 
-def cooldown(rate, per, type=BucketType.default):
+def cooldown(rate, per, type=BucketType.default, *, max_size=None):
     """A decorator that adds a cooldown to a :class:`.Command`
 
     A cooldown allows a command to only be used a specific amount
@@ -2000,17 +2194,23 @@ def cooldown(rate, per, type=BucketType.default):
 
         .. versionchanged:: 1.7
             Callables are now supported for custom bucket types.
+    max_size: Optional[:class:`int`]
+        The maximum number of buckets to keep track of. When exceeded, the bucket
+        closest to expiring is forgotten, resetting its cooldown. Defaults to ``None``
+        which means no limit. Expired buckets are always discarded.
+
+        .. versionadded:: 2.0
     """
 
     def decorator(func):
         if isinstance(func, Command):
-            func._buckets = CooldownMapping(Cooldown(rate, per), type)
+            func._buckets = CooldownMapping(Cooldown(rate, per), type, max_size=max_size)
         else:
-            func.__commands_cooldown__ = CooldownMapping(Cooldown(rate, per), type)
+            func.__commands_cooldown__ = CooldownMapping(Cooldown(rate, per), type, max_size=max_size)
         return func
     return decorator
 
-def dynamic_cooldown(cooldown, type=BucketType.default):
+def dynamic_cooldown(cooldown, type=BucketType.default, *, max_size=None):
     """A decorator that adds a dynamic cooldown to a :class:`.Command`
 
     This differs from :func:`.cooldown` in that it takes a function that
@@ -2037,15 +2237,17 @@ def dynamic_cooldown(cooldown, type=BucketType.default):
         apply to this invocation
     type: :class:`.BucketType`
         The type of cooldown to have.
+    max_size: Optional[:class:`int`]
+        The maximum number of buckets to keep track of. See :func:`.cooldown`.
     """
     if not callable(cooldown):
         raise TypeError("A callable must be provided")
 
     def decorator(func):
         if isinstance(func, Command):
-            func._buckets = DynamicCooldownMapping(cooldown, type)
+            func._buckets = DynamicCooldownMapping(cooldown, type, max_size=max_size)
         else:
-            func.__commands_cooldown__ = DynamicCooldownMapping(cooldown, type)
+            func.__commands_cooldown__ = DynamicCooldownMapping(cooldown, type, max_size=max_size)
         return func
     return decorator
 
@@ -40,6 +40,7 @@ __all__ = (
     'UserInputError',
     'CommandOnCooldown',
     'MaxConcurrencyReached',
+    'CooldownStoreError',
     'NotOwner',
     'MessageNotFound',
     'ObjectNotFound',
@@ -490,6 +491,24 @@ class MaxConcurrencyReached(CommandError):
         fmt = plural % (number, suffix)
         super().__init__(f'Too many people using this command. It can only be used {fmt} concurrently.')
 
+class CooldownStoreError(CommandError):
+    """Exception raised when the bot's :class:`.CooldownStore` failed to
+    check the command's cooldown or concurrency limit.
+
+    This inherits from :exc:`CommandError`.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    -----------
+    original: :exc:`Exception`
+        The original exception that was raised. You can also get this via
+        the ``__cause__`` attribute.
+    """
+    def __init__(self, e):
+        self.original = e
+        super().__init__(f'The cooldown store raised an exception: {e.__class__.__name__}: {e}')
+
 class MissingRole(CheckFailure):
     """Exception raised when the command invoker lacks a role to run a command.
 
@@ -22,6 +22,8 @@ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 DEALINGS IN THE SOFTWARE.
 """
 
+import asyncio
+import collections
 import itertools
 import copy
 import functools
@@ -29,7 +31,7 @@ import inspect
 import re
 import discord.utils
 
-from .core import Group, Command
+from .core import Group, Command, _CheckCache
 from .errors import CommandError
 
 __all__ = (
@@ -184,6 +186,8 @@ class _HelpCommandImpl(Command):
         super().__init__(inject.command_callback, *args, **kwargs)
         self._original = inject
         self._injected = inject
+        # shared between the copies of the help command made per invocation
+        self._page_cache = collections.OrderedDict()
 
     async def prepare(self, ctx):
         self._injected = injected = self._original.copy()
@@ -282,6 +286,30 @@ class HelpCommand:
         If ``False``, never calls :attr:`.Commands.checks`. Defaults to ``True``.
 
         .. versionchanged:: 1.7
+    check_concurrency: :class:`int`
+        How many commands :meth:`filter_commands` verifies the checks of at the
+        same time. Defaults to ``1``, which runs them one after the other.
+        Checks run concurrently are given a shallow copy of the :attr:`context`,
+        so only raise this if the checks do not modify the context or share
+        state such as database sessions.
+
+        .. versionadded:: 2.0
+    cache_checks: :class:`bool`
+        Whether :meth:`filter_commands` runs the global checks, cog checks and
+        checks shared by multiple commands only once per help invocation instead of
+        once per command. Only enable this if these checks do not depend on
+        :attr:`.Context.command`. The built-in checks such as :func:`.has_permissions`
+        are always only run once per help invocation. Defaults to ``False``.
+
+        .. versionadded:: 2.0
+    page_cache_size: :class:`int`
+        How many rendered help pages :class:`DefaultHelpCommand` and
+        :class:`MinimalHelpCommand` keep between invocations. A page is reused when
+        the same set of commands is visible and the prefix and invoked name are the
+        same. Defaults to ``0``, which disables the cache. Only enable this if the
+        output does not depend on anything else, such as the invoking user.
+
+        .. versionadded:: 2.0
     command_attrs: :class:`dict`
         A dictionary of options to pass in for the construction of the help command.
         This allows you to change the command behaviour without actually changing
@@ -317,6 +345,9 @@ class HelpCommand:
     def __init__(self, **options):
         self.show_hidden = options.pop('show_hidden', False)
         self.verify_checks = options.pop('verify_checks', True)
+        self.check_concurrency = options.pop('check_concurrency', 1)
+        self.cache_checks = options.pop('cache_checks', False)
+        self.page_cache_size = options.pop('page_cache_size', 0)
         self.command_attrs = attrs = options.pop('command_attrs', {})
         attrs.setdefault('name', 'help')
         attrs.setdefault('help', 'Shows this message')
@@ -564,22 +595,84 @@ class HelpCommand:
             return sorted(iterator, key=key) if sort else list(iterator)
 
         # if we're here then we need to check every command if it can run
-        async def predicate(cmd):
+        ctx = self.context
+        cache = _CheckCache(self.cache_checks)
+        commands = list(iterator)
+        results = [False] * len(commands)
+        pending = iter(enumerate(commands))
+        concurrency = min(self.check_concurrency, len(commands))
+
+        async def predicate(cmd, ctx):
             try:
-                return await cmd.can_run(self.context)
+                return await cmd.can_run(ctx)
             except CommandError:
                 return False
 
-        ret = []
-        for cmd in iterator:
-            valid = await predicate(cmd)
-            if valid:
-                ret.append(cmd)
+        async def worker(ctx):
+            # the workers share the iterator so each command is checked once
+            for index, cmd in pending:
+                results[index] = await predicate(cmd, ctx)
+
+        if concurrency <= 1:
+            ctx._check_cache = cache
+            try:
+                await worker(ctx)
+            finally:
+                ctx._check_cache = None
+        else:
+            workers = []
+            for _ in range(concurrency):
+                # can_run swaps out ctx.command so every worker needs its own context
+                local = copy.copy(ctx)
+                local._check_cache = cache
+                workers.append(asyncio.ensure_future(worker(local)))
+
+            try:
+                await asyncio.gather(*workers)
+            except BaseException:
+                for task in workers:
+                    task.cancel()
+                raise
 
+        ret = [cmd for cmd, valid in zip(commands, results) if valid]
         if sort:
             ret.sort(key=key)
         return ret
 
+    def _get_page_cache_key(self, kind, entity, commands):
+        if not self.page_cache_size:
+            return None
+        ctx = self.context
+        return (kind, entity, tuple(commands), ctx.clean_prefix, self.invoked_with)
+
+    def _restore_pages(self, key):
+        # Returns True if the paginator was filled from the cache.
+        if key is None:
+            return False
+
+        cache = self._command_impl._page_cache
+        try:
+            pages, count = cache[key]
+        except KeyError:
+            return False
+
+        cache.move_to_end(key)
+        paginator = self.paginator
+        paginator.clear()
+        paginator._pages = list(pages)
+        paginator._count = count
+        return True
+
+    def _store_pages(self, key):
+        if key is None:
+            return
+
+        paginator = self.paginator
+        cache = self._command_impl._page_cache
+        cache[key] = (tuple(paginator.pages), paginator._count)
+        while len(cache) > self.page_cache_size:
+            cache.popitem(last=False)
+
     def get_max_size(self, commands):
         """Returns the largest name length of the specified command list.
 
@@ -1012,10 +1105,6 @@ class DefaultHelpCommand(HelpCommand):
         ctx = self.context
         bot = ctx.bot
 
-        if bot.description:
-            # <description> portion
-            self.paginator.add_line(bot.description, empty=True)
-
         no_category = f'\u200b{self.no_category}:'
 
         def get_category(command, *, no_category=no_category):
@@ -1023,6 +1112,14 @@ class DefaultHelpCommand(HelpCommand):
             return cog.qualified_name + ':' if cog is not None else no_category
 
         filtered = await self.filter_commands(bot.commands, sort=True, key=get_category)
+        cache_key = self._get_page_cache_key('bot', bot.description, filtered)
+        if self._restore_pages(cache_key):
+            return await self.send_pages()
+
+        if bot.description:
+            # <description> portion
+            self.paginator.add_line(bot.description, empty=True)
+
         max_size = self.get_max_size(filtered)
         to_iterate = itertools.groupby(filtered, key=get_category)
 
@@ -1036,6 +1133,7 @@ class DefaultHelpCommand(HelpCommand):
             self.paginator.add_line()
             self.paginator.add_line(note)
 
+        self._store_pages(cache_key)
         await self.send_pages()
 
     async def send_command_help(self, command):
@@ -1044,9 +1142,12 @@ class DefaultHelpCommand(HelpCommand):
         await self.send_pages()
 
     async def send_group_help(self, group):
-        self.add_command_formatting(group)
-
         filtered = await self.filter_commands(group.commands, sort=self.sort_commands)
+        cache_key = self._get_page_cache_key('group', group, filtered)
+        if self._restore_pages(cache_key):
+            return await self.send_pages()
+
+        self.add_command_formatting(group)
         self.add_indented_commands(filtered, heading=self.commands_heading)
 
         if filtered:
@@ -1055,13 +1156,18 @@ class DefaultHelpCommand(HelpCommand):
                 self.paginator.add_line()
                 self.paginator.add_line(note)
 
+        self._store_pages(cache_key)
         await self.send_pages()
 
     async def send_cog_help(self, cog):
+        filtered = await self.filter_commands(cog.get_commands(), sort=self.sort_commands)
+        cache_key = self._get_page_cache_key('cog', cog, filtered)
+        if self._restore_pages(cache_key):
+            return await self.send_pages()
+
         if cog.description:
             self.paginator.add_line(cog.description, empty=True)
 
-        filtered = await self.filter_commands(cog.get_commands(), sort=self.sort_commands)
         self.add_indented_commands(filtered, heading=self.commands_heading)
 
         note = self.get_ending_note()
@@ -1069,6 +1175,7 @@ class DefaultHelpCommand(HelpCommand):
             self.paginator.add_line()
             self.paginator.add_line(note)
 
+        self._store_pages(cache_key)
         await self.send_pages()
 
 
@@ -1256,13 +1363,6 @@ class MinimalHelpCommand(HelpCommand):
         ctx = self.context
         bot = ctx.bot
 
-        if bot.description:
-            self.paginator.add_line(bot.description, empty=True)
-
-        note = self.get_opening_note()
-        if note:
-            self.paginator.add_line(note, empty=True)
-
         no_category = f'\u200b{self.no_category}'
 
         def get_category(command, *, no_category=no_category):
@@ -1270,6 +1370,17 @@ class MinimalHelpCommand(HelpCommand):
             return cog.qualified_name if cog is not None else no_category
 
         filtered = await self.filter_commands(bot.commands, sort=True, key=get_category)
+        cache_key = self._get_page_cache_key('bot', bot.description, filtered)
+        if self._restore_pages(cache_key):
+            return await self.send_pages()
+
+        if bot.description:
+            self.paginator.add_line(bot.description, empty=True)
+
+        note = self.get_opening_note()
+        if note:
+            self.paginator.add_line(note, empty=True)
+
         to_iterate = itertools.groupby(filtered, key=get_category)
 
         for category, commands in to_iterate:
@@ -1281,10 +1392,16 @@ class MinimalHelpCommand(HelpCommand):
             self.paginator.add_line()
             self.paginator.add_line(note)
 
+        self._store_pages(cache_key)
         await self.send_pages()
 
     async def send_cog_help(self, cog):
         bot = self.context.bot
+        filtered = await self.filter_commands(cog.get_commands(), sort=self.sort_commands)
+        cache_key = self._get_page_cache_key('cog', (cog, bot.description), filtered)
+        if self._restore_pages(cache_key):
+            return await self.send_pages()
+
         if bot.description:
             self.paginator.add_line(bot.description, empty=True)
 
@@ -1295,7 +1412,6 @@ class MinimalHelpCommand(HelpCommand):
         if cog.description:
             self.paginator.add_line(cog.description, empty=True)
 
-        filtered = await self.filter_commands(cog.get_commands(), sort=self.sort_commands)
         if filtered:
             self.paginator.add_line(f'**{cog.qualified_name} {self.commands_heading}**')
             for command in filtered:
@@ -1306,12 +1422,17 @@ class MinimalHelpCommand(HelpCommand):
                 self.paginator.add_line()
                 self.paginator.add_line(note)
 
+        self._store_pages(cache_key)
         await self.send_pages()
 
     async def send_group_help(self, group):
+        filtered = await self.filter_commands(group.commands, sort=self.sort_commands)
+        cache_key = self._get_page_cache_key('group', group, filtered)
+        if self._restore_pages(cache_key):
+            return await self.send_pages()
+
         self.add_command_formatting(group)
 
-        filtered = await self.filter_commands(group.commands, sort=self.sort_commands)
         if filtered:
             note = self.get_opening_note()
             if note:
@@ -1326,6 +1447,7 @@ class MinimalHelpCommand(HelpCommand):
                 self.paginator.add_line()
                 self.paginator.add_line(note)
 
+        self._store_pages(cache_key)
         await self.send_pages()
 
     async def send_command_help(self, command):
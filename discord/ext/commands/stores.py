@@ -0,0 +1,569 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import namedtuple
+
+from .cooldowns import Cooldown, DynamicCooldownMapping
+
+__all__ = (
+    'CooldownState',
+    'CooldownStore',
+    'MemoryCooldownStore',
+    'SocketCooldownStore',
+    'CooldownStoreServer',
+)
+
+log = logging.getLogger(__name__)
+
+class CooldownState(namedtuple('CooldownState', 'retry_after tokens window')):
+    """The state of a cooldown bucket after it was updated by a :class:`CooldownStore`.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    -----------
+    retry_after: :class:`float`
+        How many seconds are left before the bucket has a token again.
+        ``0.0`` if the update was not rate limited.
+    tokens: :class:`int`
+        The tokens left in the bucket.
+    window: :class:`float`
+        The timestamp the current rate limit window started at.
+    """
+    __slots__ = ()
+
+class CooldownStore:
+    """The interface for storing command cooldowns and concurrency limits
+    outside of the command.
+
+    By default every :class:`.Command` keeps its cooldown buckets and
+    :func:`.max_concurrency` counters in memory, so every process running
+    the bot has its own copy. Passing a store to :class:`.Bot` through the
+    ``cooldown_store`` option makes every command use it instead, which lets
+    several processes enforce the same limits, e.g. with a
+    :class:`SocketCooldownStore`.
+
+    Every operation must be atomic with regards to other operations on the
+    same key. The keys are strings made of the command's qualified name and
+    the ``repr`` of the bucket key, so custom bucket types used with a shared
+    store must return keys with a stable ``repr``.
+
+    Concurrency slots are leased: a slot that is not renewed within
+    :attr:`concurrency_lease` seconds is given back, so a process that dies
+    while running a command does not hold on to its slot forever. Commands
+    renew their slot while they run.
+
+    If the store fails while a command is being prepared, the exception is
+    wrapped in a :exc:`.CooldownStoreError` and handled like any other
+    command error.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    -----------
+    concurrency_lease: :class:`float`
+        How many seconds a concurrency slot is held without being renewed.
+        Defaults to 30 seconds.
+    """
+
+    concurrency_lease = 30.0
+
+    async def update_rate_limit(self, key, rate, per, current):
+        """|coro|
+
+        Takes a token from the bucket, like :meth:`Cooldown.update_rate_limit`.
+
+        Parameters
+        -----------
+        key: :class:`str`
+            The bucket to update.
+        rate: :class:`int`
+            The number of tokens in the bucket.
+        per: :class:`float`
+            The length of the rate limit window in seconds.
+        current: :class:`float`
+            The timestamp of the update.
+
+        Returns
+        --------
+        :class:`CooldownState`
+            The state of the bucket after the update.
+        """
+        raise NotImplementedError
+
+    async def reset(self, key):
+        """|coro|
+
+        Resets the bucket, giving back all of its tokens.
+
+        Parameters
+        -----------
+        key: :class:`str`
+            The bucket to reset.
+        """
+        raise NotImplementedError
+
+    async def acquire(self, key, number, lease):
+        """|coro|
+
+        Tries to acquire a concurrency slot without waiting.
+
+        Parameters
+        -----------
+        key: :class:`str`
+            The concurrency counter to acquire from.
+        number: :class:`int`
+            The number of slots there are in total.
+        lease: :class:`float`
+            How many seconds the slot is held for unless it is renewed.
+
+        Returns
+        --------
+        Optional[:class:`str`]
+            A token identifying the acquired slot, or ``None`` if there
+            was no slot left.
+        """
+        raise NotImplementedError
+
+    async def renew(self, key, token, lease):
+        """|coro|
+
+        Extends the lease of a concurrency slot acquired with :meth:`acquire`.
+
+        Parameters
+        -----------
+        key: :class:`str`
+            The concurrency counter the slot was acquired from.
+        token: :class:`str`
+            The token returned by :meth:`acquire`.
+        lease: :class:`float`
+            How many seconds from now the slot is held for.
+
+        Returns
+        --------
+        :class:`bool`
+            Whether the slot was still held. ``False`` if its lease had
+            already expired.
+        """
+        raise NotImplementedError
+
+    async def release(self, key, token):
+        """|coro|
+
+        Releases a concurrency slot acquired with :meth:`acquire`.
+
+        Parameters
+        -----------
+        key: :class:`str`
+            The concurrency counter to release to.
+        token: :class:`str`
+            The token returned by :meth:`acquire`.
+        """
+        raise NotImplementedError
+
+    async def close(self):
+        """|coro|
+
+        Closes the store. This is called when the bot is closed.
+        """
+        pass
+
+_BucketRequest = namedtuple('_BucketRequest', 'key rate per')
+
+class MemoryCooldownStore(CooldownStore):
+    """A :class:`CooldownStore` that keeps everything in memory.
+
+    This behaves the same as the per-command storage but shares buckets with
+    the same key. It is also what :class:`CooldownStoreServer` uses by default.
+
+    .. versionadded:: 2.0
+    """
+
+    def __init__(self):
+        # the mapping already takes care of expiring buckets that are no longer used
+        self._buckets = DynamicCooldownMapping(self._create_bucket, self._get_key)
+        # key -> {token: lease expiry}
+        self._counters = {}
+
+    def __repr__(self):
+        return f'<MemoryCooldownStore buckets={len(self._buckets._cache)} counters={len(self._counters)}>'
+
+    @staticmethod
+    def _get_key(request):
+        return request.key
+
+    @staticmethod
+    def _create_bucket(request):
+        return Cooldown(request.rate, request.per)
+
+    def _update(self, key, rate, per, current):
+        request = _BucketRequest(key, rate, per)
+        bucket = self._buckets.get_bucket(request, current)
+        if bucket.rate != rate or bucket.per != per:
+            # the cooldown was changed, start over with the new one
+            del self._buckets._cache[key]
+            self._buckets._expiry[bucket.per].pop(key, None)
+            bucket = self._buckets.get_bucket(request, current)
+
+        retry_after = bucket.update_rate_limit(current) or 0.0
+        self._buckets._touch(key, bucket)
+        return CooldownState(retry_after, bucket._tokens, bucket._window)
+
+    def _reset(self, key):
+        bucket = self._buckets._cache.get(key)
+        if bucket is not None:
+            bucket.reset()
+            self._buckets._touch(key, bucket)
+
+    def _acquire(self, key, number, lease):
+        now = time.monotonic()
+        slots = self._counters.get(key)
+        if slots is None:
+            slots = self._counters[key] = {}
+        else:
+            # give back the slots of processes that stopped renewing them
+            for token, expires in tuple(slots.items()):
+                if expires <= now:
+                    del slots[token]
+
+        if len(slots) >= number:
+            return None
+
+        token = uuid.uuid4().hex
+        slots[token] = now + lease
+        return token
+
+    def _renew(self, key, token, lease):
+        slots = self._counters.get(key)
+        if slots is None or token not in slots:
+            return False
+
+        now = time.monotonic()
+        if slots[token] <= now:
+            # expired but not cleaned up yet, it may have been counted as free already
+            del slots[token]
+            if not slots:
+                del self._counters[key]
+            return False
+
+        slots[token] = now + lease
+        return True
+
+    def _release(self, key, token):
+        slots = self._counters.get(key)
+        if slots is not None:
+            slots.pop(token, None)
+            if not slots:
+                del self._counters[key]
+
+    async def update_rate_limit(self, key, rate, per, current):
+        return self._update(key, rate, per, current)
+
+    async def reset(self, key):
+        self._reset(key)
+
+    async def acquire(self, key, number, lease):
+        return self._acquire(key, number, lease)
+
+    async def renew(self, key, token, lease):
+        return self._renew(key, token, lease)
+
+    async def release(self, key, token):
+        self._release(key, token)
+
+class CooldownStoreServer:
+    """Serves a :class:`MemoryCooldownStore` to :class:`SocketCooldownStore` clients.
+
+    The server handles one request at a time, which is what makes the
+    operations atomic across every connected process. It can be run inside
+    one of the bot processes or a separate one.
+
+    .. code-block:: python3
+
+        server = commands.CooldownStoreServer()
+        await server.start(path='/tmp/bot-cooldowns.sock')
+        await server.serve_forever()
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    store: Optional[:class:`MemoryCooldownStore`]
+        The store to serve. A new one is created if not given.
+    """
+
+    def __init__(self, store=None):
+        self.store = store if store is not None else MemoryCooldownStore()
+        self._server = None
+        self._connections = set()
+
+    @property
+    def sockets(self):
+        """List[:class:`socket.socket`]: The sockets the server is listening on."""
+        if self._server is None:
+            return []
+        return list(self._server.sockets)
+
+    async def start(self, path=None, *, host='127.0.0.1', port=0):
+        """|coro|
+
+        Starts listening for connections.
+
+        Parameters
+        -----------
+        path: Optional[:class:`str`]
+            The path of the Unix socket to listen on. If not given then
+            a TCP socket is used instead.
+        host: :class:`str`
+            The host to listen on when using TCP. Defaults to localhost.
+        port: :class:`int`
+            The port to listen on when using TCP. Defaults to a random free port.
+        """
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle, path=path)
+        else:
+            self._server = await asyncio.start_server(self._handle, host=host, port=port)
+
+    async def serve_forever(self):
+        """|coro|
+
+        Serves connections until the server is closed.
+        """
+        await self._server.serve_forever()
+
+    async def close(self):
+        """|coro|
+
+        Stops listening for connections and closes the open ones.
+        """
+        if self._server is not None:
+            self._server.close()
+            for writer in tuple(self._connections):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def _execute(self, op, args):
+        store = self.store
+        if op == 'update':
+            return tuple(store._update(*args))
+        elif op == 'reset':
+            return store._reset(*args)
+        elif op == 'acquire':
+            return store._acquire(*args)
+        elif op == 'renew':
+            return store._renew(*args)
+        elif op == 'release':
+            return store._release(*args)
+        raise ValueError(f'Unknown operation {op!r}')
+
+    async def _handle(self, reader, writer):
+        self._connections.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+
+                nonce, op, args = json.loads(line)
+                try:
+                    response = [nonce, self._execute(op, args), None]
+                except Exception as exc:
+                    response = [nonce, None, f'{exc.__class__.__name__}: {exc}']
+
+                writer.write(json.dumps(response).encode('utf-8') + b'\n')
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+class SocketCooldownStore(CooldownStore):
+    """A :class:`CooldownStore` that talks to a :class:`CooldownStoreServer`
+    over a local socket.
+
+    Every process that should share cooldowns connects to the same server.
+    The connection is made on first use and made again if it is lost.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    path: Optional[:class:`str`]
+        The path of the server's Unix socket.
+    host: :class:`str`
+        The host of the server when using TCP. Defaults to localhost.
+    port: Optional[:class:`int`]
+        The port of the server when using TCP.
+    timeout: Optional[:class:`float`]
+        How many seconds to wait for the server to answer a request,
+        connecting included, before raising :exc:`asyncio.TimeoutError`.
+        ``None`` waits forever. Defaults to 5 seconds.
+    """
+
+    def __init__(self, path=None, *, host='127.0.0.1', port=None, timeout=5.0):
+        if path is None and port is None:
+            raise TypeError('Either path or port must be given')
+
+        self.path = path
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._reader = None
+        self._writer = None
+        self._read_task = None
+        # created on first use so it belongs to the loop the store is used from
+        self._connect_lock = None
+        self._pending = {}
+        self._nonce = 0
+
+    def __repr__(self):
+        where = self.path if self.path is not None else f'{self.host}:{self.port}'
+        return f'<SocketCooldownStore address={where!r} connected={self._writer is not None}>'
+
+    async def _connect(self):
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+
+        async with self._connect_lock:
+            if self._writer is not None:
+                return
+
+            if self.path is not None:
+                reader, writer = await asyncio.open_unix_connection(self.path)
+            else:
+                reader, writer = await asyncio.open_connection(self.host, self.port)
+
+            self._reader = reader
+            self._writer = writer
+            self._read_task = asyncio.create_task(self._read_responses(reader, writer), name='discord.py: cooldown store')
+
+    async def _read_responses(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                nonce, result, error = json.loads(line)
+                future = self._pending.pop(nonce, None)
+                if future is None or future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(RuntimeError(error))
+                else:
+                    future.set_result(result)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            # the store may have reconnected already, that connection isn't ours to drop
+            if self._writer is writer:
+                self._disconnect(ConnectionError('Lost the connection to the cooldown store'))
+            else:
+                writer.close()
+
+    def _disconnect(self, exc):
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(exc)
+
+    async def _send(self, op, args):
+        if self._writer is None:
+            await self._connect()
+
+        self._nonce += 1
+        nonce = self._nonce
+        future = asyncio.get_running_loop().create_future()
+        self._pending[nonce] = future
+        try:
+            self._writer.write(json.dumps([nonce, op, args]).encode('utf-8') + b'\n')
+            return await future
+        finally:
+            # an answer that arrives after the timeout is dropped
+            self._pending.pop(nonce, None)
+
+    async def _request(self, op, *args):
+        return await asyncio.wait_for(self._send(op, args), self.timeout)
+
+    async def update_rate_limit(self, key, rate, per, current):
+        return CooldownState(*await self._request('update', key, rate, per, current))
+
+    async def reset(self, key):
+        await self._request('reset', key)
+
+    async def acquire(self, key, number, lease):
+        return await self._request('acquire', key, number, lease)
+
+    async def renew(self, key, token, lease):
+        return await self._request('renew', key, token, lease)
+
+    async def release(self, key, token):
+        await self._request('release', key, token)
+
+    async def close(self):
+        task, self._read_task = self._read_task, None
+        self._disconnect(ConnectionError('The cooldown store was closed'))
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+class _ConcurrencyLease:
+    # a concurrency slot held in a store, renewed until the command is done
+
+    __slots__ = ('store', 'key', 'token', '_task')
+
+    def __init__(self, store, key, token):
+        self.store = store
+        self.key = key
+        self.token = token
+        self._task = asyncio.create_task(self._renew(), name='discord.py: concurrency lease')
+
+    async def _renew(self):
+        store = self.store
+        lease = store.concurrency_lease
+        while True:
+            await asyncio.sleep(lease / 3)
+            try:
+                renewed = await store.renew(self.key, self.token, lease)
+            except Exception:
+                log.warning('Renewing the concurrency slot %s failed.', self.key, exc_info=True)
+                continue
+
+            if not renewed:
+                log.warning('The lease of the concurrency slot %s expired before it was renewed.', self.key)
+                return
+
+    async def release(self):
+        self._task.cancel()
+        await self.store.release(self.key, self.token)
@@ -24,6 +24,9 @@ DEALINGS IN THE SOFTWARE.
 
 import os.path
 import io
+from collections.abc import AsyncIterable
+
+from .errors import ClientException
 
 __all__ = (
     'File',
@@ -40,10 +43,21 @@ class File:
 
     Attributes
     -----------
-    fp: Union[:class:`str`, :class:`io.BufferedIOBase`]
-        A file-like object opened in binary mode and read mode
-        or a filename representing a file in the hard drive to
-        open.
+    fp: Union[:class:`str`, :class:`os.PathLike`, :class:`io.BufferedIOBase`, AsyncIterable[:class:`bytes`]]
+        A file-like object opened in binary mode and read mode,
+        a filename representing a file in the hard drive to
+        open or an asynchronous iterable of the file's contents.
+
+        Files on the hard drive and file-like objects are uploaded in chunks
+        as they are read, so large files should be passed this way rather
+        than read into memory first.
+
+        An asynchronous iterable is uploaded as its chunks are produced.
+        If the upload has to be retried it is iterated over again, so pass
+        an object whose ``__aiter__`` starts over for the upload to be
+        retryable. Asynchronous iterators, such as asynchronous generators,
+        can only be iterated once and fail to upload instead. They cannot be
+        sent through a :class:`SyncWebhook`.
 
         .. note::
 
@@ -52,6 +66,9 @@ class File:
 
             To pass binary data, consider usage of ``io.BytesIO``.
 
+        .. versionchanged:: 2.0
+            Asynchronous iterables are accepted.
+
     filename: Optional[:class:`str`]
         The filename to display when uploading to Discord.
         If this is not given then it defaults to ``fp.name`` or if ``fp`` is
@@ -65,27 +82,33 @@ class File:
     def __init__(self, fp, filename=None, *, spoiler=False):
         self.fp = fp
 
-        if isinstance(fp, io.IOBase):
-            if not (fp.seekable() and fp.readable()):
-                raise ValueError(f'File buffer {fp!r} must be seekable and readable')
-            self.fp = fp
-            self._original_pos = fp.tell()
+        if isinstance(fp, AsyncIterable):
+            # streamed as it's iterated over, there's nothing to seek or close
+            self._original_pos = None
             self._owner = False
+            self._closer = None
         else:
-            self.fp = open(fp, 'rb')
-            self._original_pos = 0
-            self._owner = True
+            if isinstance(fp, io.IOBase):
+                if not (fp.seekable() and fp.readable()):
+                    raise ValueError(f'File buffer {fp!r} must be seekable and readable')
+                self.fp = fp
+                self._original_pos = fp.tell()
+                self._owner = False
+            else:
+                self.fp = open(fp, 'rb')
+                self._original_pos = 0
+                self._owner = True
 
-        # aiohttp only uses two methods from IOBase
-        # read and close, since I want to control when the files
-        # close, I need to stub it so it doesn't close unless
-        # I tell it to
-        self._closer = self.fp.close
-        self.fp.close = lambda: None
+            # aiohttp only uses two methods from IOBase
+            # read and close, since I want to control when the files
+            # close, I need to stub it so it doesn't close unless
+            # I tell it to
+            self._closer = self.fp.close
+            self.fp.close = lambda: None
 
         if filename is None:
-            if isinstance(fp, str):
-                _, self.filename = os.path.split(fp)
+            if isinstance(fp, (str, os.PathLike)):
+                _, self.filename = os.path.split(os.fspath(fp))
             else:
                 self.filename = getattr(fp, 'name', None)
         else:
@@ -105,10 +128,22 @@ class File:
         # is 0, and thus false, then this prevents an
         # unnecessary seek since it's the first request
         # done.
-        if seek:
-            self.fp.seek(self._original_pos)
+        if not seek:
+            return
+
+        if self._original_pos is None:
+            # an iterator can't start over, only iterables that
+            # make a new iterator each time can be sent again
+            if self.fp.__aiter__() is self.fp:
+                raise ClientException(f'File {self.filename!r} is an asynchronous iterator and cannot be sent again')
+            return
+
+        self.fp.seek(self._original_pos)
 
     def close(self):
+        if self._closer is None:
+            return
+
         self.fp.close = self._closer
         if self._owner:
             self._closer()
@@ -40,6 +40,7 @@ from . import utils
 from .activity import BaseActivity
 from .enums import SpeakingState
 from .errors import ConnectionClosed, InvalidArgument
+from .tracing import _null_tracer
 
 log = logging.getLogger(__name__)
 
@@ -273,6 +274,7 @@ class DiscordWebSocket:
 
         # an empty dispatcher to prevent crashes
         self._dispatch = lambda *args: None
+        self._tracer = _null_tracer
         # generic event listeners
         self._dispatch_listeners = []
         # the keep alive
@@ -309,6 +311,7 @@ class DiscordWebSocket:
         ws._connection = client._connection
         ws._discord_parsers = client._connection.parsers
         ws._dispatch = client.dispatch
+        ws._tracer = client._tracer
         ws.gateway = gateway
         ws.call_hooks = client._connection.call_hooks
         ws._initial_identify = initial
@@ -412,16 +415,20 @@ class DiscordWebSocket:
 
     async def received_message(self, msg):
         self._dispatch('socket_raw_receive', msg)
+        tracer = self._tracer
 
         if type(msg) is bytes:
             self._buffer.extend(msg)
 
             if len(msg) < 4 or msg[-4:] != b'\x00\x00\xff\xff':
                 return
-            msg = self._zlib.decompress(self._buffer)
-            msg = msg.decode('utf-8')
+            with tracer.span('gateway.inflate', size=len(self._buffer)):
+                msg = self._zlib.decompress(self._buffer)
+                msg = msg.decode('utf-8')
             self._buffer = bytearray()
-        msg = json.loads(msg)
+
+        with tracer.span('gateway.decode', size=len(msg)):
+            msg = json.loads(msg)
 
         log.debug('For Shard ID %s: WebSocket Event: %s', self.shard_id, msg)
         self._dispatch('socket_response', msg)
@@ -500,7 +507,8 @@ class DiscordWebSocket:
         except KeyError:
             log.debug('Unknown event %s.', event)
         else:
-            func(data)
+            with tracer.span('gateway.parse', event=event):
+                func(data)
 
         # remove the dispatched listeners
         removed = []
@@ -547,10 +555,9 @@ class DiscordWebSocket:
         """
         try:
             msg = await self.socket.receive(timeout=self._max_heartbeat_timeout)
-            if msg.type is aiohttp.WSMsgType.TEXT:
-                await self.received_message(msg.data)
-            elif msg.type is aiohttp.WSMsgType.BINARY:
-                await self.received_message(msg.data)
+            if msg.type is aiohttp.WSMsgType.TEXT or msg.type is aiohttp.WSMsgType.BINARY:
+                with self._tracer.span('gateway.receive', shard_id=self.shard_id):
+                    await self.received_message(msg.data)
             elif msg.type is aiohttp.WSMsgType.ERROR:
                 log.debug('Received %s', msg)
                 raise msg.data
@@ -22,6 +22,7 @@ FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 DEALINGS IN THE SOFTWARE.
 """
 
+import bisect
 import copy
 from collections import namedtuple
 from typing import List, TYPE_CHECKING
@@ -31,7 +32,7 @@ from .role import Role
 from .member import Member, VoiceState
 from .emoji import Emoji
 from .errors import InvalidData
-from .permissions import PermissionOverwrite
+from .permissions import PermissionOverwrite, Permissions
 from .colour import Colour
 from .errors import InvalidArgument, ClientException
 from .channel import *
@@ -55,8 +56,165 @@ if TYPE_CHECKING:
     )
 
 BanEntry = namedtuple('BanEntry', 'reason user')
+PermissionCacheInfo = namedtuple('PermissionCacheInfo', 'hits misses size')
 _GuildLimit = namedtuple('_GuildLimit', 'emoji bitrate filesize')
 
+class _PermissionCache:
+    # Stores resolved permission values per channel and per member or role.
+    # Every entry remembers the overwrite list and role list it was computed
+    # from. Both are replaced (never mutated) when they change, so an identity
+    # check catches copies of channels and members made for *_update events.
+    # Changes to the guild's roles or owner are handled by the state parsers.
+    __slots__ = ('_channels', 'hits', 'misses')
+
+    def __init__(self):
+        self._channels = {} # Dict[int, Dict[int, Tuple[Optional[SnowflakeList], List[_Overwrites], int]]]
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._channels.values())
+
+    def get(self, channel, target_id, roles):
+        try:
+            cached_roles, overwrites, value = self._channels[channel.id][target_id]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        if cached_roles is not roles or overwrites is not channel._overwrites:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return value
+
+    def put(self, channel, target_id, roles, value):
+        try:
+            entries = self._channels[channel.id]
+        except KeyError:
+            entries = self._channels[channel.id] = {}
+        entries[target_id] = (roles, channel._overwrites, value)
+
+    def invalidate_channel(self, channel_id):
+        self._channels.pop(channel_id, None)
+
+    def invalidate_target(self, target_id):
+        for entries in self._channels.values():
+            entries.pop(target_id, None)
+
+    def clear(self):
+        self._channels.clear()
+
+
+class _MemberNameIndex:
+    # Maps the lowercase name, nick and name#discriminator of every
+    # cached member to the members that have it. Exact lookups are a
+    # dict access, prefix lookups bisect a sorted array of the keys.
+    # The sorted array is only updated lazily when a prefix lookup
+    # happens, since chunking would otherwise pay for a sort per member.
+    __slots__ = ('_keys', '_buckets', '_sorted', '_pending', '_stale')
+
+    def __init__(self):
+        self._keys = {} # Dict[int, Tuple[str, ...]]
+        self._buckets = {} # Dict[str, Dict[int, Member]]
+        self._sorted = [] # List[str]
+        self._pending = [] # List[str]
+        self._stale = 0
+
+    def __len__(self):
+        return len(self._keys)
+
+    @staticmethod
+    def _keys_for(member):
+        name = member.name.lower()
+        keys = (name, f'{name}#{member.discriminator}')
+        nick = member.nick
+        if nick:
+            nick = nick.lower()
+            if nick != name:
+                keys += (nick,)
+        return keys
+
+    def add(self, member):
+        member_id = member.id
+        keys = self._keys_for(member)
+        old = self._keys.get(member_id)
+        if old is not None:
+            # Members are replaced wholesale on re-chunking, so the
+            # buckets need to point to the new object even if the keys match
+            self._discard(member_id, old)
+
+        self._keys[member_id] = keys
+        buckets = self._buckets
+        for key in keys:
+            try:
+                buckets[key][member_id] = member
+            except KeyError:
+                buckets[key] = {member_id: member}
+                self._pending.append(key)
+
+    def remove(self, member_id):
+        keys = self._keys.pop(member_id, None)
+        if keys is not None:
+            self._discard(member_id, keys)
+
+    def _discard(self, member_id, keys):
+        buckets = self._buckets
+        for key in keys:
+            bucket = buckets.get(key)
+            if bucket is None:
+                continue
+            bucket.pop(member_id, None)
+            if not bucket:
+                del buckets[key]
+                self._stale += 1
+
+    def get(self, key):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return ()
+        return bucket.values()
+
+    def _prepare(self):
+        if self._stale > len(self._buckets):
+            # Too many dead keys in the array, just rebuild it from scratch
+            self._sorted = sorted(self._buckets)
+            self._pending = []
+            self._stale = 0
+        elif self._pending:
+            # timsort merges an appended run in linear time
+            self._sorted.extend(self._pending)
+            self._sorted.sort()
+            self._pending = []
+
+    def startswith(self, prefix, limit=None):
+        self._prepare()
+        keys = self._sorted
+        buckets = self._buckets
+        seen = set()
+        result = []
+        index = bisect.bisect_left(keys, prefix)
+        end = len(keys)
+        while index < end:
+            key = keys[index]
+            if not key.startswith(prefix):
+                break
+
+            index += 1
+            bucket = buckets.get(key)
+            if bucket is None:
+                continue
+
+            for member_id, member in bucket.items():
+                if member_id in seen:
+                    continue
+                seen.add(member_id)
+                result.append(member)
+                if limit is not None and len(result) >= limit:
+                    return result
+        return result
+
 
 class Guild(Hashable):
     """Represents a Discord guild.
@@ -174,7 +332,8 @@ class Guild(Hashable):
                  'description', 'max_presences', 'max_members', 'max_video_channel_users',
                  'premium_tier', 'premium_subscription_count', '_system_channel_flags',
                  'preferred_locale', '_discovery_splash', '_rules_channel_id',
-                 '_public_updates_channel_id', 'nsfw')
+                 '_public_updates_channel_id', 'nsfw', '_member_index',
+                 '_permission_cache')
 
     _PREMIUM_GUILD_LIMITS = {
         None: _GuildLimit(emoji=50, bitrate=96e3, filesize=8388608),
@@ -189,6 +348,8 @@ class Guild(Hashable):
         self._members = {}
         self._voice_states = {}
         self._state = state
+        self._member_index = _MemberNameIndex() if state.member_name_index else None
+        self._permission_cache = _PermissionCache() if state.permission_cache else None
         self._from_data(data)
 
     def _add_channel(self, channel):
@@ -202,9 +363,18 @@ class Guild(Hashable):
 
     def _add_member(self, member):
         self._members[member.id] = member
+        if self._member_index is not None:
+            self._member_index.add(member)
 
     def _remove_member(self, member):
         self._members.pop(member.id, None)
+        if self._member_index is not None:
+            self._member_index.remove(member.id)
+
+    def _reindex_member(self, member):
+        # called whenever a name, nick or discriminator might have changed
+        if self._member_index is not None and self._members.get(member.id) is member:
+            self._member_index.add(member)
 
     def __str__(self):
         return self.name or ''
@@ -287,6 +457,10 @@ class Guild(Hashable):
         self._banner = guild.get('banner')
         self.unavailable = guild.get('unavailable', False)
         self.id = int(guild['id'])
+        if self._permission_cache is not None:
+            # the roles and owner are about to be replaced
+            self._permission_cache.clear()
+
         self._roles = {}
         state = self._state # speed up attribute access
         for r in guild.get('roles', []):
@@ -678,6 +852,56 @@ class Guild(Hashable):
         """:class:`datetime.datetime`: Returns the guild's creation time in UTC."""
         return utils.snowflake_time(self.id)
 
+    def permissions_for_channels(self, member, channels=None):
+        """Resolves the permissions of a member in many channels at once.
+
+        This gives the same results as calling :meth:`abc.GuildChannel.permissions_for`
+        on every channel, but the member's role permissions are only computed once.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        -----------
+        member: :class:`Member`
+            The member to resolve permissions for.
+        channels: Optional[Iterable[:class:`abc.GuildChannel`]]
+            The channels to resolve permissions in. Defaults to every
+            channel in :attr:`channels`.
+
+        Returns
+        --------
+        Dict[:class:`int`, :class:`Permissions`]
+            A mapping of channel ID to the resolved permissions in that channel.
+        """
+
+        if channels is None:
+            channels = self._channels.values()
+
+        resolver = abc._PermissionResolver(self)
+        base = resolver.base(member)
+        result = {}
+        for channel in channels:
+            value = resolver.resolve(channel, resolver.channel(channel), member, base, {})
+            result[channel.id] = Permissions(value)
+        return result
+
+    def permission_cache_info(self):
+        """Returns statistics about the permission cache used by
+        :meth:`abc.GuildChannel.permissions_for` in this guild.
+
+        .. versionadded:: 2.0
+
+        Returns
+        --------
+        Optional[:class:`tuple`]
+            A named tuple with ``hits``, ``misses`` and ``size`` fields,
+            or ``None`` if the client was not created with ``permission_cache`` enabled.
+        """
+        cache = self._permission_cache
+        if cache is None:
+            return None
+        return PermissionCacheInfo(hits=cache.hits, misses=cache.misses, size=len(cache))
+
     def get_member_named(self, name):
         """Returns the first member found that matches the name provided.
 
@@ -706,7 +930,14 @@ class Guild(Hashable):
         """
 
         result = None
-        members = self.members
+        index = self._member_index
+        if index is not None:
+            # The index is case insensitive so the candidates still
+            # have to be checked against the exact name below.
+            members = index.get(name.lower())
+        else:
+            members = self.members
+
         if len(name) > 5 and name[-5] == '#':
             # The 5 length is checking to see if #0000 is in the string,
             # as a#0000 has a length of 6, the minimum for a potential
@@ -724,6 +955,47 @@ class Guild(Hashable):
 
         return utils.find(pred, members)
 
+    def search_members(self, prefix, *, limit=None):
+        """Returns the cached members whose name, nickname or name#discriminator
+        starts with the given prefix.
+
+        The comparison is case insensitive. Unlike :meth:`query_members`, this
+        does not make any requests and only looks at the internal member cache.
+
+        If the client was created with ``member_name_index`` enabled then this
+        is done through a per-guild index rather than a scan of :attr:`members`.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        -----------
+        prefix: :class:`str`
+            The prefix to search for.
+        limit: Optional[:class:`int`]
+            The maximum number of members to return. ``None`` means no limit.
+
+        Returns
+        --------
+        List[:class:`Member`]
+            The members that matched the prefix.
+        """
+
+        prefix = prefix.lower()
+        index = self._member_index
+        if index is not None:
+            return index.startswith(prefix, limit)
+
+        result = []
+        for member in self._members.values():
+            if limit is not None and len(result) >= limit:
+                break
+
+            # a name prefix is always a name#discriminator prefix as well
+            nick = member.nick
+            if str(member).lower().startswith(prefix) or (nick is not None and nick.lower().startswith(prefix)):
+                result.append(member)
+        return result
+
     def _create_channel(self, name, overwrites, channel_type, category=None, **options):
         if overwrites is None:
             overwrites = {}
@@ -25,18 +25,31 @@ DEALINGS IN THE SOFTWARE.
 from __future__ import annotations
 
 import asyncio
+import copy
 import json
 import logging
+import mmap
+import os
+import struct
 import sys
+import time
+from collections import OrderedDict, deque
 from typing import Any, Coroutine, List, TYPE_CHECKING, TypeVar
 from urllib.parse import quote as _uriquote
-import weakref
 
 import aiohttp
 
 from .errors import HTTPException, Forbidden, NotFound, LoginFailure, DiscordServerError, GatewayNotFound
 from .gateway import DiscordClientWebSocketResponse
+from .enums import RequestPriority
+from .metrics import RequestWaitStats, RequestRecord
 from . import __version__, utils
+from .tracing import _null_tracer
+
+if sys.platform == 'win32':
+    import msvcrt
+else:
+    import fcntl
 
 log = logging.getLogger(__name__)
 
@@ -84,21 +97,450 @@ class Route:
         # the bucket is just method + path w/ major parameters
         return f'{self.channel_id}:{self.guild_id}:{self.path}'
 
+    @property
+    def key(self):
+        # the route template, which Discord maps to a bucket hash
+        return f'{self.method} {self.path}'
+
+    @property
+    def major_parameters(self):
+        return f'{self.channel_id}:{self.guild_id}:{self.webhook_id}:{self.webhook_token}'
+
+
+class _RateLimit:
+    # the state of one rate limit bucket for one set of major parameters
+    #
+    # Works like a semaphore that admits as many concurrent requests as the
+    # bucket has remaining. The remaining count is a local reservation count
+    # that is re-synced from the headers of every response.
+
+    __slots__ = ('key', 'limit', 'remaining', 'reset_at', 'synced', 'limited', 'inflight', 'pending', 'forward', '_waiters')
+
+    def __init__(self, key):
+        self.key = key
+        # until the first response only one request is let through to learn the limit
+        self.limit = 1
+        self.remaining = 1
+        self.reset_at = 0.0
+        # whether remaining comes from the headers of the current window
+        self.synced = False
+        # whether the responses have rate limit headers, None until one arrives
+        self.limited = None
+        self.inflight = 0
+        # requests that have looked this bucket up and not finished yet
+        self.pending = 0
+        # the bucket this one turned out to be once its hash was learned
+        self.forward = None
+        self._waiters = deque()
+
+    def is_idle(self, now):
+        return self.pending == 0 and self.reset_at <= now
+
+    def _wake(self):
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+
+    async def acquire(self, loop):
+        # returns False if the bucket was merged into another one while waiting
+        while True:
+            if self.forward is not None:
+                return False
+
+            if self.limited is False:
+                self.inflight += 1
+                return True
+
+            now = loop.time()
+            if self.synced and self.reset_at <= now:
+                # the window has passed, assume the bucket is full again
+                self.remaining = self.limit
+                self.synced = False
+
+            if self.remaining > 0:
+                self.remaining -= 1
+                self.inflight += 1
+                return True
+
+            if self.synced:
+                delay = self.reset_at - now
+                log.debug('A rate limit bucket has been exhausted (bucket: %s, retry: %s).', self.key, delay)
+                await asyncio.sleep(delay)
+            else:
+                # wait for an in-flight request to tell us what is left
+                future = loop.create_future()
+                self._waiters.append(future)
+                await future
+
+    def release(self):
+        self.inflight -= 1
+        if not self.synced and self.inflight == 0 and self.remaining <= 0:
+            # nothing came back to sync from, e.g. the route isn't rate limited
+            # or the request failed, so let the next request find out
+            self.remaining = 1
+        self._wake()
+
+    def update(self, response, now, *, use_clock=False):
+        headers = response.headers
+        remaining = headers.get('X-Ratelimit-Remaining')
+        if remaining is None:
+            if response.status < 400:
+                # this route isn't rate limited, stop holding its requests back
+                self.limited = False
+                self._wake()
+            return
+
+        self.limited = True
+        remaining = int(remaining)
+        self.limit = int(headers.get('X-Ratelimit-Limit', self.limit))
+        if self.synced:
+            # other responses from this window might have arrived first
+            self.remaining = min(self.remaining, remaining)
+        else:
+            # the other requests in flight may not have been counted yet
+            self.remaining = max(remaining - (self.inflight - 1), 0)
+            self.synced = True
+
+        self.reset_at = now + utils._parse_ratelimit_header(response, use_clock=use_clock)
+        self._wake()
+
+    def exhaust(self, now, retry_after):
+        self.limited = True
+        self.remaining = 0
+        self.reset_at = now + retry_after
+        self.synced = True
+
+
+class _RateLimiter:
+    # maps routes to their rate limit buckets
+    #
+    # Discord tells us which bucket a route belongs to through the X-RateLimit-Bucket
+    # header, routes sharing a hash share a bucket per set of major parameters.
+    # Until a route's hash is known its template is used in its place.
+
+    __slots__ = ('loop', 'hashes', 'buckets')
+
+    # how many buckets are looked at for eviction per lookup
+    SWEEP_STEP = 2
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.hashes = {}
+        # ordered so that lookups can sweep idle buckets in amortized constant time
+        self.buckets = OrderedDict()
+
+    def __len__(self):
+        return len(self.buckets)
+
+    def _sweep(self, now):
+        buckets = self.buckets
+        for _ in range(self.SWEEP_STEP):
+            if not buckets:
+                return
+            key = next(iter(buckets))
+            if buckets[key].is_idle(now):
+                del buckets[key]
+            else:
+                buckets.move_to_end(key)
+
+    def get_key(self, route):
+        route_key = route.key
+        return f'{self.hashes.get(route_key, route_key)}:{route.major_parameters}'
+
+    def limit(self, route):
+        # how many requests the route's bucket allows per window, None if
+        # no response has said yet or the route isn't rate limited
+        ratelimit = self.buckets.get(self.get_key(route))
+        if ratelimit is None:
+            return None
+        ratelimit = self.resolve(ratelimit)
+        return ratelimit.limit if ratelimit.limited else None
+
+    def get(self, route):
+        now = self.loop.time()
+        self._sweep(now)
+
+        key = self.get_key(route)
+        try:
+            ratelimit = self.buckets[key]
+        except KeyError:
+            self.buckets[key] = ratelimit = _RateLimit(key)
+
+        ratelimit.pending += 1
+        return ratelimit
+
+    @staticmethod
+    def resolve(ratelimit):
+        while ratelimit.forward is not None:
+            ratelimit = ratelimit.forward
+        return ratelimit
 
-class MaybeUnlock:
-    def __init__(self, lock):
-        self.lock = lock
-        self._unlock = True
+    def done(self, ratelimit):
+        self.resolve(ratelimit).pending -= 1
 
-    def __enter__(self):
-        return self
+    def learn(self, route, ratelimit, bucket_hash):
+        # returns the bucket that the route's requests should use from now on
+        if bucket_hash is None or self.hashes.get(route.key) == bucket_hash:
+            return ratelimit
 
-    def defer(self):
-        self._unlock = False
+        self.hashes[route.key] = bucket_hash
+        key = f'{bucket_hash}:{route.major_parameters}'
+        buckets = self.buckets
+        if buckets.get(ratelimit.key) is ratelimit:
+            del buckets[ratelimit.key]
 
-    def __exit__(self, type, value, traceback):
-        if self._unlock:
-            self.lock.release()
+        try:
+            existing = buckets[key]
+        except KeyError:
+            # carry the state over to the bucket's real key
+            ratelimit.key = key
+            buckets[key] = ratelimit
+            return ratelimit
+
+        if existing is ratelimit:
+            return ratelimit
+
+        # another route already shares this bucket, so the requests waiting
+        # on this one have to move over to it
+        ratelimit.forward = existing
+        existing.pending += ratelimit.pending
+        ratelimit.pending = 0
+        ratelimit._wake()
+        return existing
+
+
+class _RequestWindow:
+    # the global request budget of this process
+    #
+    # A ring of the times of the last `rate` requests, a request is allowed
+    # once the oldest of them is `per` seconds old so no window of `per`
+    # seconds ever has more than `rate` requests in it.
+
+    __slots__ = ('rate', 'per', '_times', '_head')
+
+    def __init__(self, rate, per=1.0):
+        self.rate = rate
+        self.per = per
+        self._times = [float('-inf')] * rate
+        self._head = 0
+
+    def try_acquire(self, reserved=0):
+        # records a request and returns 0 if one is allowed now while leaving
+        # `reserved` more, otherwise returns how long until one will be
+        # without recording anything
+        now = time.monotonic()
+        head = self._head
+        delay = self._times[(head + reserved) % self.rate] + self.per - now
+        if delay > 0:
+            return delay
+
+        self._times[head] = now
+        self._head = (head + 1) % self.rate
+        return 0.0
+
+    def close(self):
+        pass
+
+
+class _SharedRequestWindow:
+    # a global request budget shared between the processes of this host
+    #
+    # The same ring as _RequestWindow but kept in a memory mapped file that
+    # is updated under an exclusive lock on that file. time.monotonic is
+    # system wide so the processes agree on the time.
+
+    __slots__ = ('path', 'rate', 'per', '_file', '_map', '_struct')
+
+    # identifies the layout below
+    MAGIC = b'dpyrate1'
+    HEADER = struct.Struct('8sqd')
+
+    def __init__(self, path, rate, per=1.0):
+        self.path = path
+        self.rate = rate
+        self.per = per
+        # a header with the rate and period, the head of the ring and the ring itself
+        self._struct = struct.Struct(f'{self.HEADER.format}q{rate}d')
+        self._file = None
+        self._map = None
+        self._open()
+
+    def _open(self):
+        self._file = file = open(self.path, 'a+b')
+        size = self._struct.size
+        try:
+            self._lock()
+            try:
+                file.seek(0, os.SEEK_END)
+                if file.tell() == 0:
+                    file.write(self._struct.pack(self.MAGIC, self.rate, self.per, 0, *([float('-inf')] * self.rate)))
+                    file.flush()
+                else:
+                    # other processes may have the file mapped at its size, so
+                    # resizing it would pull the memory out from under them
+                    file.seek(0)
+                    header = file.read(self.HEADER.size)
+                    expected = (self.MAGIC, self.rate, self.per)
+                    if len(header) != self.HEADER.size or self.HEADER.unpack(header) != expected or file.seek(0, os.SEEK_END) != size:
+                        raise ValueError(
+                            f'global_rate_limit_file {self.path!r} is in use with a different global_rate_limit, '
+                            f'every process sharing it must use the same one (delete the file once none of them is running)'
+                        )
+            finally:
+                self._unlock()
+
+            self._map = mmap.mmap(file.fileno(), size)
+        except BaseException:
+            file.close()
+            self._file = None
+            raise
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    if sys.platform == 'win32':
+
+        def _lock(self):
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+
+        def _unlock(self):
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    else:
+
+        def _lock(self):
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+
+        def _unlock(self):
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def try_acquire(self, reserved=0):
+        if self._map is None:
+            # the client was closed and is being used again
+            self._open()
+
+        self._lock()
+        try:
+            now = time.monotonic()
+            buffer = self._map
+            start = self.HEADER.size
+            (head,) = struct.unpack_from('q', buffer, start)
+            (oldest,) = struct.unpack_from('d', buffer, start + 8 + (head + reserved) % self.rate * 8)
+            delay = oldest + self.per - now
+            if delay > 0:
+                return delay
+
+            offset = start + 8 + head * 8
+
+            struct.pack_into('d', buffer, offset, now)
+            struct.pack_into('q', buffer, start, (head + 1) % self.rate)
+            return 0.0
+        finally:
+            self._unlock()
+
+
+class _GlobalRateLimit:
+    # paces every request to stay within the global rate limit,
+    # waiting requests are let through by priority and then in the
+    # order they started waiting
+
+    __slots__ = ('loop', 'budget', '_queues', '_reserved', '_drainer', '_wakeup')
+
+    def __init__(self, loop, budget):
+        self.loop = loop
+        self.budget = budget
+        # one queue per RequestPriority value, most urgent first
+        self._queues = tuple(deque() for _ in RequestPriority)
+        # background requests leave some of the budget free so that the
+        # more urgent ones don't have to wait for a whole window
+        self._reserved = tuple(max(budget.rate // 10, 1) if p is RequestPriority.background else 0 for p in RequestPriority)
+        self._drainer = None
+        self._wakeup = None
+
+    async def acquire(self, priority):
+        index = priority.value
+        if not any(self._queues[: index + 1]) and self.budget.try_acquire(self._reserved[index]) == 0:
+            return
+
+        future = self.loop.create_future()
+        self._queues[index].append(future)
+        if self._drainer is None:
+            self._drainer = self.loop.create_task(self._drain())
+        elif self._wakeup is not None and not self._wakeup.done():
+            # this request might be more urgent than the one being waited for
+            self._wakeup.set_result(None)
+
+        await future
+
+    def _next_queue(self):
+        for queue in self._queues:
+            while queue and queue[0].done():
+                # cancelled while waiting
+                queue.popleft()
+            if queue:
+                return queue
+        return None
+
+    def _next_reserved(self):
+        for queue, reserved in zip(self._queues, self._reserved):
+            if queue:
+                return reserved
+        return 0
+
+    async def _drain(self):
+        try:
+            while True:
+                if self._next_queue() is None:
+                    return
+
+                delay = self.budget.try_acquire(self._next_reserved())
+                if delay > 0:
+                    self._wakeup = wakeup = self.loop.create_future()
+                    try:
+                        await asyncio.wait((wakeup,), timeout=delay)
+                    finally:
+                        self._wakeup = None
+                    continue
+
+                self._next_queue().popleft().set_result(None)
+        finally:
+            self._drainer = None
+
+    def close(self):
+        if self._drainer is not None:
+            self._drainer.cancel()
+        self.budget.close()
+
+
+# the GET routes that are shared while in flight, the ones event handlers
+# tend to fetch all at once
+_COALESCED_ROUTES = frozenset({
+    '/channels/{channel_id}',
+    '/channels/{channel_id}/messages/{message_id}',
+    '/guilds/{guild_id}/members/{member_id}',
+    '/users/{user_id}',
+})
+
+
+class _InFlightRequest:
+    # a GET request shared by everyone that asked for it while it was in flight
+
+    __slots__ = ('task', 'priority', 'major', 'callers')
+
+    def __init__(self, task, priority, major):
+        self.task = task
+        self.priority = priority
+        # the channel or guild whose writes make the response outdated
+        self.major = major
+        self.callers = 0
 
 
 # For some reason, the Discord voice websocket expects this header to be
@@ -112,18 +554,50 @@ class HTTPClient:
     SUCCESS_LOG = '{method} {url} has received {text}'
     REQUEST_LOG = '{method} {url} with {json} has returned {status}'
 
-    def __init__(self, connector=None, *, proxy=None, proxy_auth=None, loop=None, unsync_clock=True):
+    def __init__(
+        self,
+        connector=None,
+        *,
+        proxy=None,
+        proxy_auth=None,
+        loop=None,
+        unsync_clock=True,
+        global_rate_limit=50,
+        global_rate_limit_file=None,
+        coalesce_requests=True,
+        response_cache=None,
+        metrics=None,
+        asset_cache=None,
+    ):
         self.loop = asyncio.get_event_loop() if loop is None else loop
         self.connector = connector
         self.__session = None  # filled in static_login
-        self._locks = weakref.WeakValueDictionary()
+        self._ratelimiter = _RateLimiter(self.loop)
         self._global_over = asyncio.Event()
         self._global_over.set()
+        self._global_ratelimit = None
+        self.wait_stats = {priority: RequestWaitStats(priority) for priority in RequestPriority}
+        if global_rate_limit is not None:
+            if global_rate_limit <= 0:
+                raise ValueError('global_rate_limit must be greater than 0')
+
+            if global_rate_limit_file is None:
+                budget = _RequestWindow(global_rate_limit)
+            else:
+                budget = _SharedRequestWindow(global_rate_limit_file, global_rate_limit)
+            self._global_ratelimit = _GlobalRateLimit(self.loop, budget)
         self.token = None
         self.bot_token = False
         self.proxy = proxy
         self.proxy_auth = proxy_auth
         self.use_clock = not unsync_clock
+        self._tracer = _null_tracer
+        self.coalesce_requests = coalesce_requests
+        self.response_cache = response_cache
+        self.metrics = metrics
+        self.asset_cache = asset_cache
+        self.coalesced_requests = 0
+        self._in_flight = {}
 
         user_agent = 'DiscordBot (https://github.com/Rapptz/discord.py {0}) Python/{1[0]}.{1[1]} aiohttp/{2}'
         self.user_agent = user_agent.format(__version__, sys.version_info, aiohttp.__version__)
@@ -149,16 +623,129 @@ class HTTPClient:
 
         return await self.__session.ws_connect(url, **kwargs)
 
-    async def request(self, route, *, files=None, form=None, **kwargs) -> Any:
-        bucket = route.bucket
-        method = route.method
+    async def request(self, route, *, files=None, form=None, priority=None, **kwargs) -> Any:
+        if priority is None:
+            priority = utils._request_priority.get() or RequestPriority.default
+
+        with self._tracer.span(
+            'http.request', method=route.method, path=route.path, bucket=route.bucket, priority=priority.name
+        ) as span:
+            if route.method == 'GET' and not files and not form:
+                return await self._get(route, span, priority, kwargs)
+
+            try:
+                return await self._request(route, files=files, form=form, priority=priority, **kwargs)
+            finally:
+                if self._in_flight:
+                    self._forget_in_flight(route)
+
+    async def _get(self, route, span, priority, kwargs):
+        cache = self.response_cache
+        cache_ttl = None
+        if cache is not None and not kwargs:
+            cache_ttl = cache._get_ttl(route.path)
+            if cache_ttl is not None:
+                try:
+                    data = cache._get(route.url)
+                except KeyError:
+                    pass
+                else:
+                    span.set_attribute('cached', True)
+                    return data
+
+        if self.coalesce_requests:
+            key = self._get_coalesce_key(route, kwargs)
+            if key is not None:
+                return await self._coalesce(key, span, route, priority, kwargs, cache_ttl)
+
+        return await self._fetch(route, priority, kwargs, cache_ttl)
+
+    async def _fetch(self, route, priority, kwargs, cache_ttl):
+        if cache_ttl is None:
+            return await self._request(route, priority=priority, **kwargs)
+
+        cache = self.response_cache
         url = route.url
+        cache._begin(url)
+        try:
+            data = await self._request(route, priority=priority, **kwargs)
+        except BaseException:
+            cache._end(url)
+            raise
 
-        lock = self._locks.get(bucket)
-        if lock is None:
-            lock = asyncio.Lock()
-            if bucket is not None:
-                self._locks[bucket] = lock
+        cache._finish(url, cache_ttl, data)
+        return data
+
+    @staticmethod
+    def _get_coalesce_key(route, kwargs):
+        # only plain fetches of a single object are shared, anything with
+        # extra options such as an audit log reason is sent as is
+        if kwargs or route.path not in _COALESCED_ROUTES:
+            return None
+        return route.url
+
+    def _forget_in_flight(self, route):
+        # a request sent before a write may answer with what was there before
+        # it, so whoever fetches after the write gets a request of their own
+        major = route.channel_id or route.guild_id
+        for key, in_flight in tuple(self._in_flight.items()):
+            if in_flight.major == major:
+                del self._in_flight[key]
+
+    async def _coalesce(self, key, span, route, priority, kwargs, cache_ttl):
+        in_flight = self._in_flight.get(key)
+        # a request waiting behind lower priority ones would hold this one back
+        if in_flight is None or int(in_flight.priority) > int(priority):
+            task = self.loop.create_task(self._fetch(route, priority, kwargs, cache_ttl))
+            major = route.channel_id or route.guild_id
+            self._in_flight[key] = in_flight = _InFlightRequest(task, priority, major)
+
+            def done(task):
+                if self._in_flight.get(key) is in_flight:
+                    del self._in_flight[key]
+                # every caller might have been cancelled before it finished
+                if not task.cancelled():
+                    task.exception()
+
+            task.add_done_callback(done)
+        else:
+            self.coalesced_requests += 1
+            span.set_attribute('coalesced', True)
+
+        in_flight.callers += 1
+        try:
+            # shielded so one caller being cancelled doesn't cancel the others
+            data = await asyncio.shield(in_flight.task)
+        finally:
+            in_flight.callers -= 1
+
+        # the callers are free to modify what they get, so the
+        # original is only given to the last one to pick it up
+        if in_flight.callers:
+            return copy.deepcopy(data)
+        return data
+
+    async def _request(self, route, *, files=None, form=None, priority, **kwargs) -> Any:
+        ratelimiter = self._ratelimiter
+        ratelimit = ratelimiter.get(route)
+        record = RequestRecord(route.method, route.path, priority)
+        started = self.loop.time()
+        try:
+            return await self._send(route, ratelimit, record, files=files, form=form, priority=priority, **kwargs)
+        except BaseException as exc:
+            record.error = exc.__class__.__name__
+            raise
+        finally:
+            ratelimiter.done(ratelimit)
+            metrics = self.metrics
+            if metrics is not None:
+                record.latency = self.loop.time() - started
+                record.bucket = ratelimiter.hashes.get(route.key)
+                metrics._record(record)
+
+    async def _send(self, route, ratelimit, record, *, files=None, form=None, priority, **kwargs) -> Any:
+        method = route.method
+        url = route.url
 
         # header creation
         headers = {
@@ -188,106 +775,150 @@ class HTTPClient:
         if self.proxy_auth is not None:
             kwargs['proxy_auth'] = self.proxy_auth
 
+        wait_stats = self.wait_stats[priority]
+        started = self.loop.time()
         if not self._global_over.is_set():
             # wait until the global lock is complete
             await self._global_over.wait()
+            record.global_wait += self.loop.time() - started
+
+        for tries in range(5):
+            if files:
+                for f in files:
+                    f.reset(seek=tries)
+
+            if form:
+                form_data = aiohttp.FormData()
+                for params in form:
+                    form_data.add_field(**params)
+                kwargs['data'] = form_data
+
+            # how long to sleep before retrying, once the bucket has been released
+            retry_after = None
+            is_global = False
+
+            waiting = self.loop.time()
+            while not await ratelimit.acquire(self.loop):
+                ratelimit = self._ratelimiter.resolve(ratelimit)
+
+            acquired = ratelimit
+            try:
+                now = self.loop.time()
+                record.bucket_wait += now - waiting
+                if self._global_ratelimit is not None:
+                    # pace the requests before they reach the global rate limit
+                    await self._global_ratelimit.acquire(priority)
+                    waiting, now = now, self.loop.time()
+                    record.global_wait += now - waiting
+
+                wait_stats._record(now - started)
+                record.attempts += 1
+
+                async with self.__session.request(method, url, **kwargs) as r:
+                    log.debug('%s %s with %s has returned %s', method, url, kwargs.get('data'), r.status)
+                    record.status = r.status
+
+                    # even errors have text involved in them so this is safe to call
+                    data = await json_or_text(r)
+
+                    # keep track of the bucket from the rate limit headers
+                    ratelimit = self._ratelimiter.learn(route, ratelimit, r.headers.get('X-Ratelimit-Bucket'))
+                    if r.status != 429:
+                        ratelimit.update(r, self.loop.time(), use_clock=self.use_clock)
+
+                    # the request was successful so just return the text/json
+                    if 300 > r.status >= 200:
+                        log.debug('%s %s has received %s', method, url, data)
+                        return data
+
+                    # we are being rate limited
+                    if r.status == 429:
+                        if not r.headers.get('Via'):
+                            # Banned by Cloudflare more than likely.
+                            raise HTTPException(r, data)
 
-        await lock.acquire()
-        with MaybeUnlock(lock) as maybe_lock:
-            for tries in range(5):
-                if files:
-                    for f in files:
-                        f.reset(seek=tries)
+                        fmt = 'We are being rate limited. Retrying in %.2f seconds. Handled under the bucket "%s"'
 
-                if form:
-                    form_data = aiohttp.FormData()
-                    for params in form:
-                        form_data.add_field(**params)
-                    kwargs['data'] = form_data
+                        retry_after = data['retry_after']  # type: ignore
+                        log.warning(fmt, retry_after, ratelimit.key)
+                        record.rate_limited += 1
+                        record.retry_after += retry_after
 
-                try:
-                    async with self.__session.request(method, url, **kwargs) as r:
-                        log.debug('%s %s with %s has returned %s', method, url, kwargs.get('data'), r.status)
-
-                        # even errors have text involved in them so this is safe to call
-                        data = await json_or_text(r)
-
-                        # check if we have rate limit header information
-                        remaining = r.headers.get('X-Ratelimit-Remaining')
-                        if remaining == '0' and r.status != 429:
-                            # we've depleted our current bucket
-                            delta = utils._parse_ratelimit_header(r, use_clock=self.use_clock)
-                            log.debug('A rate limit bucket has been exhausted (bucket: %s, retry: %s).', bucket, delta)
-                            maybe_lock.defer()
-                            self.loop.call_later(delta, lock.release)
-
-                        # the request was successful so just return the text/json
-                        if 300 > r.status >= 200:
-                            log.debug('%s %s has received %s', method, url, data)
-                            return data
-
-                        # we are being rate limited
-                        if r.status == 429:
-                            if not r.headers.get('Via'):
-                                # Banned by Cloudflare more than likely.
-                                raise HTTPException(r, data)
-
-                            fmt = 'We are being rate limited. Retrying in %.2f seconds. Handled under the bucket "%s"'
-
-                            # sleep a bit
-                            retry_after: float = data['retry_after']  # type: ignore
-                            log.warning(fmt, retry_after, bucket)
-
-                            # check if it's a global rate limit
-                            is_global = data.get('global', False)
-                            if is_global:
-                                log.warning('Global rate limit has been hit. Retrying in %.2f seconds.', retry_after)
-                                self._global_over.clear()
-
-                            await asyncio.sleep(retry_after)
-                            log.debug('Done sleeping for the rate limit. Retrying...')
-
-                            # release the global lock now that the
-                            # global rate limit has passed
-                            if is_global:
-                                self._global_over.set()
-                                log.debug('Global rate limit is now over.')
-
-                            continue
-
-                        # we've received a 500 or 502, unconditional retry
-                        if r.status in {500, 502}:
-                            await asyncio.sleep(1 + tries * 2)
-                            continue
-
-                        # the usual error cases
-                        if r.status == 403:
-                            raise Forbidden(r, data)
-                        elif r.status == 404:
-                            raise NotFound(r, data)
-                        elif r.status == 503:
-                            raise DiscordServerError(r, data)
+                        # check if it's a global rate limit
+                        is_global = data.get('global', False)
+                        if is_global:
+                            log.warning('Global rate limit has been hit. Retrying in %.2f seconds.', retry_after)
+                            self._global_over.clear()
                         else:
-                            raise HTTPException(r, data)
-
-                # This is handling exceptions from the request
-                except OSError as e:
-                    # Connection reset by peer
-                    if tries < 4 and e.errno in (54, 10054):
-                        await asyncio.sleep(1 + tries * 2)
-                        continue
+                            # the next attempt waits for the bucket to reset
+                            ratelimit.exhaust(self.loop.time(), retry_after)
+                            retry_after = None
+
+                    # we've received a 500 or 502, unconditional retry
+                    elif r.status in {500, 502}:
+                        retry_after = 1 + tries * 2
+                        record.server_errors += 1
+
+                    # the usual error cases
+                    elif r.status == 403:
+                        raise Forbidden(r, data)
+                    elif r.status == 404:
+                        raise NotFound(r, data)
+                    elif r.status == 503:
+                        raise DiscordServerError(r, data)
+                    else:
+                        raise HTTPException(r, data)
+
+            # This is handling exceptions from the request
+            except OSError as e:
+                # Connection reset by peer
+                if tries < 4 and e.errno in (54, 10054):
+                    retry_after = 1 + tries * 2
+                    record.connection_resets += 1
+                else:
                     raise
+            finally:
+                acquired.release()
+
+            if retry_after is not None:
+                # sleep a bit
+                await asyncio.sleep(retry_after)
+
+            if is_global:
+                log.debug('Done sleeping for the rate limit. Retrying...')
 
-            # We've run out of retries, raise.
-            if r.status >= 500:
-                raise DiscordServerError(r, data)
+                # release the global lock now that the
+                # global rate limit has passed
+                self._global_over.set()
+                log.debug('Global rate limit is now over.')
 
-            raise HTTPException(r, data)
+            started = self.loop.time()
+
+        # We've run out of retries, raise.
+        if r.status >= 500:
+            raise DiscordServerError(r, data)
+
+        raise HTTPException(r, data)
 
     async def get_from_cdn(self, url):
+        cache = self.asset_cache
+        if cache is not None:
+            path = cache._lookup(url)
+            if path is not None:
+                try:
+                    return await self.loop.run_in_executor(None, cache._read, path)
+                except OSError:
+                    cache._missing(path)
+
         async with self.__session.get(url) as resp:
             if resp.status == 200:
-                return await resp.read()
+                data = await resp.read()
+                if cache is not None and len(data) <= cache.max_size:
+                    writer = cache._begin(url)
+                    await self.loop.run_in_executor(None, writer.write, data)
+                    if await self.loop.run_in_executor(None, writer.finish):
+                        cache._add(writer)
+                return data
             elif resp.status == 404:
                 raise NotFound(resp, 'asset not found')
             elif resp.status == 403:
@@ -295,9 +926,57 @@ class HTTPClient:
             else:
                 raise HTTPException(resp, 'failed to get asset')
 
+    async def stream_from_cdn(self, url, chunk_size=65536):
+        loop = self.loop
+        cache = self.asset_cache
+        if cache is not None:
+            path = cache._lookup(url)
+            if path is not None:
+                try:
+                    fp = await loop.run_in_executor(None, cache._open, path)
+                except OSError:
+                    cache._missing(path)
+                else:
+                    try:
+                        while True:
+                            chunk = await loop.run_in_executor(None, fp.read, chunk_size)
+                            if not chunk:
+                                return
+                            yield chunk
+                    finally:
+                        fp.close()
+
+        async with self.__session.get(url) as resp:
+            if resp.status == 404:
+                raise NotFound(resp, 'asset not found')
+            elif resp.status == 403:
+                raise Forbidden(resp, 'cannot retrieve asset')
+            elif resp.status != 200:
+                raise HTTPException(resp, 'failed to get asset')
+
+            if cache is None or (resp.content_length or 0) > cache.max_size:
+                async for chunk in resp.content.iter_chunked(chunk_size):
+                    yield chunk
+                return
+
+            # the asset is written to the cache as it's read
+            writer = cache._begin(url)
+            try:
+                async for chunk in resp.content.iter_chunked(chunk_size):
+                    await loop.run_in_executor(None, writer.write, chunk)
+                    yield chunk
+            except BaseException:
+                writer.abort()
+                raise
+
+            if await loop.run_in_executor(None, writer.finish):
+                cache._add(writer)
+
     # state management
 
     async def close(self):
+        if self._global_ratelimit is not None:
+            self._global_ratelimit.close()
         if self.__session:
             await self.__session.close()
 
@@ -255,7 +255,10 @@ class Member(discord.abc.Messageable, _BaseUser):
         self.joined_at = utils.parse_time(data.get('joined_at'))
         self.premium_since = utils.parse_time(data.get('premium_since'))
         self._update_roles(data)
-        self.nick = data.get('nick', None)
+        nick = data.get('nick', None)
+        if nick != self.nick:
+            self.nick = nick
+            self.guild._reindex_member(self)
         self.pending = data.get('pending', False)
 
     @classmethod
@@ -299,9 +302,13 @@ class Member(discord.abc.Messageable, _BaseUser):
         # the nickname change is optional,
         # if it isn't in the payload then it didn't change
         try:
-            self.nick = data['nick']
+            nick = data['nick']
         except KeyError:
             pass
+        else:
+            if nick != self.nick:
+                self.nick = nick
+                self.guild._reindex_member(self)
 
         try:
             self.pending = data['pending']
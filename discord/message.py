@@ -50,6 +50,14 @@ __all__ = (
     'DeletedReferencedMessage',
 )
 
+def _reaction_key(emoji):
+    # Custom emoji compare by ID and unicode emoji by name, this mirrors
+    # the equality rules of Emoji and PartialEmoji but can be hashed
+    # regardless of which of the two (or str) the reaction holds.
+    if isinstance(emoji, str):
+        return emoji
+    return emoji.id or emoji.name
+
 def convert_emoji_reaction(emoji):
     if isinstance(emoji, Reaction):
         emoji = emoji.emoji
@@ -142,6 +150,10 @@ class Attachment(Hashable):
 
         Saves this attachment into a file-like object.
 
+        .. versionchanged:: 2.0
+            The attachment is written as it's downloaded rather than loaded into memory first.
+            A file given by name is only replaced once the download is complete.
+
         Parameters
         -----------
         fp: Union[:class:`io.BufferedIOBase`, :class:`os.PathLike`]
@@ -171,15 +183,7 @@ class Attachment(Hashable):
         :class:`int`
             The number of bytes written.
         """
-        data = await self.read(use_cached=use_cached)
-        if isinstance(fp, io.BufferedIOBase):
-            written = fp.write(data)
-            if seek_begin:
-                fp.seek(0)
-            return written
-        else:
-            with open(fp, 'wb') as f:
-                return f.write(data)
+        return await utils._save_stream(self.stream(use_cached=use_cached), fp, seek_begin)
 
     async def read(self, *, use_cached=False):
         """|coro|
@@ -216,6 +220,40 @@ class Attachment(Hashable):
         data = await self._http.get_from_cdn(url)
         return data
 
+    def stream(self, *, use_cached=False, chunk_size=65536):
+        """Returns an :term:`asynchronous iterator` over the content of this attachment.
+
+        Unlike :meth:`read`, the content is not loaded into memory all at once
+        but downloaded in chunks as it's iterated over. The iterator can be
+        passed to :class:`File` to upload the attachment as it is downloaded.
+
+        .. versionadded:: 2.0
+
+        Parameters
+        -----------
+        use_cached: :class:`bool`
+            Whether to use :attr:`proxy_url` rather than :attr:`url` when downloading
+            the attachment. See :meth:`read`.
+        chunk_size: :class:`int`
+            The maximum number of bytes in each chunk.
+
+        Raises
+        ------
+        HTTPException
+            Downloading the attachment failed.
+        Forbidden
+            You do not have permissions to access this attachment
+        NotFound
+            The attachment was deleted.
+
+        Yields
+        -------
+        :class:`bytes`
+            A chunk of the contents of the attachment.
+        """
+        url = self.proxy_url if use_cached else self.url
+        return self._http.stream_from_cdn(url, chunk_size)
+
     async def to_file(self, *, use_cached=False, spoiler=False):
         """|coro|
 
@@ -550,13 +588,14 @@ class Message(Hashable):
                  '_cs_clean_content', '_cs_raw_channel_mentions', 'nonce', 'pinned',
                  'role_mentions', '_cs_raw_role_mentions', 'type', 'flags',
                  '_cs_system_content', '_cs_guild', '_state', 'reactions', 'reference',
-                 'application', 'activity', 'stickers')
+                 'application', 'activity', 'stickers', '_reaction_index')
 
     def __init__(self, *, state, channel, data):
         self._state = state
         self.id = int(data['id'])
         self.webhook_id = utils._get_as_snowflake(data, 'webhook_id')
         self.reactions = [Reaction(message=self, data=d) for d in data.get('reactions', [])]
+        self._reaction_index = None
         self.attachments = [Attachment(data=a, state=self._state) for a in data['attachments']]
         self.embeds = [Embed.from_dict(a) for a in data['embeds']]
         self.application = data.get('application')
@@ -614,13 +653,24 @@ class Message(Hashable):
             else:
                 setattr(self, key, transform(value))
 
+    def _get_reaction_index(self):
+        # Built on the first reaction event so messages that never
+        # receive one don't pay for it.
+        index = self._reaction_index
+        if index is None:
+            index = self._reaction_index = {_reaction_key(r.emoji): r for r in self.reactions}
+        return index
+
     def _add_reaction(self, data, emoji, user_id):
-        reaction = utils.find(lambda r: r.emoji == emoji, self.reactions)
+        index = self._get_reaction_index()
+        key = _reaction_key(emoji)
+        reaction = index.get(key)
         is_me = data['me'] = user_id == self._state.self_id
 
         if reaction is None:
             reaction = Reaction(message=self, data=data, emoji=emoji)
             self.reactions.append(reaction)
+            index[key] = reaction
         else:
             reaction.count += 1
             if is_me:
@@ -629,7 +679,9 @@ class Message(Hashable):
         return reaction
 
     def _remove_reaction(self, data, emoji, user_id):
-        reaction = utils.find(lambda r: r.emoji == emoji, self.reactions)
+        index = self._get_reaction_index()
+        key = _reaction_key(emoji)
+        reaction = index.get(key)
 
         if reaction is None:
             # already removed?
@@ -644,21 +696,25 @@ class Message(Hashable):
         if reaction.count == 0:
             # this raises ValueError if something went wrong as well.
             self.reactions.remove(reaction)
+            del index[key]
 
         return reaction
 
     def _clear_emoji(self, emoji):
-        to_check = str(emoji)
-        for index, reaction in enumerate(self.reactions):
-            if str(reaction.emoji) == to_check:
-                break
-        else:
+        reaction = self._get_reaction_index().pop(_reaction_key(emoji), None)
+        if reaction is None:
             # didn't find anything so just return
             return
 
-        del self.reactions[index]
+        self.reactions.remove(reaction)
         return reaction
 
+    def _clear_reactions(self):
+        old_reactions = self.reactions.copy()
+        self.reactions.clear()
+        self._reaction_index = None
+        return old_reactions
+
     def _update(self, data):
         # In an update scheme, 'author' key has to be handled before 'member'
         # otherwise they overwrite each other which is undesirable.
@@ -0,0 +1,334 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import logging
+from bisect import bisect_left
+
+__all__ = (
+    'RequestWaitStats',
+    'HTTPMetrics',
+    'RequestMetrics',
+    'RequestRecord',
+)
+
+log = logging.getLogger(__name__)
+
+
+class RequestWaitStats:
+    """Statistics of how long HTTP requests of one :class:`RequestPriority`
+    waited on rate limits before being sent.
+
+    These are not meant to be created manually, they are returned by
+    :attr:`Client.request_wait_stats`. Every attempt at sending a request
+    is counted, including retries.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    -----------
+    priority: :class:`RequestPriority`
+        The priority of the requests.
+    count: :class:`int`
+        How many requests were sent.
+    total: :class:`float`
+        The total number of seconds the requests waited.
+    maximum: :class:`float`
+        The longest a single request waited, in seconds.
+    """
+
+    __slots__ = ('priority', 'count', 'total', 'maximum')
+
+    def __init__(self, priority):
+        self.priority = priority
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def __repr__(self):
+        return f'<RequestWaitStats priority={self.priority} count={self.count} average={self.average:.4f}>'
+
+    @property
+    def average(self):
+        """:class:`float`: The average number of seconds a request waited."""
+        if not self.count:
+            return 0.0
+        return self.total / self.count
+
+    def _record(self, waited):
+        self.count += 1
+        self.total += waited
+        if waited > self.maximum:
+            self.maximum = waited
+
+class RequestRecord:
+    """Represents a REST request that has finished, successfully or not.
+
+    These are not meant to be created manually, they are given to
+    :meth:`HTTPMetrics.on_request`. Requests answered by another request in
+    flight or by a :class:`ResponseCache` are not sent and have no record.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    -----------
+    method: :class:`str`
+        The HTTP method of the request.
+    path: :class:`str`
+        The route template of the request, e.g. ``'/channels/{channel_id}/messages'``.
+    bucket: Optional[:class:`str`]
+        The rate limit bucket hash Discord gave the route, if known.
+    priority: :class:`RequestPriority`
+        The priority the request was sent with.
+    status: Optional[:class:`int`]
+        The status code of the last response, ``None`` if no response was received.
+    error: Optional[:class:`str`]
+        The name of the exception the request raised, if any.
+    latency: :class:`float`
+        How many seconds the request took, including waiting on rate limits and retries.
+    attempts: :class:`int`
+        How many times the request was sent.
+    bucket_wait: :class:`float`
+        How many seconds were spent waiting on the route's rate limit bucket.
+    global_wait: :class:`float`
+        How many seconds were spent waiting on the global rate limit.
+    rate_limited: :class:`int`
+        How many 429 responses were received.
+    retry_after: :class:`float`
+        The total ``retry_after`` of the 429 responses, in seconds.
+    server_errors: :class:`int`
+        How many times the request was retried after a 500 or 502 response.
+    connection_resets: :class:`int`
+        How many times the request was retried after the connection was reset.
+    """
+
+    __slots__ = (
+        'method',
+        'path',
+        'bucket',
+        'priority',
+        'status',
+        'error',
+        'latency',
+        'attempts',
+        'bucket_wait',
+        'global_wait',
+        'rate_limited',
+        'retry_after',
+        'server_errors',
+        'connection_resets',
+    )
+
+    def __init__(self, method, path, priority):
+        self.method = method
+        self.path = path
+        self.bucket = None
+        self.priority = priority
+        self.status = None
+        self.error = None
+        self.latency = 0.0
+        self.attempts = 0
+        self.bucket_wait = 0.0
+        self.global_wait = 0.0
+        self.rate_limited = 0
+        self.retry_after = 0.0
+        self.server_errors = 0
+        self.connection_resets = 0
+
+    def __repr__(self):
+        return f'<RequestRecord method={self.method} path={self.path!r} status={self.status} latency={self.latency:.4f}>'
+
+class RequestMetrics:
+    """The aggregated metrics of the REST requests made to a route or a rate limit bucket.
+
+    These are not meant to be created manually, they are found in
+    :attr:`HTTPMetrics.routes` and :attr:`HTTPMetrics.buckets`.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    -----------
+    count: :class:`int`
+        How many requests finished.
+    latency_bounds: Tuple[:class:`float`, ...]
+        The upper bounds of the latency histogram, in seconds.
+    latency_counts: List[:class:`int`]
+        The latency histogram. Each element is the number of requests that took at most
+        the bound at the same index and more than the previous one. The last element
+        counts the requests slower than every bound.
+    latency_total: :class:`float`
+        The total latency of the requests, in seconds.
+    latency_max: :class:`float`
+        The highest latency of a request, in seconds.
+    statuses: Dict[:class:`int`, :class:`int`]
+        How many requests ended with each status code.
+    errors: :class:`int`
+        How many requests raised an exception.
+    bucket_wait: :class:`float`
+        The total seconds spent waiting on rate limit buckets.
+    global_wait: :class:`float`
+        The total seconds spent waiting on the global rate limit.
+    rate_limited: :class:`int`
+        How many 429 responses were received.
+    retry_after: :class:`float`
+        The total ``retry_after`` of the 429 responses, in seconds.
+    server_errors: :class:`int`
+        How many retries were caused by 500 or 502 responses.
+    connection_resets: :class:`int`
+        How many retries were caused by the connection being reset.
+    """
+
+    __slots__ = (
+        'count',
+        'latency_bounds',
+        'latency_counts',
+        'latency_total',
+        'latency_max',
+        'statuses',
+        'errors',
+        'bucket_wait',
+        'global_wait',
+        'rate_limited',
+        'retry_after',
+        'server_errors',
+        'connection_resets',
+    )
+
+    def __init__(self, latency_bounds):
+        self.count = 0
+        self.latency_bounds = latency_bounds
+        self.latency_counts = [0] * (len(latency_bounds) + 1)
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.statuses = {}
+        self.errors = 0
+        self.bucket_wait = 0.0
+        self.global_wait = 0.0
+        self.rate_limited = 0
+        self.retry_after = 0.0
+        self.server_errors = 0
+        self.connection_resets = 0
+
+    def __repr__(self):
+        return f'<RequestMetrics count={self.count} average_latency={self.average_latency:.4f} rate_limited={self.rate_limited}>'
+
+    @property
+    def average_latency(self):
+        """:class:`float`: The average latency of the requests, in seconds."""
+        if not self.count:
+            return 0.0
+        return self.latency_total / self.count
+
+    def _record(self, record):
+        self.count += 1
+        latency = record.latency
+        self.latency_counts[bisect_left(self.latency_bounds, latency)] += 1
+        self.latency_total += latency
+        if latency > self.latency_max:
+            self.latency_max = latency
+
+        status = record.status
+        if status is not None:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+        if record.error is not None:
+            self.errors += 1
+
+        self.bucket_wait += record.bucket_wait
+        self.global_wait += record.global_wait
+        self.rate_limited += record.rate_limited
+        self.retry_after += record.retry_after
+        self.server_errors += record.server_errors
+        self.connection_resets += record.connection_resets
+
+class HTTPMetrics:
+    """Collects metrics about the REST requests made by the library.
+
+    Pass an instance to :class:`Client` through the ``http_metrics`` option to
+    enable it. The metrics are aggregated per route template and per rate limit
+    bucket. Subclass this and override :meth:`on_request` to export every
+    request as it finishes.
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    latency_bounds: Sequence[:class:`float`]
+        The upper bounds of the latency histograms, in seconds. Defaults to
+        ``(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)``.
+
+    Attributes
+    -----------
+    routes: Dict[:class:`str`, :class:`RequestMetrics`]
+        The metrics of each route, keyed by the method and route template,
+        e.g. ``'POST /channels/{channel_id}/messages'``.
+    buckets: Dict[:class:`str`, :class:`RequestMetrics`]
+        The metrics of each rate limit bucket, keyed by the bucket hash.
+        Requests made before the route's bucket was known are not included.
+    """
+
+    def __init__(self, *, latency_bounds=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)):
+        self.latency_bounds = tuple(sorted(latency_bounds))
+        self.routes = {}
+        self.buckets = {}
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} routes={len(self.routes)} buckets={len(self.buckets)}>'
+
+    def on_request(self, record):
+        """Called with every request once it has finished.
+
+        This is called from the event loop so it should not block.
+        The base implementation does nothing.
+
+        Parameters
+        -----------
+        record: :class:`RequestRecord`
+            The request that has finished.
+        """
+        pass
+
+    def clear(self):
+        """Resets the aggregated metrics."""
+        self.routes.clear()
+        self.buckets.clear()
+
+    def _record(self, record):
+        key = f'{record.method} {record.path}'
+        try:
+            metrics = self.routes[key]
+        except KeyError:
+            self.routes[key] = metrics = RequestMetrics(self.latency_bounds)
+        metrics._record(record)
+
+        bucket = record.bucket
+        if bucket is not None:
+            try:
+                metrics = self.buckets[bucket]
+            except KeyError:
+                self.buckets[bucket] = metrics = RequestMetrics(self.latency_bounds)
+            metrics._record(record)
+
+        try:
+            self.on_request(record)
+        except Exception:
+            log.exception('HTTP metrics %r failed to handle %r.', self, record)
@@ -71,6 +71,12 @@ class PartialEmoji(_EmojiTag, AssetMixin):
         Whether the emoji is animated or not.
     id: Optional[:class:`int`]
         The ID of the custom emoji, if applicable.
+
+    .. note::
+
+        The partial emoji given by reaction events are shared between every
+        event and reaction with the same emoji and cannot be modified. Use
+        :func:`copy.copy` to get one that can.
     """
 
     __slots__ = ('animated', 'name', 'id', '_state')
@@ -168,3 +174,30 @@ class PartialEmoji(_EmojiTag, AssetMixin):
             raise InvalidArgument('PartialEmoji is not a custom emoji')
 
         return await super().read()
+
+
+class _InternedPartialEmoji(PartialEmoji):
+    # shared by ConnectionState between every reaction event on the same emoji,
+    # so it is read-only to keep one event from changing the others
+    __slots__ = ()
+
+    def __init__(self, *, state, name, animated=False, id=None):
+        object.__setattr__(self, 'animated', animated)
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'id', id)
+        object.__setattr__(self, '_state', state)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'PartialEmoji from reaction events are shared and read-only, copy it to modify {name!r}')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'PartialEmoji from reaction events are shared and read-only, copy it to modify {name!r}')
+
+    def __repr__(self):
+        return f'<PartialEmoji animated={self.animated} name={self.name!r} id={self.id}>'
+
+    def __copy__(self):
+        return PartialEmoji.with_state(self._state, name=self.name, animated=self.animated, id=self.id)
+
+    def __deepcopy__(self, memo):
+        return self.__copy__()
@@ -40,7 +40,7 @@ from .activity import BaseActivity
 from .user import User, ClientUser
 from .emoji import Emoji
 from .mentions import AllowedMentions
-from .partial_emoji import PartialEmoji
+from .partial_emoji import PartialEmoji, _InternedPartialEmoji
 from .message import Message
 from .channel import *
 from .raw_models import *
@@ -52,6 +52,7 @@ from .flags import ApplicationFlags, Intents, MemberCacheFlags
 from .object import Object
 from .invite import Invite
 from .interactions import Interaction
+from .tracing import _get_tracer
 
 class ChunkRequest:
     def __init__(self, guild_id, loop, resolver, *, cache=True):
@@ -110,6 +111,15 @@ class ConnectionState:
             self.max_messages = 1000
 
         self.dispatch = dispatch
+        tracer = _get_tracer(options.get('span_exporter'))
+        if tracer.exporter is not None:
+            # only wrapped when tracing so the common case stays a plain call
+            def traced_dispatch(event, *args, **kwargs):
+                with tracer.span('client.dispatch', event=event):
+                    dispatch(event, *args, **kwargs)
+
+            self.dispatch = traced_dispatch
+
         self.handlers = handlers
         self.hooks = hooks
         self.shard_count = None
@@ -168,6 +178,8 @@ class ConnectionState:
             cache_flags._verify_intents(intents)
 
         self.member_cache_flags = cache_flags
+        self.member_name_index = options.get('member_name_index', False)
+        self.permission_cache = options.get('permission_cache', False)
         self._activity = activity
         self._status = status
         self._intents = intents
@@ -180,12 +192,18 @@ class ConnectionState:
             if attr.startswith('parse_'):
                 parsers[attr[6:].upper()] = func
 
+        response_cache = http.response_cache
+        if response_cache is not None:
+            # only wrapped when caching so the common case stays a plain call
+            response_cache._wrap_parsers(parsers)
+
         self.clear()
 
     def clear(self):
         self.user = None
         self._users = weakref.WeakValueDictionary()
         self._emojis = {}
+        self._partial_emojis = {}
         self._guilds = {}
         self._voice_clients = {}
 
@@ -256,6 +274,17 @@ class ConnectionState:
         for vc in self.voice_clients:
             vc.main_ws = ws
 
+    def _reindex_member_names(self, user_id):
+        # The User object is shared between every guild the user is in,
+        # so a rename seen through one guild invalidates all the indexes.
+        if not self.member_name_index:
+            return
+
+        for guild in self._guilds.values():
+            member = guild.get_member(user_id)
+            if member is not None:
+                guild._reindex_member(member)
+
     def store_user(self, data):
         # this way is 300% faster than `dict.setdefault`.
         user_id = int(data['id'])
@@ -510,9 +539,7 @@ class ConnectionState:
             self.dispatch('raw_message_edit', raw)
 
     def parse_message_reaction_add(self, data):
-        emoji = data['emoji']
-        emoji_id = utils._get_as_snowflake(emoji, 'id')
-        emoji = PartialEmoji.with_state(self, id=emoji_id, animated=emoji.get('animated', False), name=emoji['name'])
+        emoji = self._get_partial_emoji(data['emoji'])
         raw = RawReactionActionEvent(data, emoji, 'REACTION_ADD')
 
         member_data = data.get('member')
@@ -539,14 +566,11 @@ class ConnectionState:
 
         message = self._get_message(raw.message_id)
         if message is not None:
-            old_reactions = message.reactions.copy()
-            message.reactions.clear()
+            old_reactions = message._clear_reactions()
             self.dispatch('reaction_clear', message, old_reactions)
 
     def parse_message_reaction_remove(self, data):
-        emoji = data['emoji']
-        emoji_id = utils._get_as_snowflake(emoji, 'id')
-        emoji = PartialEmoji.with_state(self, id=emoji_id, name=emoji['name'])
+        emoji = self._get_partial_emoji(data['emoji'])
         raw = RawReactionActionEvent(data, emoji, 'REACTION_REMOVE')
         self.dispatch('raw_reaction_remove', raw)
 
@@ -563,9 +587,7 @@ class ConnectionState:
                     self.dispatch('reaction_remove', reaction, user)
 
     def parse_message_reaction_remove_emoji(self, data):
-        emoji = data['emoji']
-        emoji_id = utils._get_as_snowflake(emoji, 'id')
-        emoji = PartialEmoji.with_state(self, id=emoji_id, name=emoji['name'])
+        emoji = self._get_partial_emoji(data['emoji'])
         raw = RawReactionClearEmojiEvent(data, emoji)
         self.dispatch('raw_reaction_clear_emoji', raw)
 
@@ -600,6 +622,7 @@ class ConnectionState:
         old_member = Member._copy(member)
         user_update = member._presence_update(data=data, user=user)
         if user_update:
+            self._reindex_member_names(member_id)
             self.dispatch('user_update', user_update[0], user_update[1])
 
         self.dispatch('member_update', old_member, member)
@@ -622,6 +645,8 @@ class ConnectionState:
             channel = guild.get_channel(channel_id)
             if channel is not None:
                 guild._remove_channel(channel)
+                if guild._permission_cache is not None:
+                    guild._permission_cache.invalidate_channel(channel_id)
                 self.dispatch('guild_channel_delete', channel)
 
     def parse_channel_update(self, data):
@@ -641,6 +666,8 @@ class ConnectionState:
             if channel is not None:
                 old_channel = copy.copy(channel)
                 channel._update(guild, data)
+                if guild._permission_cache is not None:
+                    guild._permission_cache.invalidate_channel(channel_id)
                 self.dispatch('guild_channel_update', old_channel, channel)
             else:
                 log.debug('CHANNEL_UPDATE referencing an unknown channel ID: %s. Discarding.', channel_id)
@@ -711,6 +738,8 @@ class ConnectionState:
             member = guild.get_member(user_id)
             if member is not None:
                 guild._remove_member(member)
+                if guild._permission_cache is not None:
+                    guild._permission_cache.invalidate_target(user_id)
                 self.dispatch('member_remove', member)
         else:
             log.debug('GUILD_MEMBER_REMOVE referencing an unknown guild ID: %s. Discarding.', data['guild_id'])
@@ -727,8 +756,11 @@ class ConnectionState:
         if member is not None:
             old_member = Member._copy(member)
             member._update(data)
+            if guild._permission_cache is not None and old_member._roles != member._roles:
+                guild._permission_cache.invalidate_target(user_id)
             user_update = member._update_inner_user(user)
             if user_update:
+                self._reindex_member_names(user_id)
                 self.dispatch('user_update', user_update[0], user_update[1])
 
             self.dispatch('member_update', old_member, member)
@@ -738,10 +770,10 @@ class ConnectionState:
 
                 # Force an update on the inner user if necessary
                 user_update = member._update_inner_user(user)
+                guild._add_member(member)
                 if user_update:
+                    self._reindex_member_names(user_id)
                     self.dispatch('user_update', user_update[0], user_update[1])
-
-                guild._add_member(member)
             log.debug('GUILD_MEMBER_UPDATE referencing an unknown member ID: %s. Discarding.', user_id)
 
     def parse_guild_emojis_update(self, data):
@@ -893,6 +925,9 @@ class ConnectionState:
             except KeyError:
                 return
             else:
+                # members might still reference the role until their own update arrives
+                if guild._permission_cache is not None:
+                    guild._permission_cache.clear()
                 self.dispatch('guild_role_delete', role)
         else:
             log.debug('GUILD_ROLE_DELETE referencing an unknown guild ID: %s. Discarding.', data['guild_id'])
@@ -906,6 +941,8 @@ class ConnectionState:
             if role is not None:
                 old_role = copy.copy(role)
                 role._update(role_data)
+                if guild._permission_cache is not None and old_role._permissions != role._permissions:
+                    guild._permission_cache.clear()
                 self.dispatch('guild_role_update', old_role, role)
         else:
             log.debug('GUILD_ROLE_UPDATE referencing an unknown guild ID: %s. Discarding.', data['guild_id'])
@@ -1017,6 +1054,22 @@ class ConnectionState:
         except KeyError:
             return PartialEmoji.with_state(self, animated=data.get('animated', False), id=emoji_id, name=data['name'])
 
+    def _get_partial_emoji(self, data):
+        # Reaction events on the same few emoji tend to come in bursts,
+        # so the PartialEmoji objects are shared instead of rebuilt every time.
+        # They are read-only so that changing one can't affect the others.
+        emoji_id = utils._get_as_snowflake(data, 'id')
+        key = (emoji_id, data['name'], data.get('animated', False))
+        try:
+            return self._partial_emojis[key]
+        except KeyError:
+            emoji = _InternedPartialEmoji(state=self, id=emoji_id, animated=key[2], name=key[1])
+            if len(self._partial_emojis) >= 1024:
+                # evict the oldest entry
+                del self._partial_emojis[next(iter(self._partial_emojis))]
+            self._partial_emojis[key] = emoji
+            return emoji
+
     def _upgrade_partial_emoji(self, emoji):
         emoji_id = emoji.id
         if not emoji_id:
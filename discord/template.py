@@ -65,6 +65,14 @@ class _PartialTemplateState:
     def member_cache_flags(self):
         return self.__state.member_cache_flags
 
+    @property
+    def member_name_index(self):
+        return False
+
+    @property
+    def permission_cache(self):
+        return False
+
     def store_emoji(self, guild, packet):
         return None
 
@@ -0,0 +1,180 @@
+"""
+The MIT License (MIT)
+
+Copyright (c) 2015-present Rapptz
+
+Permission is hereby granted, free of charge, to any person obtaining a
+copy of this software and associated documentation files (the "Software"),
+to deal in the Software without restriction, including without limitation
+the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the
+Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS
+OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+DEALINGS IN THE SOFTWARE.
+"""
+
+import itertools
+import logging
+import time
+from contextvars import ContextVar
+
+__all__ = (
+    'Span',
+    'SpanExporter',
+)
+
+log = logging.getLogger(__name__)
+
+_current_span = ContextVar('discord_current_span', default=None)
+_span_ids = itertools.count(1)
+
+class SpanExporter:
+    """The interface for receiving the tracing spans recorded by the library.
+
+    Subclass this and pass an instance to :class:`Client` through the
+    ``span_exporter`` option to enable tracing. The base class discards
+    every span.
+
+    The following spans are recorded, each one nested in the previous:
+
+    - ``gateway.receive``: a gateway frame being processed.
+    - ``gateway.inflate``: decompressing the frame.
+    - ``gateway.decode``: decoding the JSON payload.
+    - ``gateway.parse``: the ``ConnectionState`` parser for the event.
+    - ``client.dispatch``: dispatching an event to its handlers and listeners.
+    - ``client.handler``: an event handler or listener running in its own task.
+    - ``http.request``: a REST request, including time spent waiting on rate limits.
+
+    The context is propagated through :mod:`contextvars`, so HTTP requests
+    made inside an event handler are children of that handler's span.
+
+    .. versionadded:: 2.0
+    """
+
+    def export(self, span):
+        """Called with every span once it has ended.
+
+        This is called from the event loop so it should not block.
+
+        Parameters
+        -----------
+        span: :class:`Span`
+            The span that has ended.
+        """
+        pass
+
+class Span:
+    """Represents a timed operation recorded by the library's tracing.
+
+    These are not meant to be created manually, they are given to a
+    :class:`SpanExporter`.
+
+    .. versionadded:: 2.0
+
+    Attributes
+    -----------
+    name: :class:`str`
+        The name of the operation, e.g. ``'http.request'``.
+    id: :class:`int`
+        The ID of the span, unique within the process.
+    trace_id: :class:`int`
+        The ID of the root span this span descends from.
+    parent: Optional[:class:`Span`]
+        The span this span was started in, if any.
+    attributes: Dict[:class:`str`, Any]
+        Extra information about the operation, such as the event name or route.
+    start: :class:`float`
+        The :func:`time.perf_counter` value when the span started.
+    end: Optional[:class:`float`]
+        The :func:`time.perf_counter` value when the span ended.
+    """
+
+    __slots__ = ('name', 'id', 'trace_id', 'parent', 'attributes', 'start', 'end', '_exporter', '_token')
+
+    def __init__(self, exporter, name, attributes):
+        self._exporter = exporter
+        self.name = name
+        self.id = next(_span_ids)
+        self.parent = parent = _current_span.get()
+        self.trace_id = self.id if parent is None else parent.trace_id
+        self.attributes = attributes
+        self.start = time.perf_counter()
+        self.end = None
+        self._token = None
+
+    def __repr__(self):
+        return f'<Span name={self.name!r} id={self.id} trace_id={self.trace_id} duration={self.duration}>'
+
+    def __enter__(self):
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end = time.perf_counter()
+        if exc_type is not None:
+            self.attributes['error'] = exc_type.__name__
+        _current_span.reset(self._token)
+        try:
+            self._exporter.export(self)
+        except Exception:
+            log.exception('Span exporter %r failed to export %r.', self._exporter, self)
+
+    @property
+    def duration(self):
+        """Optional[:class:`float`]: How long the span took in seconds, if it has ended."""
+        if self.end is None:
+            return None
+        return self.end - self.start
+
+    def set_attribute(self, key, value):
+        """Sets an attribute on the span."""
+        self.attributes[key] = value
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+    def set_attribute(self, key, value):
+        pass
+
+_null_span = _NullSpan()
+
+class _Tracer:
+    __slots__ = ('exporter',)
+
+    def __init__(self, exporter):
+        self.exporter = exporter
+
+    def span(self, name, **attributes):
+        return Span(self.exporter, name, attributes)
+
+class _NullTracer:
+    __slots__ = ()
+
+    exporter = None
+
+    def span(self, name, **attributes):
+        return _null_span
+
+_null_tracer = _NullTracer()
+
+def _get_tracer(exporter):
+    if exporter is None:
+        return _null_tracer
+    if not isinstance(exporter, SpanExporter):
+        raise TypeError(f'span_exporter must be SpanExporter not {exporter.__class__!r}')
+    return _Tracer(exporter)
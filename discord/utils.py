@@ -26,6 +26,8 @@ from __future__ import annotations
 import array
 import asyncio
 import collections.abc
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import (
     Any,
     AsyncIterator,
@@ -49,13 +51,16 @@ from base64 import b64encode
 from bisect import bisect_left
 import datetime
 import functools
+import io
 from inspect import isawaitable as _isawaitable, signature as _signature
 from operator import attrgetter
 import json
+import os
 import re
 import warnings
 
 from .errors import InvalidArgument
+from .enums import RequestPriority
 
 __all__ = (
     'oauth_url',
@@ -69,6 +74,7 @@ __all__ = (
     'escape_markdown',
     'escape_mentions',
     'as_chunks',
+    'request_priority',
 )
 
 DISCORD_EPOCH = 1420070400000
@@ -741,6 +747,37 @@ def _chunk(iterator: Iterator[T], max_size: int) -> Iterator[List[T]]:
     if ret:
         yield ret
 
+async def _save_stream(stream: AsyncIterator[bytes], fp: Any, seek_begin: bool) -> int:
+    try:
+        if isinstance(fp, io.BufferedIOBase):
+            written = 0
+            async for chunk in stream:
+                written += fp.write(chunk)
+            if seek_begin:
+                fp.seek(0)
+            return written
+
+        # written next to the destination and moved over it once complete
+        # so that a failed download never leaves a partial file behind
+        path = os.fsdecode(fp)
+        directory, name = os.path.split(os.path.abspath(path))
+        temp = os.path.join(directory, f'.{name}.{os.urandom(4).hex()}.part')
+        try:
+            with open(temp, 'xb') as f:
+                written = 0
+                async for chunk in stream:
+                    written += f.write(chunk)
+            os.replace(temp, path)
+        except BaseException:
+            try:
+                os.remove(temp)
+            except OSError:
+                pass
+            raise
+        return written
+    finally:
+        await stream.aclose()
+
 async def _achunk(iterator: AsyncIterator[T], max_size: int) -> AsyncIterator[List[T]]:
     ret = []
     n = 0
@@ -793,3 +830,42 @@ def as_chunks(iterator: _Iter[T], max_size: int) -> _Iter[List[T]]:
     if isinstance(iterator, AsyncIterator):
         return _achunk(iterator, max_size)
     return _chunk(iterator, max_size)
+
+
+_request_priority: ContextVar[Optional[RequestPriority]] = ContextVar('discord_request_priority', default=None)
+
+
+@contextmanager
+def request_priority(priority: RequestPriority) -> Iterator[None]:
+    """A context manager that sets the priority of the HTTP requests made inside it.
+
+    When requests are held back by the global rate limit, requests with a higher
+    priority are sent first. The priority is kept in a :mod:`contextvars` variable so
+    it applies to the current task and the tasks created inside the block.
+
+    Example: ::
+
+        with discord.utils.request_priority(discord.RequestPriority.background):
+            for member in members:
+                await member.add_roles(role)
+
+    .. versionadded:: 2.0
+
+    Parameters
+    -----------
+    priority: :class:`RequestPriority`
+        The priority of the requests.
+
+    Raises
+    -------
+    TypeError
+        The priority is not a :class:`RequestPriority`.
+    """
+    if not isinstance(priority, RequestPriority):
+        raise TypeError(f'priority must be RequestPriority not {priority.__class__!r}')
+
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
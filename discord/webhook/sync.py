@@ -105,6 +105,9 @@ class WebhookAdapter:
     ) -> Any:
         headers: Dict[str, str] = {}
         files = files or []
+        for file in files:
+            if file._original_pos is None:
+                raise InvalidArgument(f'File {file.filename!r} is asynchronous and cannot be sent through a SyncWebhook')
         to_send: Optional[Union[str, Dict[str, Any]]] = None
         bucket = (route.webhook_id, route.webhook_token)
 
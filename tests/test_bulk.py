@@ -0,0 +1,181 @@
+import asyncio
+
+import pytest
+
+import discord
+from discord.guild import Guild
+from discord.http import HTTPException
+
+
+class StubRateLimiter:
+    def __init__(self, limit=None):
+        self._limit = limit
+
+    def get_key(self, route):
+        return (route.method, route.path)
+
+    def limit(self, route):
+        return self._limit
+
+
+class StubHTTP:
+    """Records the requests made by a BulkExecutor instead of sending them."""
+
+    def __init__(self, limit=None, fail=()):
+        self._ratelimiter = StubRateLimiter(limit)
+        self.fail = set(fail)
+        self.calls = []
+        self.inflight = 0
+        self.max_inflight = 0
+
+    async def _request(self, name, user_id, *args, **kwargs):
+        self.calls.append((name, user_id, args, kwargs))
+        self.inflight += 1
+        self.max_inflight = max(self.max_inflight, self.inflight)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.inflight -= 1
+        if user_id in self.fail:
+            raise HTTPException(StubResponse(), 'failed')
+
+    async def edit_member(self, guild_id, user_id, *, reason=None, **fields):
+        await self._request('edit_member', user_id, **fields)
+
+    async def add_role(self, guild_id, user_id, role_id, *, reason=None):
+        await self._request('add_role', user_id, role_id)
+
+    async def remove_role(self, guild_id, user_id, role_id, *, reason=None):
+        await self._request('remove_role', user_id, role_id)
+
+    async def kick(self, user_id, guild_id, reason=None):
+        await self._request('kick', user_id)
+
+    async def ban(self, user_id, guild_id, delete_message_days=1, reason=None):
+        await self._request('ban', user_id, delete_message_days)
+
+    async def unban(self, user_id, guild_id, *, reason=None):
+        await self._request('unban', user_id)
+
+
+class StubResponse:
+    status = 400
+    reason = 'Bad Request'
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+def make_guild(loop, http):
+    state = discord.Client(loop=loop, intents=discord.Intents.all())._connection
+    state.http = http
+    roles = [{'id': i, 'name': f'r{i}', 'permissions': '0', 'position': i, 'color': 0} for i in (1, 2, 3)]
+    members = [
+        {'user': {'id': i, 'username': f'u{i}', 'discriminator': '0001', 'avatar': None}, 'roles': ['3'], 'joined_at': None}
+        for i in range(10, 20)
+    ]
+    return Guild(data={'id': 1, 'name': 'guild', 'roles': roles, 'members': members}, state=state)
+
+
+def test_role_changes_are_merged(loop):
+    http = StubHTTP(limit=10)
+    guild = make_guild(loop, http)
+    member = guild.get_member(10)
+    bulk = discord.BulkExecutor(guild)
+    bulk.add_roles(member, guild.get_role(2))
+    bulk.remove_roles(member, guild.get_role(3))
+    loop.run_until_complete(bulk.execute())
+
+    assert http.calls == [('edit_member', 10, (), {'roles': [2]})]
+
+
+def test_unchanged_roles_send_nothing(loop):
+    http = StubHTTP(limit=10)
+    guild = make_guild(loop, http)
+    bulk = discord.BulkExecutor(guild)
+    operation = bulk.add_roles(guild.get_member(10), guild.get_role(3))
+    operations = loop.run_until_complete(bulk.execute())
+
+    assert http.calls == []
+    assert operations == [operation]
+    assert operation.done and not operation.failed
+
+
+def test_failed_operation_does_not_stop_the_others(loop):
+    http = StubHTTP(limit=2, fail={12})
+    guild = make_guild(loop, http)
+    bulk = discord.BulkExecutor(guild)
+    for user_id in range(10, 15):
+        bulk.kick(discord.Object(id=user_id))
+    operations = loop.run_until_complete(bulk.execute())
+
+    assert sorted(call[1] for call in http.calls) == list(range(10, 15))
+    assert all(operation.done for operation in operations)
+    assert [operation.target.id for operation in operations if operation.failed] == [12]
+    assert isinstance(operations[2].error, HTTPException)
+
+
+def test_progress_counts(loop):
+    http = StubHTTP(limit=3)
+    guild = make_guild(loop, http)
+    bulk = discord.BulkExecutor(guild)
+    for member in guild.members[:4]:
+        bulk.add_roles(member, guild.get_role(2))
+    bulk.add_roles(guild.get_member(15), guild.get_role(3))
+    bulk.ban(discord.Object(id=100))
+
+    progress = []
+    loop.run_until_complete(bulk.execute(progress=lambda operation, done, total: progress.append((done, total))))
+
+    assert progress == [(done, 6) for done in range(1, 7)]
+
+
+def test_concurrent_executes_count_separately(loop):
+    http = StubHTTP(limit=2)
+    guild = make_guild(loop, http)
+    first, second = discord.BulkExecutor(guild), discord.BulkExecutor(guild)
+    for user_id in range(100, 103):
+        first.ban(discord.Object(id=user_id))
+    for user_id in range(200, 205):
+        second.ban(discord.Object(id=user_id))
+
+    progress = {first: [], second: []}
+
+    async def run():
+        await asyncio.gather(
+            first.execute(progress=lambda operation, done, total: progress[first].append((done, total))),
+            second.execute(progress=lambda operation, done, total: progress[second].append((done, total))),
+        )
+
+    loop.run_until_complete(run())
+
+    assert progress[first] == [(done, 3) for done in range(1, 4)]
+    assert progress[second] == [(done, 5) for done in range(1, 6)]
+
+
+def test_unknown_limit_is_not_sequential(loop, caplog):
+    http = StubHTTP(limit=None)
+    guild = make_guild(loop, http)
+    bulk = discord.BulkExecutor(guild)
+    for user_id in range(100, 120):
+        bulk.ban(discord.Object(id=user_id))
+    operations = loop.run_until_complete(bulk.execute())
+
+    assert all(operation.done and not operation.failed for operation in operations)
+    assert http.max_inflight == discord.BulkExecutor.DEFAULT_CONCURRENCY
+    assert sum('is unknown' in record.getMessage() for record in caplog.records) == 1
+
+
+def test_max_concurrency_caps_unknown_limit(loop):
+    http = StubHTTP(limit=None)
+    guild = make_guild(loop, http)
+    bulk = discord.BulkExecutor(guild, max_concurrency=2)
+    for user_id in range(100, 110):
+        bulk.ban(discord.Object(id=user_id))
+    loop.run_until_complete(bulk.execute())
+
+    assert http.max_inflight == 2
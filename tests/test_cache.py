@@ -0,0 +1,117 @@
+import pytest
+
+from discord.cache import ResponseCache, _INVALIDATORS
+from discord.http import Route
+
+GUILD = '1'
+CHANNEL = '2'
+MESSAGE = '3'
+USER = '4'
+ROLE = '5'
+EMOJI = '6'
+
+ROUTES = {
+    'me': ('/users/@me', {}),
+    'user': ('/users/{user_id}', {'user_id': USER}),
+    'guild': ('/guilds/{guild_id}', {'guild_id': GUILD}),
+    'guild_channels': ('/guilds/{guild_id}/channels', {'guild_id': GUILD}),
+    'member': ('/guilds/{guild_id}/members/{member_id}', {'guild_id': GUILD, 'member_id': USER}),
+    'roles': ('/guilds/{guild_id}/roles', {'guild_id': GUILD}),
+    'emojis': ('/guilds/{guild_id}/emojis', {'guild_id': GUILD}),
+    'emoji': ('/guilds/{guild_id}/emojis/{emoji_id}', {'guild_id': GUILD, 'emoji_id': EMOJI}),
+    'ban': ('/guilds/{guild_id}/bans/{user_id}', {'guild_id': GUILD, 'user_id': USER}),
+    'channel': ('/channels/{channel_id}', {'channel_id': CHANNEL}),
+    'pins': ('/channels/{channel_id}/pins', {'channel_id': CHANNEL}),
+    'message': ('/channels/{channel_id}/messages/{message_id}', {'channel_id': CHANNEL, 'message_id': MESSAGE}),
+}
+
+USER_PAYLOAD = {'id': USER, 'username': 'user', 'discriminator': '0001', 'avatar': None}
+CHANNEL_PAYLOAD = {'id': CHANNEL, 'guild_id': GUILD, 'type': 0, 'name': 'general'}
+REACTION_PAYLOAD = {'channel_id': CHANNEL, 'message_id': MESSAGE, 'guild_id': GUILD, 'user_id': USER}
+
+# event -> (payload, routes the event must evict)
+EVENTS = {
+    'USER_UPDATE': (USER_PAYLOAD, {'me', 'user'}),
+    'GUILD_UPDATE': ({'id': GUILD}, {'guild'}),
+    'GUILD_DELETE': ({'id': GUILD}, {'guild', 'guild_channels', 'member', 'roles', 'emojis', 'emoji', 'ban'}),
+    'GUILD_EMOJIS_UPDATE': ({'guild_id': GUILD, 'emojis': []}, {'guild', 'emojis', 'emoji'}),
+    'GUILD_ROLE_CREATE': ({'guild_id': GUILD, 'role': {'id': ROLE}}, {'guild', 'roles'}),
+    'GUILD_ROLE_UPDATE': ({'guild_id': GUILD, 'role': {'id': ROLE}}, {'guild', 'roles'}),
+    'GUILD_ROLE_DELETE': ({'guild_id': GUILD, 'role_id': ROLE}, {'guild', 'roles'}),
+    'GUILD_MEMBER_ADD': ({'guild_id': GUILD, 'user': USER_PAYLOAD}, {'member', 'user'}),
+    'GUILD_MEMBER_UPDATE': ({'guild_id': GUILD, 'user': USER_PAYLOAD}, {'member', 'user'}),
+    'GUILD_MEMBER_REMOVE': ({'guild_id': GUILD, 'user': USER_PAYLOAD}, {'member', 'user'}),
+    'PRESENCE_UPDATE': ({'guild_id': GUILD, 'user': USER_PAYLOAD, 'status': 'online'}, {'member', 'user'}),
+    'GUILD_BAN_ADD': ({'guild_id': GUILD, 'user': USER_PAYLOAD}, {'ban', 'member'}),
+    'GUILD_BAN_REMOVE': ({'guild_id': GUILD, 'user': USER_PAYLOAD}, {'ban', 'member'}),
+    'CHANNEL_CREATE': (CHANNEL_PAYLOAD, {'channel', 'guild_channels'}),
+    'CHANNEL_UPDATE': (CHANNEL_PAYLOAD, {'channel', 'guild_channels'}),
+    'CHANNEL_DELETE': (CHANNEL_PAYLOAD, {'channel', 'pins', 'message', 'guild_channels'}),
+    'CHANNEL_PINS_UPDATE': ({'channel_id': CHANNEL, 'guild_id': GUILD}, {'pins'}),
+    'MESSAGE_UPDATE': ({'id': MESSAGE, 'channel_id': CHANNEL}, {'message'}),
+    'MESSAGE_DELETE': ({'id': MESSAGE, 'channel_id': CHANNEL}, {'message'}),
+    'MESSAGE_DELETE_BULK': ({'ids': [MESSAGE], 'channel_id': CHANNEL}, {'message'}),
+    'MESSAGE_REACTION_ADD': (REACTION_PAYLOAD, {'message'}),
+    'MESSAGE_REACTION_REMOVE': (REACTION_PAYLOAD, {'message'}),
+    'MESSAGE_REACTION_REMOVE_ALL': (REACTION_PAYLOAD, {'message'}),
+    'MESSAGE_REACTION_REMOVE_EMOJI': (REACTION_PAYLOAD, {'message'}),
+}
+
+
+def url(name):
+    path, parameters = ROUTES[name]
+    return Route('GET', path, **parameters).url
+
+
+def make_cache():
+    cache = ResponseCache()
+    for name in ROUTES:
+        cache._begin(url(name))
+        cache._finish(url(name), 60.0, {'name': name})
+    return cache
+
+
+def cached(cache):
+    return {name for name in ROUTES if url(name) in cache._cache}
+
+
+def test_every_invalidator_is_tested():
+    assert set(EVENTS) == set(_INVALIDATORS)
+
+
+@pytest.mark.parametrize('event', sorted(EVENTS))
+def test_event_evicts_affected_routes(event):
+    payload, evicted = EVENTS[event]
+    cache = make_cache()
+    parsed = []
+    parsers = {event: parsed.append}
+    cache._wrap_parsers(parsers)
+
+    parsers[event](payload)
+
+    assert parsed == [payload]
+    assert cached(cache) == set(ROUTES) - evicted
+
+
+def test_partial_presence_update_keeps_user():
+    cache = make_cache()
+    parsers = {'PRESENCE_UPDATE': lambda data: None}
+    cache._wrap_parsers(parsers)
+
+    parsers['PRESENCE_UPDATE']({'guild_id': GUILD, 'user': {'id': USER}, 'status': 'idle'})
+
+    assert cached(cache) == set(ROUTES)
+
+
+def test_invalidated_while_fetching_is_not_stored():
+    cache = ResponseCache()
+    target = url('channel')
+    cache._begin(target)
+    parsers = {'CHANNEL_UPDATE': lambda data: None}
+    cache._wrap_parsers(parsers)
+
+    parsers['CHANNEL_UPDATE'](CHANNEL_PAYLOAD)
+    cache._finish(target, 60.0, {'name': 'old'})
+
+    with pytest.raises(KeyError):
+        cache._get(target)
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+import discord
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+class RecordingClient(discord.Client):
+    async def on_ready(self):
+        pass
+
+    def _schedule_event(self, coro, event_name, *args, **kwargs):
+        self.scheduled.append((coro, event_name))
+
+
+def make_client(loop):
+    client = RecordingClient(loop=loop)
+    client.scheduled = []
+    return client
+
+
+def test_class_handlers_are_dispatched(loop):
+    client = make_client(loop)
+    client.dispatch('ready')
+    client.dispatch('ready')
+    client.dispatch('typing')
+
+    assert client.scheduled == [(client.on_ready, 'on_ready')] * 2
+
+
+def test_assigned_handlers_after_first_dispatch(loop):
+    client = make_client(loop)
+
+    async def on_message(message):
+        pass
+
+    async def on_ready():
+        pass
+
+    class_handler = client.on_ready
+    client.dispatch('message', None)
+    client.dispatch('ready')
+    client.on_message = on_message
+    client.on_ready = on_ready
+    client.dispatch('message', None)
+    client.dispatch('ready')
+
+    assert client.scheduled == [
+        (class_handler, 'on_ready'),
+        (on_message, 'on_message'),
+        (on_ready, 'on_ready'),
+    ]
+
+
+def test_deleted_handlers_after_first_dispatch(loop):
+    client = make_client(loop)
+
+    @client.event
+    async def on_message(message):
+        pass
+
+    @client.event
+    async def on_ready():
+        pass
+
+    client.dispatch('message', None)
+    client.dispatch('ready')
+    del client.on_message
+    del client.on_ready
+    client.scheduled.clear()
+    client.dispatch('message', None)
+    client.dispatch('ready')
+
+    # the class handler is back for on_ready, nothing handles on_message
+    assert client.scheduled == [(client.on_ready, 'on_ready')]
+    assert client.on_ready.__func__ is RecordingClient.on_ready
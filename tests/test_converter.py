@@ -0,0 +1,81 @@
+import asyncio
+import gc
+from types import SimpleNamespace
+
+import pytest
+
+from discord.ext.commands.converter import _MemberResolver
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    errors = []
+    loop.set_exception_handler(lambda loop, context: errors.append(context))
+    loop.errors = errors
+    yield loop
+    loop.close()
+
+
+def make_guild(error=None):
+    queries = []
+
+    async def query_members(query=None, *, limit, user_ids=None, cache):
+        queries.append(user_ids or query)
+        await asyncio.sleep(0.01)
+        if error is not None:
+            raise error
+        return [SimpleNamespace(id=user_id) for user_id in user_ids or ()]
+
+    return SimpleNamespace(id=1, query_members=query_members, queries=queries)
+
+
+def test_lookups_by_id_are_batched(loop):
+    guild = make_guild()
+    resolver = _MemberResolver(delay=0.01)
+
+    async def run():
+        lookups = [resolver.query_id(guild, user_id, False) for user_id in (1, 2, 2, 3)]
+        await asyncio.sleep(0.015)
+        # the batch is queried by a task only the resolver holds on to
+        assert len(resolver._tasks) == 1
+        gc.collect()
+        return await asyncio.gather(*lookups)
+
+    members = loop.run_until_complete(run())
+    assert [member.id for member in members] == [1, 2, 2, 3]
+    assert guild.queries == [[1, 2, 3]]
+    assert not resolver._tasks
+
+
+def test_failed_batch_with_cancelled_converters_is_not_logged(loop):
+    guild = make_guild(error=RuntimeError('query failed'))
+    resolver = _MemberResolver(delay=0.01)
+
+    async def run():
+        lookups = [asyncio.ensure_future(resolver.query_id(guild, user_id, False)) for user_id in (1, 2)]
+        await asyncio.sleep(0)
+        for lookup in lookups:
+            lookup.cancel()
+        await asyncio.sleep(0.05)
+        assert not resolver._tasks
+
+    loop.run_until_complete(run())
+    gc.collect()
+    assert loop.errors == []
+
+
+def test_failed_shared_query_with_cancelled_converters_is_not_logged(loop):
+    guild = make_guild(error=RuntimeError('query failed'))
+    resolver = _MemberResolver()
+
+    async def run():
+        lookup = asyncio.ensure_future(resolver.query_named(guild, 'name', False))
+        await asyncio.sleep(0)
+        lookup.cancel()
+        await asyncio.sleep(0.05)
+        assert not resolver._inflight
+
+    loop.run_until_complete(run())
+    gc.collect()
+    assert loop.errors == []
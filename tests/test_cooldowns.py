@@ -0,0 +1,58 @@
+from types import SimpleNamespace
+
+from discord.ext.commands import BucketType, Cooldown, CooldownMapping
+
+
+NOW = 1_600_000_000.0
+
+
+def message(user_id):
+    return SimpleNamespace(author=SimpleNamespace(id=user_id))
+
+
+def test_lookup_does_not_change_expiry_order():
+    mapping = CooldownMapping(Cooldown(1, 60), BucketType.user, max_size=2)
+    mapping.update_rate_limit(message(1), NOW + 1)
+    mapping.update_rate_limit(message(2), NOW + 30)
+
+    # looking a bucket up doesn't use it, user 1 still expires first
+    mapping.get_bucket(message(1), NOW + 50)
+    mapping.update_rate_limit(message(3), NOW + 55)
+
+    assert set(mapping._cache) == {2, 3}
+    assert mapping.update_rate_limit(message(2), NOW + 56) == 34
+
+
+def test_reset_bucket_expires_first():
+    mapping = CooldownMapping(Cooldown(1, 60), BucketType.user, max_size=2)
+    mapping.update_rate_limit(message(1), NOW + 1)
+    mapping.update_rate_limit(message(2), NOW + 30)
+
+    bucket = mapping.get_bucket(message(2), NOW + 40)
+    bucket.reset()
+    mapping._touch(2, bucket)
+    mapping.update_rate_limit(message(3), NOW + 45)
+
+    assert set(mapping._cache) == {1, 3}
+
+
+def test_expired_keys_are_swept():
+    mapping = CooldownMapping(Cooldown(1, 60), BucketType.user)
+    for user_id in range(10):
+        mapping.update_rate_limit(message(user_id), NOW + user_id)
+    mapping.get_bucket(message(0), NOW + 65)
+    mapping.update_rate_limit(message(5), NOW + 65)
+
+    mapping.get_bucket(message(100), NOW + 69.5)
+    assert set(mapping._cache) == {5, 100}
+
+
+def test_unused_bucket_does_not_outlive_used_ones():
+    mapping = CooldownMapping(Cooldown(1, 60), BucketType.user)
+    mapping.update_rate_limit(message(1), NOW + 1)
+    # only looked at, e.g. by Command.is_on_cooldown
+    mapping.get_bucket(message(2), NOW + 2)
+    mapping.get_bucket(message(3), NOW + 3)
+
+    # user 2's bucket was swept by the next lookup, it is ahead of user 1's
+    assert set(mapping._cache) == {1, 3}
@@ -0,0 +1,252 @@
+import asyncio
+import gc
+import json
+import time
+from collections import Counter
+
+import pytest
+from aiohttp import web
+
+from discord.enums import RequestPriority
+from discord.errors import NotFound
+from discord.http import HTTPClient, Route
+
+
+def json_response(data, *, status=200, headers=None):
+    # the library only decodes a body sent as exactly application/json
+    response = web.Response(body=json.dumps(data).encode(), status=status, headers=headers)
+    response.headers['Content-Type'] = 'application/json'
+    return response
+
+
+class FakeAPI:
+    """A local stand-in for the API that enforces its rate limit headers.
+
+    Message routes are limited per channel and answer with ``X-RateLimit-*``
+    headers, every other route answers without any. A message with the id
+    404 doesn't exist.
+    """
+
+    def __init__(self, *, limit=5, per=0.25, latency=0.05, latencies=None):
+        self.limit = limit
+        self.per = per
+        self.latency = latency
+        self.latencies = latencies or {}
+        self.windows = {}
+        self.counts = Counter()
+        self.requests = 0
+        self.ratelimited = 0
+        self.inflight = {}
+        self.max_inflight = {}
+
+    async def handle(self, request):
+        path = request.path
+        self.inflight[path] = inflight = self.inflight.get(path, 0) + 1
+        self.max_inflight[path] = max(self.max_inflight.get(path, 0), inflight)
+        try:
+            await asyncio.sleep(self.latencies.get(request.method, self.latency))
+            self.requests += 1
+            self.counts[request.method, path] += 1
+            if path.endswith('/messages/404'):
+                return json_response({'message': 'Unknown Message', 'code': 10008}, status=404)
+            headers = {}
+            if path.endswith('/messages'):
+                now = time.monotonic()
+                window = self.windows.get(path)
+                if window is None or window[1] <= now:
+                    window = self.windows[path] = [self.limit, now + self.per]
+
+                headers['X-RateLimit-Bucket'] = 'messages'
+                headers['X-RateLimit-Limit'] = str(self.limit)
+                headers['X-RateLimit-Reset-After'] = f'{window[1] - now:.3f}'
+                if window[0] <= 0:
+                    self.ratelimited += 1
+                    headers['X-RateLimit-Remaining'] = '0'
+                    body = {'retry_after': window[1] - now, 'global': False}
+                    return json_response(body, status=429, headers=headers)
+
+                window[0] -= 1
+                headers['X-RateLimit-Remaining'] = str(window[0])
+
+            return json_response({'id': '1', 'username': 'bot', 'discriminator': '0001'}, headers=headers)
+        finally:
+            self.inflight[path] -= 1
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_route('*', '/{tail:.*}', self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f'http://127.0.0.1:{port}/api/v8'
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+
+async def start_client(monkeypatch, api):
+    monkeypatch.setattr(Route, 'BASE', await api.start())
+    http = HTTPClient(loop=asyncio.get_running_loop())
+    await http.static_login('token')
+    api.requests = 0
+    api.counts.clear()
+    return http
+
+
+def run_with_client(loop, monkeypatch, api, test):
+    async def run():
+        http = await start_client(monkeypatch, api)
+        try:
+            await test(http)
+        finally:
+            await http.close()
+            await api.stop()
+
+    loop.run_until_complete(run())
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+def run_against(loop, monkeypatch, api, requests):
+    async def run():
+        http = await start_client(monkeypatch, api)
+        try:
+            start = time.perf_counter()
+            await asyncio.gather(*(http.request(route) for route in requests()))
+            return time.perf_counter() - start
+        finally:
+            await http.close()
+            await api.stop()
+
+    return loop.run_until_complete(run())
+
+
+@pytest.mark.parametrize('latency', [0.005, 0.02, 0.05])
+def test_limited_route_is_concurrent_without_429s(loop, monkeypatch, latency):
+    api = FakeAPI(limit=5, per=0.25, latency=latency)
+    requests = lambda: [Route('POST', '/channels/{channel_id}/messages', channel_id=1) for _ in range(12)]
+    run_against(loop, monkeypatch, api, requests)
+
+    path = '/api/v8/channels/1/messages'
+    assert api.requests == 12
+    assert api.ratelimited == 0
+    assert 1 < api.max_inflight[path] <= api.limit
+
+
+def test_route_without_headers_is_not_serialized(loop, monkeypatch):
+    api = FakeAPI(limit=5, per=0.25, latency=0.05)
+    requests = lambda: [Route('POST', '/channels/{channel_id}/typing', channel_id=1) for _ in range(10)]
+    elapsed = run_against(loop, monkeypatch, api, requests)
+
+    assert api.requests == 10
+    assert api.max_inflight['/api/v8/channels/1/typing'] > 1
+    # one request at a time would take 10 round trips
+    assert elapsed < 10 * api.latency / 2
+
+
+MESSAGE = ('GET', '/api/v8/channels/1/messages/2')
+
+
+def test_identical_fetches_are_shared(loop, monkeypatch):
+    api = FakeAPI()
+
+    async def test(http):
+        messages = await asyncio.gather(*(http.get_message(1, 2) for _ in range(5)))
+        assert api.counts[MESSAGE] == 1
+        assert http.coalesced_requests == 4
+
+        # every caller can modify its own copy
+        assert all(message == messages[0] for message in messages)
+        messages[0]['username'] = 'changed'
+        assert all(message['username'] == 'bot' for message in messages[1:])
+
+    run_with_client(loop, monkeypatch, api, test)
+
+
+def test_only_allowed_routes_are_shared(loop, monkeypatch):
+    api = FakeAPI()
+
+    async def test(http):
+        await asyncio.gather(*(http.get_roles(1) for _ in range(3)))
+        assert api.counts['GET', '/api/v8/guilds/1/roles'] == 3
+        assert http.coalesced_requests == 0
+
+    run_with_client(loop, monkeypatch, api, test)
+
+
+def test_cancelled_caller_does_not_cancel_the_others(loop, monkeypatch):
+    api = FakeAPI()
+
+    async def test(http):
+        first = asyncio.ensure_future(http.get_message(1, 2))
+        second = asyncio.ensure_future(http.get_message(1, 2))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert (await second)['id'] == '1'
+        assert first.cancelled()
+        assert api.counts[MESSAGE] == 1
+
+    run_with_client(loop, monkeypatch, api, test)
+
+
+def test_error_with_every_caller_cancelled_is_retrieved(loop, monkeypatch):
+    api = FakeAPI()
+    errors = []
+    loop.set_exception_handler(lambda loop, context: errors.append(context))
+
+    async def test(http):
+        callers = [asyncio.ensure_future(http.get_message(1, 404)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        (in_flight,) = http._in_flight.values()
+        for caller in callers:
+            caller.cancel()
+
+        await asyncio.gather(in_flight.task, return_exceptions=True)
+        assert isinstance(in_flight.task.exception(), NotFound)
+        assert not http._in_flight
+
+    run_with_client(loop, monkeypatch, api, test)
+    gc.collect()
+    assert errors == []
+
+
+def test_fetch_after_write_is_not_shared(loop, monkeypatch):
+    api = FakeAPI(latencies={'GET': 0.1, 'PATCH': 0.01})
+
+    async def test(http):
+        before = asyncio.ensure_future(http.get_message(1, 2))
+        await asyncio.sleep(0.01)
+        await http.edit_message(1, 2, content='edited')
+        # sent before the edit finished, so it might not have the edit
+        after = await http.get_message(1, 2)
+        await before
+        assert after == (await before)
+        assert api.counts[MESSAGE] == 2
+        assert http.coalesced_requests == 0
+
+    run_with_client(loop, monkeypatch, api, test)
+
+
+def test_fetch_does_not_wait_behind_lower_priority(loop, monkeypatch):
+    api = FakeAPI()
+
+    async def test(http):
+        route = lambda: Route('GET', '/channels/{channel_id}/messages/{message_id}', channel_id=1, message_id=2)
+        await asyncio.gather(
+            http.request(route(), priority=RequestPriority.background),
+            http.request(route(), priority=RequestPriority.interactive),
+            http.request(route(), priority=RequestPriority.default),
+            http.request(route(), priority=RequestPriority.background),
+        )
+        # the interactive request is sent on its own and the others join it
+        assert api.counts[MESSAGE] == 2
+        assert http.coalesced_requests == 2
+
+    run_with_client(loop, monkeypatch, api, test)
@@ -0,0 +1,265 @@
+import asyncio
+import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from discord.ext import commands
+from discord.ext.commands.core import hooked_wrapped_callback
+from discord.ext.commands.stores import _ConcurrencyLease
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+class BrokenStore(commands.CooldownStore):
+    """A store whose backend is down."""
+
+    async def update_rate_limit(self, key, rate, per, current):
+        raise ConnectionRefusedError('refused')
+
+    async def acquire(self, key, number, lease):
+        raise ConnectionRefusedError('refused')
+
+    async def renew(self, key, token, lease):
+        return True
+
+    async def release(self, key, token):
+        raise ConnectionError('Lost the connection to the cooldown store')
+
+
+def make_context(store):
+    after = []
+
+    async def after_invoke(ctx):
+        after.append(ctx)
+
+    message = SimpleNamespace(
+        author=SimpleNamespace(id=1),
+        created_at=datetime.datetime(2021, 1, 1),
+        edited_at=None,
+    )
+    bot = SimpleNamespace(cooldown_store=store, _after_invoke=after_invoke)
+    return SimpleNamespace(bot=bot, message=message, _concurrency_leases={}, command_failed=False), after
+
+
+def make_command(**decorators):
+    async def command(ctx):
+        return 'result'
+
+    command = commands.command()(command)
+    if 'max_concurrency' in decorators:
+        command = commands.max_concurrency(decorators['max_concurrency'])(command)
+    if 'cooldown' in decorators:
+        command = commands.cooldown(*decorators['cooldown'], commands.BucketType.user)(command)
+    return command
+
+
+def test_failed_release_keeps_result_and_runs_after_hooks(loop):
+    store = BrokenStore()
+    command = make_command(max_concurrency=1)
+    ctx, after = make_context(store)
+
+    async def run():
+        ctx._concurrency_leases[command] = _ConcurrencyLease(store, 'key', 'token')
+        return await hooked_wrapped_callback(command, ctx, command.callback)(ctx)
+
+    assert loop.run_until_complete(run()) == 'result'
+    assert after == [ctx]
+    assert not ctx._concurrency_leases
+
+
+def test_store_failure_on_cooldown_is_a_command_error(loop):
+    command = make_command(cooldown=(1, 60))
+    ctx, _ = make_context(BrokenStore())
+
+    with pytest.raises(commands.CooldownStoreError) as info:
+        loop.run_until_complete(command._prepare_cooldowns(ctx))
+    assert isinstance(info.value.original, ConnectionRefusedError)
+
+
+def test_store_failure_on_concurrency_is_a_command_error(loop):
+    command = make_command(max_concurrency=1)
+    ctx, _ = make_context(BrokenStore())
+
+    with pytest.raises(commands.CooldownStoreError) as info:
+        loop.run_until_complete(command._acquire_concurrency(ctx))
+    assert isinstance(info.value.original, ConnectionRefusedError)
+
+
+def test_socket_store_times_out_on_hung_server(loop, tmp_path):
+    path = str(tmp_path / 'hung.sock')
+
+    async def hang(reader, writer):
+        # reads the requests and never answers them
+        while await reader.readline():
+            pass
+        writer.close()
+
+    async def run():
+        server = await asyncio.start_unix_server(hang, path=path)
+        store = commands.SocketCooldownStore(path, timeout=0.1)
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await store.acquire('key', 1, 30.0)
+            assert not store._pending
+        finally:
+            await store.close()
+            server.close()
+            await server.wait_closed()
+
+    loop.run_until_complete(run())
+
+
+def test_socket_store_reconnect_during_close(loop, tmp_path):
+    path = str(tmp_path / 'store.sock')
+
+    async def run():
+        server = commands.CooldownStoreServer()
+        await server.start(path)
+        store = commands.SocketCooldownStore(path)
+        try:
+            assert await store.acquire('first', 1, 30.0) is not None
+            # a request right after close reconnects before the old reader is gone
+            _, token = await asyncio.gather(store.close(), store.acquire('second', 1, 30.0))
+            assert token is not None
+            await asyncio.sleep(0)
+            assert store._writer is not None
+            assert await store.release('second', token) is None
+
+            # the reader of a replaced connection ending must not drop the current one
+            writer = store._writer
+            old_reader = asyncio.StreamReader()
+            old_reader.feed_eof()
+            old_writer = SimpleNamespace(closed=False)
+            old_writer.close = lambda: setattr(old_writer, 'closed', True)
+            await store._read_responses(old_reader, old_writer)
+            assert old_writer.closed
+            assert store._writer is writer
+            assert await store.acquire('third', 1, 30.0) is not None
+        finally:
+            await store.close()
+            await server.close()
+
+    loop.run_until_complete(run())
+
+
+NOW = 1_600_000_000.0
+
+
+def test_memory_store_cooldown(loop):
+    store = commands.MemoryCooldownStore()
+
+    async def run():
+        states = [await store.update_rate_limit('key', 2, 10.0, NOW + i) for i in range(3)]
+        assert [state.retry_after for state in states] == [0.0, 0.0, 9.0]
+        assert states[1].tokens == 0
+
+        # other keys and a reset bucket have their own tokens again
+        assert (await store.update_rate_limit('other', 2, 10.0, NOW + 2)).retry_after == 0.0
+        await store.reset('key')
+        assert (await store.update_rate_limit('key', 2, 10.0, NOW + 3)).retry_after == 0.0
+
+        # a changed cooldown starts over
+        assert (await store.update_rate_limit('other', 5, 10.0, NOW + 3)).tokens == 4
+
+    loop.run_until_complete(run())
+
+
+def test_memory_store_concurrency_leases(loop):
+    store = commands.MemoryCooldownStore()
+
+    async def run():
+        token = await store.acquire('key', 1, 30.0)
+        assert token is not None
+        assert await store.acquire('key', 1, 30.0) is None
+        assert await store.renew('key', token, 30.0)
+
+        await store.release('key', token)
+        assert not await store.renew('key', token, 30.0)
+
+        # a slot that isn't renewed in time is given back
+        token = await store.acquire('key', 1, 0.05)
+        await asyncio.sleep(0.1)
+        assert await store.acquire('key', 1, 30.0) is not None
+        assert not await store.renew('key', token, 30.0)
+
+    loop.run_until_complete(run())
+
+
+def test_socket_store_is_atomic_across_clients(loop, tmp_path):
+    path = str(tmp_path / 'store.sock')
+
+    async def run():
+        server = commands.CooldownStoreServer()
+        await server.start(path)
+        first, second = commands.SocketCooldownStore(path), commands.SocketCooldownStore(path)
+        try:
+            updates = [store.update_rate_limit('key', 5, 60.0, NOW) for store in (first, second) for _ in range(10)]
+            states = await asyncio.gather(*updates)
+            assert sum(state.retry_after == 0.0 for state in states) == 5
+
+            acquires = [store.acquire('slots', 2, 30.0) for store in (first, second) for _ in range(5)]
+            tokens = [token for token in await asyncio.gather(*acquires) if token is not None]
+            assert len(tokens) == 2
+
+            await first.release('slots', tokens[0])
+            assert await second.acquire('slots', 2, 30.0) is not None
+        finally:
+            await first.close()
+            await second.close()
+            await server.close()
+
+    loop.run_until_complete(run())
+
+
+def test_socket_store_lease_expiry_and_errors(loop, tmp_path):
+    path = str(tmp_path / 'store.sock')
+
+    async def run():
+        server = commands.CooldownStoreServer()
+        await server.start(path)
+        store = commands.SocketCooldownStore(path)
+        try:
+            token = await store.acquire('key', 1, 0.05)
+            assert token is not None
+            assert await store.acquire('key', 1, 30.0) is None
+            await asyncio.sleep(0.1)
+            assert not await store.renew('key', token, 30.0)
+            assert await store.acquire('key', 1, 30.0) is not None
+
+            # errors on the server are raised in the client
+            with pytest.raises(RuntimeError, match='Unknown operation'):
+                await store._request('unknown')
+        finally:
+            await store.close()
+            await server.close()
+
+    loop.run_until_complete(run())
+
+
+def test_socket_store_reconnects_after_server_restart(loop, tmp_path):
+    path = str(tmp_path / 'store.sock')
+
+    async def run():
+        server = commands.CooldownStoreServer()
+        await server.start(path)
+        store = commands.SocketCooldownStore(path)
+        try:
+            assert (await store.update_rate_limit('key', 1, 60.0, NOW)).retry_after == 0.0
+            await server.close()
+            await asyncio.sleep(0.01)
+            assert store._writer is None
+
+            # the buckets live in the server's store so they survive the restart
+            await server.start(path)
+            assert (await store.update_rate_limit('key', 1, 60.0, NOW + 1)).retry_after == 59.0
+        finally:
+            await store.close()
+            await server.close()
+
+    loop.run_until_complete(run())
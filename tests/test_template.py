@@ -0,0 +1,42 @@
+import discord
+from discord.template import Template
+from discord.user import ClientUser
+
+
+def make_state(**options):
+    client = discord.Client(**options)
+    state = client._connection
+    state.user = ClientUser(state=state, data={'id': '1', 'username': 'bot', 'discriminator': '0001', 'avatar': None})
+    return state
+
+
+def make_payload():
+    return {
+        'code': 'abc',
+        'usage_count': 3,
+        'name': 'template',
+        'description': None,
+        'creator': {'id': '2', 'username': 'creator', 'discriminator': '0002', 'avatar': None},
+        'created_at': '2021-01-01T00:00:00+00:00',
+        'updated_at': '2021-01-02T00:00:00+00:00',
+        'source_guild_id': '10',
+        'serialized_source_guild': {
+            'name': 'source',
+            'roles': [{'id': 0, 'name': '@everyone', 'permissions': '104324673', 'color': 0}],
+            'channels': [{'id': 1, 'type': 0, 'name': 'general', 'position': 0, 'permission_overwrites': []}],
+        },
+        'is_dirty': None,
+    }
+
+
+def test_template_source_guild():
+    template = Template(state=make_state(), data=make_payload())
+    assert template.source_guild.id == 10
+    assert template.source_guild.name == 'source'
+
+
+def test_template_source_guild_with_indexes():
+    state = make_state(member_name_index=True, permission_cache=True)
+    template = Template(state=state, data=make_payload())
+    assert template.source_guild._member_index is None
+    assert template.source_guild._permission_cache is None
@@ -0,0 +1,97 @@
+import asyncio
+import io
+
+import pytest
+
+from discord import utils
+
+
+class Stream:
+    """An async generator yielding chunks, optionally failing after them."""
+
+    def __init__(self, chunks, error=None):
+        self.chunks = chunks
+        self.error = error
+        self.closed = False
+
+    async def _generate(self):
+        try:
+            for chunk in self.chunks:
+                await asyncio.sleep(0)
+                yield chunk
+            if self.error is not None:
+                raise self.error
+        finally:
+            self.closed = True
+
+    def __call__(self):
+        return self._generate()
+
+
+class BrokenFile(io.BytesIO):
+    def write(self, data):
+        raise OSError('disk full')
+
+
+@pytest.fixture
+def save():
+    loop = asyncio.new_event_loop()
+
+    def save(stream, fp, seek_begin=True):
+        async def run():
+            try:
+                return await utils._save_stream(stream(), fp, seek_begin)
+            finally:
+                # closed by the time it returns, not when the loop shuts down
+                assert stream.closed
+
+        return loop.run_until_complete(run())
+
+    yield save
+    loop.close()
+
+
+def test_save_stream_to_path(save, tmp_path):
+    path = tmp_path / 'file.bin'
+    stream = Stream([b'ab', b'cd'])
+
+    assert save(stream, path) == 4
+    assert path.read_bytes() == b'abcd'
+    assert [p.name for p in tmp_path.iterdir()] == ['file.bin']
+
+
+def test_failed_download_keeps_existing_file(save, tmp_path):
+    path = tmp_path / 'file.bin'
+    path.write_bytes(b'old')
+    stream = Stream([b'ab', b'cd'], error=ConnectionResetError('reset'))
+
+    with pytest.raises(ConnectionResetError):
+        save(stream, str(path))
+
+    assert path.read_bytes() == b'old'
+    assert [p.name for p in tmp_path.iterdir()] == ['file.bin']
+
+
+def test_failed_download_creates_no_file(save, tmp_path):
+    stream = Stream([b'ab'], error=ConnectionResetError('reset'))
+
+    with pytest.raises(ConnectionResetError):
+        save(stream, tmp_path / 'file.bin')
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_save_stream_to_file_object(save):
+    fp = io.BytesIO()
+    stream = Stream([b'ab', b'cd'])
+
+    assert save(stream, fp) == 4
+    assert fp.read() == b'abcd'
+
+
+def test_stream_closed_when_write_fails(save):
+    stream = Stream([b'ab', b'cd'])
+
+    with pytest.raises(OSError, match='disk full'):
+        save(stream, BrokenFile())
+